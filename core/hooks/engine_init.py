@@ -0,0 +1,33 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+'''
+@ author：huangsheng
+@ date: 2026/10/30 10:00
+@ description:
+    Core hook run once an engine is initialized. In maya it installs the
+    callbacks of the local publish cache, so the publishes referenced by
+    the scenes opened in the session are read from their local copies.
+
+'''
+
+import os
+import sys
+
+from tank import Hook
+
+_hooks = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "hooks")
+if _hooks not in sys.path:
+    sys.path.append(_hooks)
+from cfa_pipeline import publish_cache
+
+
+class EngineInit(Hook):
+
+    def execute(self, engine, **kwargs):
+        """
+        :param engine: the engine that was started.
+        """
+        if engine.name == "tk-maya":
+            publish_cache.install_callbacks()
@@ -0,0 +1,33 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+'''
+@ author：huangsheng
+@ date: 2026/10/18 10:12
+@ description:
+    Shared helpers for the config hooks (publish2, loader2, breakdown).
+
+    The hooks put the ``hooks`` folder on ``sys.path`` and import the
+    modules of this package directly, e.g.::
+
+        from cfa_pipeline import resolve_cache
+
+'''
+
+
+def find_item_property(item, name):
+    """
+    Return the property ``name`` of ``item`` or of its closest parent.
+
+    Publish-scoped helpers are stored on the root item by the collector and
+    looked up from the items the plugins are run on.
+
+    :param item: publish2 item to start from.
+    :param str name: property name.
+    :returns: the property value, None if no item of the branch has it.
+    """
+    while item is not None:
+        value = item.properties.get(name)
+        if value is not None:
+            return value
+        item = item.parent
+    return None
@@ -0,0 +1,210 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+'''
+@ author：huangsheng
+@ date: 2026/10/19 16:30
+@ description:
+    Gathers the alembic exports of one publish into a single AbcExport.
+
+    Every AbcExport call evaluates the whole frame range again. The publish
+    plugins queue their job while validating, the first plugin publishing an
+    alembic flushes the queue with one AbcExport call holding one ``-j`` per
+    job, so the timeline is evaluated once. Each job still writes its own file
+    and the plugins register their own PublishedFile.
+
+    Jobs are queued once their item passed validation. The flush skips the
+    jobs of the items unchecked in the publisher after their validation.
+
+'''
+
+import os
+
+from sgtk.util.filesystem import ensure_folder_exists
+
+from cfa_pipeline import find_item_property
+
+# item property the batcher is stored under
+PROPERTY = "alembic_batcher"
+
+_active_batcher = None
+
+
+class AlembicJob(object):
+    """
+    One ``-j`` of the batched AbcExport.
+
+    :param root: node to export, or a callable returning the node. The
+        callable is run right before the export (e.g. to bake a camera).
+        None exports the whole scene.
+    :param str path: alembic file to write.
+    :param start: first frame.
+    :param end: last frame.
+    :param list flags: extra job flags, e.g. ``["-uvWrite", "-worldSpace"]``.
+    :param cleanup: optional callable run with the root after the export.
+    :param item: publish item of the job, its job is skipped while it is
+        unchecked.
+    :param prepare: optional callable run for every exported job before
+        the roots are resolved (e.g. to register a camera to bake).
+    """
+
+    def __init__(self, root, path, start, end, flags=None, cleanup=None,
+                 item=None, prepare=None):
+        self.root = root
+        self.path = path
+        self.start = start
+        self.end = end
+        self.flags = list(flags or [])
+        self.cleanup = cleanup
+        self.item = item
+        self.prepare = prepare
+        self.exported = False
+        self.error = None
+
+    def job_string(self, root):
+        """
+        Return the AbcExport job string for ``root``.
+        """
+        args = ["-frameRange %s %s" % (self.start, self.end)]
+        args.extend(self.flags)
+        args.append("-dataFormat ogawa")
+        if root:
+            args.append("-root %s" % root)
+        args.append("-file %s" % self.path.replace("\\", "/"))
+        return " ".join(args)
+
+
+class AlembicBatcher(object):
+    """
+    Queue of the alembic jobs of one publish.
+    """
+
+    def __init__(self):
+        self._jobs = {}
+        self.exports = 0
+
+    def add(self, key, root, path, start, end, flags=None, cleanup=None,
+            item=None, prepare=None):
+        """
+        Queue a job. A job queued again under the same key (validation run
+        twice) replaces the previous one unless it was exported already.
+
+        :param key: identifies the job, usually the publish path.
+        :returns: the :class:`AlembicJob`.
+        """
+        job = self._jobs.get(key)
+        if job is not None and job.exported:
+            return job
+        job = AlembicJob(root, path, start, end, flags, cleanup, item,
+                         prepare)
+        self._jobs[key] = job
+        return job
+
+    def has_job(self, key):
+        """
+        Return True if a job was queued under ``key``.
+        """
+        return key in self._jobs
+
+    def export(self, key):
+        """
+        Make sure the job ``key`` is written, flushing the queue if needed.
+
+        :returns: the path of the alembic file.
+        :raises: Exception if the job failed.
+        """
+        job = self._jobs[key]
+        if not job.exported and job.error is None:
+            self.flush()
+        if job.error is not None:
+            raise Exception(job.error)
+        if not job.exported:
+            raise Exception("'%s' was not exported, its item is unchecked."
+                            % job.path)
+        return job.path
+
+    def flush(self):
+        """
+        Export all queued jobs of checked items with one AbcExport call.
+        """
+        import maya.cmds as cmds
+
+        pending = [job for job in self._jobs.values()
+                   if not job.exported and job.error is None and
+                   _checked(job.item)]
+        if not pending:
+            return
+        for job in pending:
+            if job.prepare is not None:
+                job.prepare()
+
+        if not cmds.pluginInfo("AbcExport", query=True, loaded=True):
+            cmds.loadPlugin("AbcExport", quiet=True)
+
+        roots = []
+        job_strings = []
+        for job in pending:
+            try:
+                root = job.root() if callable(job.root) else job.root
+            except Exception as e:
+                job.error = "Failed to prepare '%s': %s" % (job.path, e)
+                continue
+            # AbcExport won't create the folder
+            ensure_folder_exists(os.path.dirname(job.path))
+            roots.append((job, root))
+            job_strings.append(job.job_string(root))
+
+        try:
+            if job_strings:
+                cmds.AbcExport(j=job_strings)
+                self.exports += 1
+            error = None
+        except Exception as e:
+            error = "Alembic export failed: %s" % e
+
+        for (job, root) in roots:
+            if error is None:
+                job.exported = True
+            else:
+                job.error = error
+            if job.cleanup is not None:
+                try:
+                    job.cleanup(root)
+                except Exception:
+                    pass
+
+
+def _checked(item):
+    # the item and at least one of its tasks are active in the publisher
+    if item is None:
+        return True
+    if getattr(item, "active", True) is False:
+        return False
+    tasks = getattr(item, "tasks", None)
+    if tasks and not any(getattr(task, "active", True) for task in tasks):
+        return False
+    return True
+
+
+def attach(item):
+    """
+    Create the batcher for this publish and store it on ``item``.
+
+    :param item: the root item handed to the collector.
+    """
+    global _active_batcher
+    _active_batcher = AlembicBatcher()
+    item.properties[PROPERTY] = _active_batcher
+    return _active_batcher
+
+
+def get(item):
+    """
+    Return the batcher attached to ``item`` or one of its parents.
+    """
+    global _active_batcher
+    batcher = find_item_property(item, PROPERTY)
+    if batcher is not None:
+        return batcher
+    if _active_batcher is None:
+        _active_batcher = AlembicBatcher()
+    return _active_batcher
@@ -0,0 +1,148 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+'''
+@ author：huangsheng
+@ date: 2026/10/20 10:05
+@ description:
+    Alembic export profiles per item type and pipeline step, and a static
+    node detector.
+
+    A profile sets the frame step and the uvWrite, writeVisibility,
+    stripNamespaces and worldSpace flags of an AbcExport job. Nodes without
+    anything time dependent in their history (and in their parents' history
+    for world space exports) never move, they are written with one sample
+    instead of one per frame.
+
+'''
+
+# flags of an export without a profile
+DEFAULT_PROFILE = {
+    "step": 1.0,
+    "uvWrite": True,
+    "writeVisibility": False,
+    "stripNamespaces": False,
+    "worldSpace": False,
+    # write a single sample whatever the history says
+    "static": False,
+    # flags passed as is
+    "extra": [],
+}
+
+# profiles per publish item type, on top of the default
+PROFILES = {
+    "maya.session.geometry": {
+        "writeVisibility": True,
+        "extra": ["-renderableOnly", "-writeFaceSets"],
+    },
+    "maya.session.simcrv": {
+        "writeVisibility": True,
+        "worldSpace": True,
+    },
+    "maya.session.camera": {
+        "uvWrite": False,
+        "worldSpace": True,
+    },
+}
+
+# profiles per (item type, step id), on top of the item type profile
+STEP_PROFILES = {
+    # shading geometry is the static asset, no need to look at its history
+    ("maya.session.geometry", 15): {
+        "static": True,
+    },
+}
+
+# AbcExport flag of each boolean profile key
+_BOOL_FLAGS = ("uvWrite", "writeVisibility", "stripNamespaces", "worldSpace")
+
+# node types that change over time on their own
+_TIME_NODE_TYPES = [
+    "animCurveTA", "animCurveTL", "animCurveTT", "animCurveTU", "expression"
+]
+
+
+def get_profile(item_type, step_id=None, overrides=None):
+    """
+    Return the export profile for an item type and step.
+
+    :param str item_type: publish item type, e.g. ``maya.session.simcrv``.
+    :param step_id: id of the pipeline step of the context.
+    :param dict overrides: profile keys set by the plugin settings.
+    :returns: profile dict, see ``DEFAULT_PROFILE``.
+    """
+    profile = dict(DEFAULT_PROFILE)
+    profile.update(PROFILES.get(item_type, {}))
+    profile.update(STEP_PROFILES.get((item_type, step_id), {}))
+    if overrides:
+        profile.update(overrides)
+    return profile
+
+
+def job_flags(profile):
+    """
+    Return the AbcExport job flags of ``profile``, frame range excluded.
+    """
+    flags = []
+    if profile["step"] != 1.0:
+        flags.append("-step %s" % profile["step"])
+    for key in _BOOL_FLAGS:
+        if profile[key]:
+            flags.append("-%s" % key)
+    flags.extend(profile["extra"])
+    return flags
+
+
+def frame_range(profile, root, start, end):
+    """
+    Return the frame range to export ``root`` with.
+
+    :param root: node exported, None for the whole scene.
+    :returns: ``(start, start)`` for static nodes, ``(start, end)`` otherwise.
+    """
+    if profile["static"] or is_static(root, profile["worldSpace"]):
+        return (start, start)
+    return (start, end)
+
+
+def is_static(root, world_space=False):
+    """
+    Return True if nothing in the history of ``root`` depends on time.
+
+    Animation curves, expressions and anything connected to the time node
+    (caches, simulations, ...) make a node animated. The check is
+    conservative: a node keyed with constant values counts as animated.
+
+    :param root: dag node, None for all the geometry of the scene.
+    :param bool world_space: also check the parents of ``root``.
+    """
+    import maya.cmds as cmds
+
+    if root is None:
+        nodes = cmds.ls(geometry=True, noIntermediate=True, long=True) or []
+        nodes.extend(
+            cmds.listRelatives(nodes, allParents=True, fullPath=True) or [])
+    else:
+        nodes = cmds.ls(root, dag=True, long=True) or []
+        if world_space:
+            nodes.extend(_ancestors(root))
+    if not nodes:
+        return True
+
+    time_nodes = set(cmds.ls(type=_TIME_NODE_TYPES) or [])
+    time_nodes.update(
+        cmds.listConnections("time1", source=False, destination=True) or [])
+    if not time_nodes:
+        return True
+
+    history = cmds.listHistory(nodes, pruneDagObjects=False) or []
+    return not any(node in time_nodes for node in history)
+
+
+def _ancestors(node):
+    import maya.cmds as cmds
+
+    long_names = cmds.ls(node, long=True) or []
+    if not long_names:
+        return []
+    parts = long_names[0].split("|")
+    return ["|".join(parts[:i]) for i in range(2, len(parts))]
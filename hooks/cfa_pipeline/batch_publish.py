@@ -0,0 +1,323 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+'''
+@ author：huangsheng
+@ date: 2026/10/21 15:00
+@ description:
+    Headless batch re-publish of maya work files, run with mayapy:
+
+        mayapy batch_publish.py scene1.ma scene2.ma ... [--list scenes.txt]
+               [--workers 8] [--timeout 3600] [--report report.json]
+
+    Each worker process initializes maya standalone, authenticates and starts
+    tk-maya once (one toolkit instance, so one Shotgun connection per worker),
+    then for each of its scenes opens it, switches the engine context and
+    runs the publisher: MayaSessionCollector and the configured plugins,
+    through the publish manager of tk-multi-publish2. A json report gives the
+    timings of every stage and the failures.
+
+    Scenes are handed to the workers one at a time. A worker that dies (a
+    mayapy crash) or runs over the timeout fails its scene in the report and
+    is replaced, the batch goes on.
+
+    Authentication uses ``CFA_SG_SCRIPT_NAME`` / ``CFA_SG_SCRIPT_KEY`` (and
+    ``CFA_SG_HOST``) when set, the saved login of the user otherwise. The
+    scenes of one run must belong to the same project.
+
+'''
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+import traceback
+
+try:
+    from queue import Empty
+except ImportError:
+    from Queue import Empty
+
+# make the cfa_pipeline package importable
+_hooks = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _hooks not in sys.path:
+    sys.path.insert(0, _hooks)
+
+# core of the pipeline configuration this config belongs to
+DEFAULT_CORE = os.path.join(
+    os.path.dirname(os.path.dirname(_hooks)), "install", "core", "python")
+
+# seconds between two checks of the workers
+POLL = 1
+
+
+class BatchPublishError(Exception):
+    """
+    Raised when a scene can't be published.
+    """
+
+
+def run_batch(scenes, workers=None, publish=None, initializer=None,
+              initargs=(), timeout=None):
+    """
+    Publish ``scenes`` in a pool of worker processes.
+
+    :param list scenes: work files to publish.
+    :param int workers: pool size, the number of cores by default. With one
+        worker the scenes are published in this process.
+    :param publish: callable publishing one scene and returning its report
+        dict, :func:`publish_scene` by default.
+    :param initializer: called once in each worker, :func:`init_worker` by
+        default.
+    :param timeout: seconds a scene may take in a worker, None for no limit.
+    :returns: the report dict.
+    """
+    publish = publish or publish_scene
+    initializer = initializer or init_worker
+    workers = max(1, min(workers or multiprocessing.cpu_count(), len(scenes)))
+
+    start = time.time()
+    if workers == 1:
+        initializer(*initargs)
+        results = [publish(scene) for scene in scenes]
+    else:
+        results = _run_workers(scenes, workers, publish, initializer,
+                               initargs, timeout)
+
+    return {
+        "workers": workers,
+        "seconds": time.time() - start,
+        "published": len([r for r in results if r["ok"]]),
+        "failed": len([r for r in results if not r["ok"]]),
+        "scenes": results,
+    }
+
+
+def init_worker(core=DEFAULT_CORE):
+    """
+    Initialize maya and authenticate toolkit in a worker process.
+    """
+    import maya.standalone
+    maya.standalone.initialize(name="python")
+
+    if core not in sys.path:
+        sys.path.insert(0, core)
+    import sgtk
+
+    authenticator = sgtk.authentication.ShotgunAuthenticator()
+    script = os.environ.get("CFA_SG_SCRIPT_NAME")
+    if script:
+        user = authenticator.create_script_user(
+            script,
+            os.environ["CFA_SG_SCRIPT_KEY"],
+            os.environ.get("CFA_SG_HOST")
+        )
+    else:
+        user = authenticator.get_user()
+    sgtk.set_authenticated_user(user)
+
+
+def publish_scene(scene):
+    """
+    Open ``scene`` and run the publisher on it.
+
+    :returns: report dict of the scene: ``scene``, ``ok``, ``seconds``,
+        ``stages`` (seconds per stage), ``items`` (number of publish items)
+        and ``error``.
+    """
+    result = {
+        "scene": scene,
+        "ok": False,
+        "seconds": 0,
+        "stages": {},
+        "items": 0,
+        "error": None,
+        "pid": os.getpid(),
+    }
+    start = time.time()
+    try:
+        _stage(result, "open", _open_scene, scene)
+        engine = _stage(result, "context", _engine_for, scene)
+        manager = engine.apps["tk-multi-publish2"].create_publish_manager()
+        _stage(result, "collect", manager.collect_session)
+        failures = _stage(result, "validate", manager.validate)
+        if failures:
+            raise BatchPublishError(
+                "%d validation error(s): %s" % (
+                    len(failures),
+                    "; ".join(str(error) for (task, error) in failures)
+                )
+            )
+        failures = _stage(result, "publish", manager.publish)
+        if failures:
+            raise BatchPublishError(
+                "Publish failed: %s" % (
+                    "; ".join(str(error) for (task, error) in failures)))
+        _stage(result, "finalize", manager.finalize)
+        result["items"] = len(list(manager.tree))
+        result["ok"] = True
+    except Exception:
+        result["error"] = traceback.format_exc()
+    result["seconds"] = time.time() - start
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Re-publish maya work files headlessly.")
+    parser.add_argument("scenes", nargs="*", help="work files to publish")
+    parser.add_argument("--list", help="text file with one work file per line")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="number of processes, the number of cores by "
+                             "default")
+    parser.add_argument("--timeout", type=float, default=None,
+                        help="seconds a scene may take, no limit by default")
+    parser.add_argument("--report", default="batch_publish_report.json",
+                        help="json report written at the end")
+    parser.add_argument("--core", default=DEFAULT_CORE,
+                        help="python folder of the toolkit core")
+    args = parser.parse_args(argv)
+
+    scenes = list(args.scenes)
+    if args.list:
+        with open(args.list) as f:
+            scenes.extend(line.strip() for line in f if line.strip())
+    if not scenes:
+        parser.error("no scene to publish")
+
+    report = run_batch(scenes, args.workers, initargs=(args.core,),
+                       timeout=args.timeout)
+    with open(args.report, "w") as f:
+        json.dump(report, f, indent=4)
+    print("%d published, %d failed in %.1fs, report: %s" % (
+        report["published"], report["failed"], report["seconds"], args.report))
+    return 1 if report["failed"] else 0
+
+
+class _Worker(object):
+    """
+    A worker process and the scene it runs.
+    """
+
+    def __init__(self, results, publish, initializer, initargs):
+        self.tasks = multiprocessing.Queue()
+        self.process = multiprocessing.Process(
+            target=_work,
+            args=(self.tasks, results, publish, initializer, initargs))
+        self.process.daemon = True
+        self.process.start()
+        self.task = None
+        self.started = None
+
+    def assign(self, task):
+        # None stops the worker
+        self.task = task
+        self.started = time.time()
+        self.tasks.put(task)
+
+
+def _run_workers(scenes, count, publish, initializer, initargs, timeout):
+    # one scene at a time per worker, scenes take very different times, and
+    # the scene of a dead worker is known
+    results = multiprocessing.Queue()
+    tasks = list(reversed(list(enumerate(scenes))))
+    reports = {}
+
+    def start():
+        worker = _Worker(results, publish, initializer, initargs)
+        worker.assign(tasks.pop() if tasks else None)
+        return worker
+
+    workers = [start() for _ in range(count)]
+    try:
+        while len(reports) < len(scenes):
+            try:
+                (index, report) = results.get(timeout=POLL)
+            except Empty:
+                pass
+            else:
+                reports.setdefault(index, report)
+                for worker in workers:
+                    if worker.task is not None and worker.task[0] == index:
+                        worker.assign(tasks.pop() if tasks else None)
+
+            for (i, worker) in enumerate(workers):
+                if worker.task is None or worker.task[0] in reports:
+                    continue
+                if worker.process.is_alive():
+                    if timeout is None or \
+                            time.time() - worker.started < timeout:
+                        continue
+                    worker.process.terminate()
+                    error = "Timed out after %ds." % timeout
+                else:
+                    error = "Worker crashed (exit code %s)." % (
+                        worker.process.exitcode)
+                worker.process.join()
+                (index, scene) = worker.task
+                reports[index] = {
+                    "scene": scene,
+                    "ok": False,
+                    "seconds": time.time() - worker.started,
+                    "stages": {},
+                    "items": 0,
+                    "error": error,
+                    "pid": worker.process.pid,
+                }
+                workers[i] = start()
+    finally:
+        for worker in workers:
+            if worker.process.is_alive() and worker.task is not None:
+                worker.process.terminate()
+            worker.process.join()
+
+    # report in the order of the input
+    return [reports[index] for index in range(len(scenes))]
+
+
+def _work(tasks, results, publish, initializer, initargs):
+    initializer(*initargs)
+    while True:
+        task = tasks.get()
+        if task is None:
+            break
+        (index, scene) = task
+        results.put((index, publish(scene)))
+
+
+def _stage(result, name, func, *args):
+    start = time.time()
+    try:
+        return func(*args)
+    finally:
+        result["stages"][name] = time.time() - start
+
+
+def _open_scene(scene):
+    import maya.cmds as cmds
+    cmds.file(scene, open=True, force=True, prompt=False)
+
+
+def _engine_for(scene):
+    """
+    Start tk-maya for the context of ``scene``, or switch the running engine
+    to it. The engine and its toolkit instance are kept for the next scenes.
+    """
+    import sgtk
+
+    engine = sgtk.platform.current_engine()
+    tk = engine.sgtk if engine else sgtk.sgtk_from_path(scene)
+    context = tk.context_from_path(scene)
+    if context.project is None:
+        raise BatchPublishError("No toolkit context for %s." % scene)
+    if engine is None:
+        engine = sgtk.platform.start_engine("tk-maya", tk, context)
+    elif engine.context != context:
+        sgtk.platform.change_context(context)
+        engine = sgtk.platform.current_engine()
+    return engine
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,225 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+'''
+@ author：huangsheng
+@ date: 2026/10/20 15:40
+@ description:
+    Bakes the shot cameras of one publish in a single timeline pass.
+
+    The world matrix and the lens / film attributes of every camera are
+    sampled into arrays while stepping the timeline once, then written on
+    world-space duplicates with one addKeys call per anim curve instead of
+    keying frame by frame.
+
+'''
+
+from cfa_pipeline import find_item_property
+
+# item property the baker is stored under
+PROPERTY = "camera_baker"
+
+# camera shape attributes sampled every frame
+SHAPE_ATTRS = (
+    "focalLength",
+    "horizontalFilmAperture",
+    "verticalFilmAperture",
+    "horizontalFilmOffset",
+    "verticalFilmOffset",
+    "lensSqueezeRatio",
+)
+
+TRANSFORM_ATTRS = (
+    "translateX", "translateY", "translateZ",
+    "rotateX", "rotateY", "rotateZ",
+    "scaleX", "scaleY", "scaleZ",
+)
+
+# pivots and offsets zeroed on the duplicate so its local matrix is the
+# sampled world matrix
+_RESET_ATTRS = (
+    "rotatePivot", "scalePivot", "rotatePivotTranslate",
+    "scalePivotTranslate", "rotateAxis", "shear",
+)
+
+_active_baker = None
+
+
+class CameraBaker(object):
+    """
+    Collects the cameras to bake and bakes them together on first use.
+    """
+
+    def __init__(self):
+        self._pending = []
+        self._baked = {}
+
+    def add(self, camera):
+        """
+        Register ``camera`` (transform name) to be baked with the others.
+        """
+        if camera not in self._pending and camera not in self._baked:
+            self._pending.append(camera)
+
+    def baked(self, camera, start, end):
+        """
+        Return the baked duplicate of ``camera``, baking all the registered
+        cameras first if needed.
+        """
+        if camera not in self._baked:
+            self.add(camera)
+            cameras = self._pending
+            self._pending = []
+            self._baked.update(bake_cameras(cameras, start, end))
+        return self._baked.pop(camera)
+
+
+def bake_cameras(cameras, start, end):
+    """
+    Bake ``cameras`` to world-space duplicates over ``start``-``end``.
+
+    :param list cameras: camera transform names.
+    :returns: dict of camera name to the name of its baked duplicate.
+    """
+    import maya.cmds as cmds
+    import maya.api.OpenMaya as om
+    import maya.api.OpenMayaAnim as oma
+
+    frames = list(range(int(start), int(end) + 1))
+    sources = []
+    for camera in cameras:
+        dag_path = _dag_path(camera)
+        shape_path = om.MDagPath(dag_path)
+        shape_path.extendToShape()
+        shape_fn = om.MFnDependencyNode(shape_path.node())
+        plugs = [shape_fn.findPlug(attr, False) for attr in SHAPE_ATTRS]
+        order = cmds.getAttr("%s.rotateOrder" % camera)
+        samples = dict((attr, []) for attr in TRANSFORM_ATTRS + SHAPE_ATTRS)
+        sources.append((camera, dag_path, plugs, order, samples))
+
+    # one pass over the timeline for all the cameras
+    current_time = oma.MAnimControl.currentTime()
+    cmds.refresh(suspend=True)
+    try:
+        for frame in frames:
+            oma.MAnimControl.setCurrentTime(om.MTime(frame, om.MTime.uiUnit()))
+            for (camera, dag_path, plugs, order, samples) in sources:
+                _sample(dag_path, plugs, order, samples)
+    finally:
+        oma.MAnimControl.setCurrentTime(current_time)
+        cmds.refresh(suspend=False)
+
+    times = om.MTimeArray()
+    for frame in frames:
+        times.append(om.MTime(frame, om.MTime.uiUnit()))
+    baked = {}
+    for (camera, dag_path, plugs, order, samples) in sources:
+        duplicate = _world_duplicate(camera)
+        _write_keys(duplicate, TRANSFORM_ATTRS, times, samples)
+        shape = cmds.listRelatives(duplicate, shapes=True, fullPath=True)[0]
+        _write_keys(shape, SHAPE_ATTRS, times, samples)
+        baked[camera] = duplicate
+    return baked
+
+
+def attach(item):
+    """
+    Create the baker for this publish and store it on ``item``.
+
+    :param item: the root item handed to the collector.
+    """
+    global _active_baker
+    _active_baker = CameraBaker()
+    item.properties[PROPERTY] = _active_baker
+    return _active_baker
+
+
+def get(item):
+    """
+    Return the baker attached to ``item`` or one of its parents.
+    """
+    global _active_baker
+    baker = find_item_property(item, PROPERTY)
+    if baker is not None:
+        return baker
+    if _active_baker is None:
+        _active_baker = CameraBaker()
+    return _active_baker
+
+
+def _dag_path(node):
+    import maya.api.OpenMaya as om
+
+    selection = om.MSelectionList()
+    selection.add(node)
+    return selection.getDagPath(0)
+
+
+def _sample(dag_path, plugs, order, samples):
+    import maya.api.OpenMaya as om
+
+    matrix = om.MTransformationMatrix(dag_path.inclusiveMatrix())
+    translate = matrix.translation(om.MSpace.kWorld)
+    rotate = matrix.rotation()
+    rotate.reorderIt(order)
+    # keep the rotation continuous with the previous frame
+    if samples["rotateX"]:
+        previous = om.MEulerRotation(
+            samples["rotateX"][-1], samples["rotateY"][-1],
+            samples["rotateZ"][-1], order)
+        rotate.setToClosestSolution(previous)
+    scale = matrix.scale(om.MSpace.kWorld)
+
+    for (attr, value) in zip(TRANSFORM_ATTRS, (
+            translate.x, translate.y, translate.z,
+            rotate.x, rotate.y, rotate.z,
+            scale[0], scale[1], scale[2])):
+        samples[attr].append(value)
+    for (attr, plug) in zip(SHAPE_ATTRS, plugs):
+        samples[attr].append(plug.asDouble())
+
+
+def _world_duplicate(camera):
+    """
+    Duplicate the camera under the world with nothing but its shape and
+    no pivots, so keys on its transform are world space values.
+    """
+    import maya.cmds as cmds
+
+    name = "%s_bake" % camera.split("|")[-1].split(":")[-1]
+    duplicate = cmds.duplicate(camera, name=name, returnRootsOnly=True)[0]
+    for child in cmds.listRelatives(duplicate, children=True,
+                                    fullPath=True) or []:
+        if cmds.nodeType(child) != "camera":
+            cmds.delete(child)
+    if cmds.listRelatives(duplicate, parent=True):
+        duplicate = cmds.parent(duplicate, world=True)[0]
+
+    shape = cmds.listRelatives(duplicate, shapes=True, fullPath=True)[0]
+    for (node, attrs) in ((duplicate, TRANSFORM_ATTRS), (shape, SHAPE_ATTRS)):
+        for attr in attrs:
+            cmds.setAttr("%s.%s" % (node, attr), lock=False)
+    for attr in _RESET_ATTRS:
+        cmds.setAttr("%s.%s" % (duplicate, attr), 0, 0, 0, type="double3")
+    return duplicate
+
+
+def _write_keys(node, attrs, times, samples):
+    """
+    Key ``attrs`` of ``node`` with one addKeys call per attribute. Attributes
+    that never change are set instead of keyed.
+    """
+    import maya.api.OpenMaya as om
+    import maya.api.OpenMayaAnim as oma
+
+    node_fn = om.MFnDependencyNode(_dag_path(node).node())
+    for attr in attrs:
+        values = samples[attr]
+        plug = node_fn.findPlug(attr, False)
+        if min(values) == max(values):
+            plug.setDouble(values[0])
+            continue
+        curve = oma.MFnAnimCurve()
+        curve.create(plug)
+        curve.addKeys(times, om.MDoubleArray(values),
+                      oma.MFnAnimCurve.kTangentLinear,
+                      oma.MFnAnimCurve.kTangentLinear)
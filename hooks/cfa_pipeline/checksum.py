@@ -0,0 +1,264 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+'''
+@ author：huangsheng
+@ date: 2026/10/28 18:00
+@ description:
+    Checksums of the publish outputs, for downstream dedupe.
+
+    A file is cut in ``CHUNK_SIZE`` chunks hashed in parallel, each chunk
+    read through its own mmap, the checksum is the sha256 of the chunk
+    sha256 digests. It is not the sha256 of the file, it only compares to
+    the checksums of this module: ``CHUNK_SIZE`` must not change.
+
+    The service hashes in the background from the end of the export, the
+    registration goes on meanwhile::
+
+        service = checksum.get(item)
+        service.submit(publish_path)
+        ...
+        value = service.result(publish_path)
+
+    Results are cached by (path, size, mtime). Plugins registering their
+    publish themselves use ``submit`` after the export and ``attach_publish``
+    after the registration. The checksum field is looked up once per site
+    and process, nothing is hashed on a site without it.
+
+'''
+
+import hashlib
+import mmap
+import os
+import threading
+from multiprocessing.pool import ThreadPool
+
+from cfa_pipeline import find_item_property
+
+# size of the chunks hashed in parallel, a multiple of the mmap granularity
+CHUNK_SIZE = 64 * 1024 * 1024
+
+# threads hashing the chunks, files hashed at once
+THREADS = 4
+FILE_THREADS = 2
+
+# item property the service is stored under
+PROPERTY = "checksum_service"
+
+# merged into the settings of the plugins checksumming their publishes
+SETTINGS = {
+    "Checksum Field": {
+        "type": "str",
+        "default": "sg_checksum",
+        "description": "PublishedFile field the checksum of the published "
+                       "file is stored in, empty to skip the checksum.",
+    },
+}
+
+_cache = {}
+_cache_lock = threading.Lock()
+
+# (site, entity type, field) -> True if the schema has the field
+_fields = {}
+
+
+def file_checksum(path, pool=None):
+    """
+    Return the checksum of the file ``path``.
+
+    :param pool: thread pool the chunks are hashed on, the chunks are hashed
+        one after the other if None.
+    """
+    stat = os.stat(path)
+    key = (os.path.normcase(os.path.abspath(path)), stat.st_size,
+           stat.st_mtime)
+    with _cache_lock:
+        if key in _cache:
+            return _cache[key]
+
+    offsets = range(0, stat.st_size, CHUNK_SIZE)
+    jobs = [(path, offset, min(CHUNK_SIZE, stat.st_size - offset))
+            for offset in offsets]
+    if pool is None or len(jobs) < 2:
+        digests = [_chunk_digest(job) for job in jobs]
+    else:
+        digests = pool.map(_chunk_digest, jobs, chunksize=1)
+    value = hashlib.sha256(b"".join(digests)).hexdigest()
+
+    with _cache_lock:
+        _cache[key] = value
+    return value
+
+
+class ChecksumService(object):
+    """
+    Hashes files in the background.
+    """
+
+    def __init__(self, threads=THREADS, file_threads=FILE_THREADS):
+        self._threads = threads
+        self._file_threads = file_threads
+        self._chunks = None
+        self._files = None
+        self._results = {}
+
+    def submit(self, path):
+        """
+        Start hashing ``path``, a no-op if it is already.
+        """
+        key = _key(path)
+        if key in self._results:
+            return
+        if self._files is None:
+            self._chunks = ThreadPool(self._threads)
+            self._files = ThreadPool(self._file_threads)
+        self._results[key] = self._files.apply_async(
+            file_checksum, (path, self._chunks))
+
+    def result(self, path, timeout=None):
+        """
+        Return the checksum of ``path``, submitted now if it was not.
+
+        :raises: the error hashing the file.
+        """
+        self.submit(path)
+        return self._results[_key(path)].get(timeout)
+
+    def close(self):
+        """
+        Wait for the submitted files and stop the threads, a later submit
+        starts new ones.
+        """
+        for pool in (self._files, self._chunks):
+            if pool is not None:
+                pool.close()
+                pool.join()
+        self._files = self._chunks = None
+
+
+def get(item):
+    """
+    Return the service of the publish ``item`` belongs to, created on the
+    root item if needed.
+    """
+    service = find_item_property(item, PROPERTY)
+    if service is None:
+        root = item
+        while root.parent is not None:
+            root = root.parent
+        service = ChecksumService()
+        root.properties[PROPERTY] = service
+    return service
+
+
+def field(settings, tk=None, logger=None):
+    """
+    Return the field of the "Checksum Field" setting, None if not set or,
+    with ``tk``, if PublishedFile does not have it.
+    """
+    if "Checksum Field" not in settings:
+        return None
+    name = settings["Checksum Field"].value or None
+    if name and tk is not None and not has_field(tk, name, logger=logger):
+        return None
+    return name
+
+
+def has_field(tk, name, entity_type="PublishedFile", logger=None):
+    """
+    Return True if ``entity_type`` has the field ``name``. The schema is
+    read once per site and process, a missing field is logged then.
+    """
+    key = (getattr(tk.shotgun, "base_url", None), entity_type, name)
+    if key not in _fields:
+        try:
+            tk.shotgun.schema_field_read(entity_type, name)
+            _fields[key] = True
+        except Exception as e:
+            _fields[key] = False
+            if logger:
+                logger.info("Checksums not stored, %s.%s can't be read: %s" % (
+                    entity_type, name, e))
+    return _fields[key]
+
+
+def submit(plugin, settings, item, path):
+    """
+    Start hashing the published file ``path`` of ``item`` on the service of
+    the publish, if its checksum is stored.
+    """
+    if field(settings, plugin.parent.sgtk, plugin.logger) and \
+            os.path.isfile(path):
+        get(item).submit(path)
+
+
+def attach_publish(plugin, settings, item, path=None):
+    """
+    Store the checksum of the registered publish of ``item``, see
+    :func:`attach`.
+
+    :param str path: published file, the publish path of ``item`` if None.
+    """
+    publish = item.properties.get("sg_publish_data")
+    tk = plugin.parent.sgtk
+    name = field(settings, tk, plugin.logger)
+    path = path or plugin.get_publish_path(settings, item)
+    if not publish or not name or not os.path.isfile(path):
+        return
+    service = get(item)
+    try:
+        attach(tk, service, [(publish, path, name)], plugin.logger)
+    finally:
+        # waits for the files submitted meanwhile, a later submit starts
+        # the threads again
+        service.close()
+
+
+def attach(tk, service, publishes, logger):
+    """
+    Wait for the checksums of ``publishes`` and store them on the
+    PublishedFiles, batched. A checksum that can not be computed or stored
+    is logged, the publish is kept.
+
+    :param service: :class:`ChecksumService` hashing the files.
+    :param list publishes: ``(publish, path, field)``, ``publish`` the
+        PublishedFile dictionary, which gets the field.
+    """
+    requests = []
+    for (publish, path, name) in publishes:
+        if not has_field(tk, name, publish["type"], logger):
+            continue
+        try:
+            value = service.result(path)
+        except Exception as e:
+            logger.warning("Checksum of %s not computed: %s" % (path, e))
+            continue
+        publish[name] = value
+        requests.append({
+            "request_type": "update",
+            "entity_type": publish["type"],
+            "entity_id": publish["id"],
+            "data": {name: value},
+        })
+    if requests:
+        try:
+            tk.shotgun.batch(requests)
+        except Exception as e:
+            logger.warning("Checksums not registered: %s" % e)
+        else:
+            logger.debug("Registered %d checksum(s)." % len(requests))
+
+
+def _chunk_digest(job):
+    (path, offset, length) = job
+    with open(path, "rb") as f:
+        data = mmap.mmap(f.fileno(), length, access=mmap.ACCESS_READ,
+                         offset=offset)
+        try:
+            # hashlib releases the GIL on large buffers
+            return hashlib.sha256(data).digest()
+        finally:
+            data.close()
+
+
+def _key(path):
+    return os.path.normcase(os.path.normpath(path))
@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+'''
+@ author：huangsheng
+@ date: 2026/10/22 9:30
+@ description:
+    Runs the collectors of the maya session in priority order.
+
+    Cheap scene queries run first and expensive collectors (disk scans,
+    Shotgun queries) last. Progress is shown between collectors and the
+    artist can cancel: what was collected so far stays in the tree and the
+    remaining collectors are skipped.
+
+'''
+
+import time
+
+# collector costs, lower runs first
+SCENE = 0
+SCENE_HEAVY = 1
+DISK = 2
+
+
+class CollectionQueue(object):
+    """
+    Ordered, cancellable list of collectors.
+
+    :param logger: logger of the collector, gets the timing of each step.
+    :param str title: title of the progress window.
+    """
+
+    def __init__(self, logger, title=u"Collecting"):
+        self.logger = logger
+        self.title = title
+        self._steps = []
+        self.timings = []
+
+    def add(self, name, cost, func, *args):
+        """
+        Queue ``func(*args)``.
+
+        :param str name: shown in the progress window and the log.
+        :param int cost: ``SCENE``, ``SCENE_HEAVY`` or ``DISK``.
+        """
+        self._steps.append((cost, len(self._steps), name, func, args))
+
+    def run(self):
+        """
+        Run the queued collectors, cheapest first.
+
+        :returns: the names of the collectors skipped by a cancel.
+        """
+        steps = sorted(self._steps)
+        self._steps = []
+        progress = _Progress(self.title, len(steps))
+        skipped = []
+        try:
+            for (index, (cost, _, name, func, args)) in enumerate(steps):
+                if progress.cancelled():
+                    skipped = [step[2] for step in steps[index:]]
+                    break
+                progress.update(index, name)
+                start = time.time()
+                func(*args)
+                self.timings.append((name, time.time() - start))
+        finally:
+            progress.close()
+
+        for (name, seconds) in self.timings:
+            self.logger.debug("collected %s in %.2fs" % (name, seconds))
+        if skipped:
+            self.logger.warning(
+                "Collection cancelled, skipped: %s" % ", ".join(skipped))
+        return skipped
+
+
+class _Progress(object):
+    """
+    Interruptable maya progress window, nothing in batch mode.
+    """
+
+    def __init__(self, title, count):
+        import maya.cmds as cmds
+
+        self._count = max(count, 1)
+        self._enabled = not cmds.about(batch=True)
+        if self._enabled:
+            cmds.progressWindow(title=title, progress=0, maxValue=self._count,
+                                status=u"", isInterruptable=True)
+
+    def update(self, index, name):
+        if not self._enabled:
+            return
+        import maya.cmds as cmds
+        # the window repaints itself, no Qt event processing: the publisher
+        # is still inside its collect and would take clicks on a half built
+        # tree
+        cmds.progressWindow(edit=True, progress=index, status=name)
+
+    def cancelled(self):
+        if not self._enabled:
+            return False
+        import maya.cmds as cmds
+        return cmds.progressWindow(query=True, isCancelled=True)
+
+    def close(self):
+        if not self._enabled:
+            return
+        import maya.cmds as cmds
+        cmds.progressWindow(endProgress=True)
@@ -0,0 +1,136 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+'''
+@ author：huangsheng
+@ date: 2026/10/28 15:00
+@ description:
+    Compares ``file_copy`` with the serial copy the publish used so far:
+
+        python copy_benchmark.py [--small 10000] [--small-size 16]
+               [--large 3] [--large-size 2048] [--folder /path/on/share]
+               [--threads 8] [--repeat 3] [--report report.json]
+
+    Sizes are in KB for the small files and MB for the large ones. The
+    serial copy is ``shutil.copy2`` file after file, which is what
+    ``sgtk.util.filesystem.copy_folder`` does. Run with ``--folder`` on the
+    storage the publishes go to, the temporary folder may be a local disk.
+
+'''
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+# make the cfa_pipeline package importable
+_hooks = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _hooks not in sys.path:
+    sys.path.insert(0, _hooks)
+
+from cfa_pipeline import file_copy
+
+
+def build_source(folder, count, size, large_count, large_size):
+    """
+    ``count`` files of ``size`` bytes spread in 100 folders under
+    ``folder/small``, ``large_count`` files of ``large_size`` bytes under
+    ``folder/large``.
+    """
+    block = os.urandom(1024 * 1024)
+    small = os.path.join(folder, "small")
+    for i in range(count):
+        sub = os.path.join(small, "%02d" % (i % 100))
+        if not os.path.isdir(sub):
+            os.makedirs(sub)
+        with open(os.path.join(sub, "file%05d.bin" % i), "wb") as f:
+            f.write(block[:size])
+    large = os.path.join(folder, "large")
+    os.makedirs(large)
+    for i in range(large_count):
+        with open(os.path.join(large, "file%d.bin" % i), "wb") as f:
+            for _ in range(large_size // len(block)):
+                f.write(block)
+            f.write(block[:large_size % len(block)])
+    return small, large
+
+
+def serial_copy(src, dst):
+    for (root, _, files) in os.walk(src):
+        target = os.path.join(dst, os.path.relpath(root, src))
+        if not os.path.isdir(target):
+            os.makedirs(target)
+        for name in files:
+            shutil.copy2(os.path.join(root, name), os.path.join(target, name))
+
+
+def measure(src, folder, threads, repeat):
+    """
+    Copy ``src`` with both engines, best of ``repeat``.
+
+    :returns: ``{engine: {"seconds": s, "throughput": MB/s}}``
+    """
+    size = sum(os.path.getsize(os.path.join(root, name))
+               for (root, _, files) in os.walk(src) for name in files)
+    engines = {
+        "serial": serial_copy,
+        "file_copy": lambda s, d: file_copy.copy_folder(s, d, threads),
+    }
+    results = {}
+    for (engine, copy) in sorted(engines.items()):
+        times = []
+        for i in range(repeat):
+            dst = os.path.join(folder, "%s_%s%d" % (
+                os.path.basename(src), engine, i))
+            start = time.time()
+            copy(src, dst)
+            times.append(time.time() - start)
+            shutil.rmtree(dst, ignore_errors=True)
+        results[engine] = {
+            "seconds": min(times),
+            "throughput": size / 1048576.0 / max(min(times), 1e-6),
+        }
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Compare file_copy with the serial copy.")
+    parser.add_argument("--small", type=int, default=10000)
+    parser.add_argument("--small-size", type=int, default=16)
+    parser.add_argument("--large", type=int, default=3)
+    parser.add_argument("--large-size", type=int, default=2048)
+    parser.add_argument("--folder", help="folder the copies are made in")
+    parser.add_argument("--threads", type=int, default=file_copy.THREADS)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--report", help="json file the results go to")
+    args = parser.parse_args(argv)
+
+    folder = tempfile.mkdtemp(prefix="cfa_copy_benchmark.", dir=args.folder)
+    try:
+        (small, large) = build_source(
+            folder, args.small, args.small_size * 1024, args.large,
+            args.large_size * 1024 * 1024)
+        results = {
+            "small": measure(small, folder, args.threads, args.repeat),
+            "large": measure(large, folder, args.threads, args.repeat),
+        }
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+    print("%-8s %-10s %10s %10s" % ("files", "engine", "seconds", "MB/s"))
+    for (files, engines) in sorted(results.items()):
+        for (engine, result) in sorted(engines.items()):
+            print("%-8s %-10s %10.2f %10.1f" % (
+                files, engine, result["seconds"], result["throughput"]))
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump({"arguments": vars(args), "results": results}, f,
+                      indent=4)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,202 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+'''
+@ author：huangsheng
+@ date: 2026/10/19 9:40
+@ description:
+    Finds the published files the current maya session depends on.
+
+    References and file texture paths are read in one pass through the API,
+    udim / frame tokens are expanded to the tile and frame files against a
+    single listing per folder (listed in a thread pool, no stat per file),
+    missing files are dropped and the files, their sequences and folders are
+    matched to PublishedFiles with one batched lookup. Only paths that are
+    actually published end up in the publish dependencies.
+
+'''
+
+import os
+import re
+from multiprocessing.pool import ThreadPool
+
+import sgtk
+
+from cfa_pipeline import publish_cache
+
+# texture tokens maya resolves at render time
+TOKEN_PATTERN = re.compile(r"(u<U>_v<V>|<UDIM>|<UVTILE>|<f>|#+|%0\dd)",
+                           re.IGNORECASE)
+# udim tile number in a concrete file name, e.g. tex.1001.exr
+UDIM_NUMBER_PATTERN = re.compile(r"(?<!\d)(1\d{3})(?!\d)")
+# frame number in a concrete file name, e.g. tex.0012.exr
+FRAME_NUMBER_PATTERN = re.compile(r"(\d+)(?=\.\w+$)")
+
+# maya uvTilingMode value for UDIM (Mari)
+UDIM_TILING_MODE = 3
+
+
+def scan_session_dependencies(tk, workers=16, logger=None):
+    """
+    Return the published paths the current session depends on.
+
+    :param tk: sgtk instance used for the PublishedFile lookup.
+    :param int workers: number of threads listing the folders.
+    :param logger: optional logger for a summary line.
+    :returns: sorted list of local paths registered as PublishedFiles.
+    """
+    paths = set(_reference_paths())
+    paths.update(_texture_paths())
+
+    existing = expand_existing(paths, workers)
+
+    # sequences may be published under their token, texture folders as a
+    # whole: look both up as well
+    candidates = set(existing)
+    candidates.update(_sequence_paths(paths, existing))
+    candidates.update(os.path.dirname(path) for path in existing)
+
+    published = {}
+    if candidates:
+        published = sgtk.util.find_publish(tk, sorted(candidates), fields=["id"])
+
+    if logger:
+        logger.debug(
+            "Session dependencies: %d path(s) found, %d file(s) on disk, "
+            "%d published." % (len(paths), len(existing), len(published)))
+
+    return sorted(published)
+
+
+def expand_existing(paths, workers=16):
+    """
+    Return the files on disk ``paths`` stand for.
+
+    Paths with udim or frame tokens are expanded to the matching files,
+    other paths are kept if they exist. Each folder is listed once, the
+    listings run in a thread pool.
+    """
+    paths = [p for p in paths if p]
+    folders = sorted(set(os.path.dirname(p) for p in paths))
+    if not folders:
+        return []
+
+    pool = ThreadPool(max(1, min(workers, len(folders))))
+    try:
+        listings = dict(zip(folders, pool.map(_list_folder, folders)))
+    finally:
+        pool.close()
+        pool.join()
+
+    existing = set()
+    for path in paths:
+        existing.update(expand_tokens(path, listings[os.path.dirname(path)]))
+    return sorted(existing)
+
+
+def expand_tokens(path, listing=None):
+    """
+    Return the files on disk matching a path with udim or frame tokens, or
+    ``path`` itself if it has none and exists.
+
+    :param str path: path that may contain ``<UDIM>``, ``####`` etc.
+    :param dict listing: names of the folder by normcased name, listed if
+        not given.
+    """
+    (folder, name) = os.path.split(path)
+    if listing is None:
+        listing = _list_folder(folder)
+    if not TOKEN_PATTERN.search(name):
+        return [path] if os.path.normcase(name) in listing else []
+    pattern = _token_regex(name)
+    return sorted(os.path.join(folder, entry)
+                  for (key, entry) in listing.items() if pattern.match(key))
+
+
+def _sequence_paths(paths, existing):
+    # the token paths with files on disk, ``####`` also as ``%04d``
+    folders = set(os.path.dirname(path) for path in existing)
+    sequences = set()
+    for path in paths:
+        (folder, name) = os.path.split(path)
+        if not TOKEN_PATTERN.search(name) or folder not in folders:
+            continue
+        sequences.add(path)
+        sequences.add(os.path.join(folder, re.sub(
+            r"#+", lambda m: "%%0%dd" % len(m.group(0)), name)))
+    return sequences
+
+
+def _reference_paths():
+    """
+    Return the file paths of the references in the scene.
+    """
+    import maya.api.OpenMaya as om
+
+    paths = []
+    iterator = om.MItDependencyNodes(om.MFn.kReference)
+    while not iterator.isDone():
+        try:
+            path = om.MFnReference(iterator.thisNode()).fileName(
+                True, True, False)
+        except RuntimeError:
+            # shared or unresolved reference nodes have no file
+            path = None
+        if path:
+            # make it platform dependent (maya uses C:/style/paths), local
+            # copies of the publish cache are looked up as the publish
+            paths.append(publish_cache.source_path(
+                path.replace("/", os.path.sep)))
+        iterator.next()
+    return paths
+
+
+def _texture_paths():
+    """
+    Return the texture paths of the file nodes defined in this scene.
+
+    Tiled and frame sequence textures are returned with their token so that
+    they are expanded against the folder listing.
+    """
+    import maya.api.OpenMaya as om
+
+    paths = []
+    iterator = om.MItDependencyNodes(om.MFn.kFileTexture)
+    while not iterator.isDone():
+        node = om.MFnDependencyNode(iterator.thisNode())
+        iterator.next()
+        # referenced file nodes are dependencies of their reference
+        if node.isFromReferencedFile:
+            continue
+        path = node.findPlug("fileTextureName", False).asString()
+        if not path:
+            continue
+        (folder, name) = os.path.split(path)
+        if node.findPlug("uvTilingMode", False).asInt() == UDIM_TILING_MODE:
+            name = UDIM_NUMBER_PATTERN.sub("<UDIM>", name, count=1)
+        elif node.findPlug("useFrameExtension", False).asBool():
+            name = FRAME_NUMBER_PATTERN.sub(
+                lambda m: "#" * len(m.group(1)), name, count=1)
+        # make it platform dependent (maya uses C:/style/paths)
+        paths.append(os.path.join(folder, name).replace("/", os.path.sep))
+    return paths
+
+
+def _token_regex(name):
+    parts = TOKEN_PATTERN.split(name)
+    regex = []
+    for (i, part) in enumerate(parts):
+        if i % 2 == 0:
+            regex.append(re.escape(os.path.normcase(part)))
+        elif part.lower() == "u<u>_v<v>":
+            regex.append(r"u\d+_v\d+")
+        else:
+            regex.append(r"\d+")
+    return re.compile("^%s$" % "".join(regex))
+
+
+def _list_folder(folder):
+    try:
+        return dict((os.path.normcase(name), name)
+                    for name in os.listdir(folder))
+    except OSError:
+        return {}
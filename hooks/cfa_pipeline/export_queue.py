@@ -0,0 +1,329 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+'''
+@ author：huangsheng
+@ date: 2026/10/21 10:10
+@ description:
+    Local SQLite queue of the export jobs run by the headless workers.
+
+    The interactive publish puts jobs, the workers claim them one at a time
+    (a worker prefers jobs on the scene it already has open) and record the
+    result. A job put after another one waits for it to be done, and fails
+    if it failed. Every process opens its own connection, the database file
+    is the only thing they share.
+
+'''
+
+import json
+import os
+import socket
+import sqlite3
+import time
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+# a worker without heartbeat for that long is considered dead, its running
+# jobs are queued again. long maya commands can keep the heartbeat thread
+# from running, so this is well above the heartbeat interval.
+WORKER_TIMEOUT = 1800
+
+# a worker spawned but not initialized yet counts that long, a worker dying
+# while it starts is replaced sooner than a running one
+STARTUP_TIMEOUT = 300
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    scene TEXT,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL,
+    worker TEXT,
+    created REAL,
+    started REAL,
+    finished REAL,
+    result TEXT,
+    error TEXT,
+    after_job INTEGER
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, id);
+CREATE TABLE IF NOT EXISTS workers (
+    name TEXT PRIMARY KEY,
+    pid INTEGER,
+    heartbeat REAL,
+    starting INTEGER DEFAULT 0
+);
+"""
+
+# the workers with a recent heartbeat, or started recently and still
+# initializing, parameters: the heartbeat and startup limits
+_ALIVE = ("((starting = 0 AND heartbeat > ?) OR "
+          "(starting = 1 AND heartbeat > ?))")
+
+
+def worker_name(pid=None):
+    """
+    Return the name of the worker process ``pid``, the current one if None.
+    """
+    return "%s-%d" % (socket.gethostname(), pid or os.getpid())
+
+
+def default_queue_path():
+    """
+    Return the path of the queue database, ``CFA_EXPORT_QUEUE`` or a file in
+    the user's home folder.
+    """
+    path = os.environ.get("CFA_EXPORT_QUEUE")
+    if not path:
+        path = os.path.join(
+            os.path.expanduser("~"), ".cfa_pipeline", "export_queue.db")
+    return path
+
+
+class Job(object):
+    """
+    A row of the jobs table.
+    """
+
+    def __init__(self, row):
+        (self.id, self.kind, self.scene, payload, self.status, self.worker,
+         self.created, self.started, self.finished, result, self.error,
+         self.after_job) = row
+        self.payload = json.loads(payload)
+        self.result = json.loads(result) if result else None
+
+    def __repr__(self):
+        return "<Job %s %s %s>" % (self.id, self.kind, self.status)
+
+
+class JobQueue(object):
+    """
+    Export jobs stored in a SQLite database.
+
+    :param str path: database file, created if needed.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or default_queue_path()
+        folder = os.path.dirname(self.path)
+        if folder and not os.path.isdir(folder):
+            os.makedirs(folder)
+        # autocommit, transactions are opened explicitly
+        self._connection = sqlite3.connect(
+            self.path, timeout=30, isolation_level=None)
+        self._connection.executescript(_SCHEMA)
+        columns = [row[1] for row in
+                   self._connection.execute("PRAGMA table_info(jobs)")]
+        if "after_job" not in columns:
+            # queue created before jobs could wait for each other
+            self._connection.execute(
+                "ALTER TABLE jobs ADD COLUMN after_job INTEGER")
+        columns = [row[1] for row in
+                   self._connection.execute("PRAGMA table_info(workers)")]
+        if "starting" not in columns:
+            self._connection.execute(
+                "ALTER TABLE workers ADD COLUMN starting INTEGER DEFAULT 0")
+
+    def close(self):
+        self._connection.close()
+
+    def put(self, kind, scene, payload, after=None):
+        """
+        Queue a job.
+
+        :param str kind: exporter name, see ``export_service.EXPORTERS``.
+        :param str scene: scene the worker opens before running the job.
+        :param dict payload: json serializable job data.
+        :param int after: id of the job this one waits for.
+        :returns: the job id.
+        """
+        cursor = self._connection.execute(
+            "INSERT INTO jobs (kind, scene, payload, status, created, "
+            "after_job) VALUES (?, ?, ?, ?, ?, ?)",
+            (kind, scene, json.dumps(payload), QUEUED, time.time(), after))
+        return cursor.lastrowid
+
+    def claim(self, worker, scene=None):
+        """
+        Mark the oldest queued job as running for ``worker`` and return it.
+        Jobs waiting for a job that is not done are skipped, the ones
+        waiting for a failed job fail.
+
+        :param str scene: scene the worker has open, its jobs come first.
+        :returns: :class:`Job` or None if nothing can run.
+        """
+        connection = self._connection
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.execute(
+                "UPDATE jobs SET status = ?, finished = ?, "
+                "error = 'Waited for job ' || after_job || ', which failed.' "
+                "WHERE status = ? AND after_job IN "
+                "(SELECT id FROM jobs WHERE status = ?)",
+                (FAILED, time.time(), QUEUED, FAILED))
+            row = connection.execute(
+                "SELECT id FROM jobs WHERE status = ? AND (after_job IS NULL "
+                "OR after_job IN (SELECT id FROM jobs WHERE status = ?)) "
+                "ORDER BY (scene = ?) DESC, id LIMIT 1",
+                (QUEUED, DONE, scene)).fetchone()
+            if row is None:
+                connection.execute("COMMIT")
+                return None
+            connection.execute(
+                "UPDATE jobs SET status = ?, worker = ?, started = ? "
+                "WHERE id = ?",
+                (RUNNING, worker, time.time(), row[0]))
+            connection.execute("COMMIT")
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+        return self.get(row[0])
+
+    def complete(self, job_id, result=None):
+        """
+        Record the result of a finished job.
+        """
+        self._finish(job_id, DONE, json.dumps(result), None)
+
+    def fail(self, job_id, error):
+        """
+        Record the error of a failed job.
+        """
+        self._finish(job_id, FAILED, None, error)
+
+    def get(self, job_id):
+        """
+        Return the :class:`Job` ``job_id``, None if it does not exist.
+        """
+        row = self._connection.execute(
+            "SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return Job(row) if row else None
+
+    def count(self, status=QUEUED):
+        """
+        Return the number of jobs with ``status``.
+        """
+        return self._connection.execute(
+            "SELECT COUNT(*) FROM jobs WHERE status = ?",
+            (status,)).fetchone()[0]
+
+    def heartbeat(self, worker, pid=None, starting=False):
+        """
+        Record that ``worker`` is alive.
+
+        :param bool starting: the worker is not initialized yet, see
+            ``STARTUP_TIMEOUT``.
+        """
+        self._connection.execute(
+            "INSERT OR REPLACE INTO workers (name, pid, heartbeat, starting) "
+            "VALUES (?, ?, ?, ?)",
+            (worker, pid or os.getpid(), time.time(), int(starting)))
+
+    def remove_worker(self, worker):
+        self._connection.execute("DELETE FROM workers WHERE name = ?", (worker,))
+
+    def alive_workers(self, timeout=WORKER_TIMEOUT,
+                      startup_timeout=STARTUP_TIMEOUT):
+        """
+        Return the names of the workers with a recent heartbeat, the
+        starting ones included.
+        """
+        now = time.time()
+        rows = self._connection.execute(
+            "SELECT name FROM workers WHERE " + _ALIVE,
+            (now - timeout, now - startup_timeout)).fetchall()
+        return [row[0] for row in rows]
+
+    def start_workers(self, workers, spawn, timeout=WORKER_TIMEOUT,
+                      startup_timeout=STARTUP_TIMEOUT):
+        """
+        Start the workers missing for the queued jobs, at most ``workers``
+        alive including the starting ones.
+
+        Runs in a transaction, the sessions sharing the queue don't start
+        workers for the same jobs.
+
+        :param spawn: callable starting a worker process and returning its
+            pid, recorded as a starting worker.
+        :returns: the number of workers started.
+        """
+        connection = self._connection
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            now = time.time()
+            (alive, starting) = connection.execute(
+                "SELECT COUNT(*), TOTAL(starting) FROM workers WHERE "
+                + _ALIVE, (now - timeout, now - startup_timeout)).fetchone()
+            (queued,) = connection.execute(
+                "SELECT COUNT(*) FROM jobs WHERE status = ?",
+                (QUEUED,)).fetchone()
+            # each starting worker takes one of the queued jobs
+            missing = min(workers - alive, queued - int(starting))
+            for _ in range(max(0, missing)):
+                pid = spawn()
+                connection.execute(
+                    "INSERT OR REPLACE INTO workers "
+                    "(name, pid, heartbeat, starting) VALUES (?, ?, ?, 1)",
+                    (worker_name(pid), pid, time.time()))
+            connection.execute("COMMIT")
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+        return max(0, missing)
+
+    def requeue_stale(self, timeout=WORKER_TIMEOUT,
+                      startup_timeout=STARTUP_TIMEOUT):
+        """
+        Queue again the running jobs of dead workers and forget the workers.
+
+        :returns: the number of jobs queued again.
+        """
+        now = time.time()
+        limits = (now - timeout, now - startup_timeout)
+        connection = self._connection
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            cursor = connection.execute(
+                "UPDATE jobs SET status = ?, worker = NULL, started = NULL "
+                "WHERE status = ? AND worker NOT IN "
+                "(SELECT name FROM workers WHERE " + _ALIVE + ")",
+                (QUEUED, RUNNING) + limits)
+            connection.execute(
+                "DELETE FROM workers WHERE NOT (" + _ALIVE + ")", limits)
+            connection.execute("COMMIT")
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+        return cursor.rowcount
+
+    def release(self, scene, callback):
+        """
+        Call ``callback(scene)`` if no job on ``scene`` is queued or running.
+
+        Runs in a transaction, a job put on ``scene`` meanwhile waits for
+        it.
+
+        :returns: True if ``callback`` was called.
+        """
+        connection = self._connection
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            (count,) = connection.execute(
+                "SELECT COUNT(*) FROM jobs WHERE scene = ? "
+                "AND status IN (?, ?)", (scene, QUEUED, RUNNING)).fetchone()
+            if not count:
+                callback(scene)
+            connection.execute("COMMIT")
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+        return not count
+
+    def _finish(self, job_id, status, result, error):
+        self._connection.execute(
+            "UPDATE jobs SET status = ?, finished = ?, result = ?, error = ? "
+            "WHERE id = ?",
+            (status, time.time(), result, error, job_id))
@@ -0,0 +1,383 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+'''
+@ author：huangsheng
+@ date: 2026/10/21 10:40
+@ description:
+    Out-of-process exports for the maya publish plugins.
+
+    The plugin hands the saved scene off, queues the export with the data
+    needed to register the publish, and gets the UI back. Headless mayapy
+    workers (``export_worker.py``) open the handed-off scene, run the same
+    exporter and register the PublishedFile. ``LocalExecutor`` runs the
+    queue in the current process instead, e.g. to test it without mayapy.
+
+    A handoff is a folder holding a copy of the scene and of its xgen files,
+    deleted once no job on it is left.
+
+'''
+
+import glob
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+from cfa_pipeline import checksum, export_queue, file_copy, xgen_palette
+
+# folder the scenes are handed off to
+HANDOFF_DIR = os.path.join(tempfile.gettempdir(), "cfa_export_handoff")
+
+# (scene path, mtime) -> handed off copy
+_handoffs = {}
+
+# files saved next to a scene, named after it
+_SIDECAR_PATTERN = "%s__*"
+
+
+def export_fbx(data):
+    """
+    FBXExport of ``data["nodes"]`` to ``data["path"]``.
+    """
+    import maya.cmds as cmds
+    import maya.mel as mel
+
+    if not cmds.pluginInfo("fbxmaya", query=True, loaded=True):
+        cmds.loadPlugin("fbxmaya", quiet=True)
+    _ensure_folder(data["path"])
+    cmds.select(data["nodes"], r=True)
+    mel.eval('FBXExport -f "%s" -s' % data["path"])
+    return data["path"]
+
+
+def export_xgen(data):
+    """
+    exportPalette of ``data["collection"]`` to ``data["path"]``, see
+    :func:`~xgen_palette.export_palette`.
+    """
+    return xgen_palette.export_palette(
+        data["collection"], data["path"], data["project_path"],
+        data["version"])
+
+
+def export_uv_snapshot(data):
+    """
+    uvSnapshot of ``data["node"]`` to ``data["path"]``.
+    """
+    import maya.cmds as cmds
+
+    _ensure_folder(data["path"])
+    cmds.uvSnapshot(data["node"], o=True, ff=data.get("format", "tif"),
+                    xr=data.get("resolution", 2048),
+                    yr=data.get("resolution", 2048),
+                    aa=True, n=data["path"])
+    return data["path"]
+
+
+def export_proxies(data):
+    """
+    gpuCache, LOD and bounding box proxies, see
+    :func:`~proxy_publish.export_proxies`.
+    """
+    from cfa_pipeline import proxy_publish
+    return proxy_publish.export_proxies(data)
+
+
+# job kind -> exporter, called with the "export" part of the payload
+EXPORTERS = {
+    "fbx": export_fbx,
+    "xgen": export_xgen,
+    "uv_snapshot": export_uv_snapshot,
+    "proxies": export_proxies,
+}
+
+
+def publish_data(plugin, settings, item, path, publish_type, name=None,
+                 dependency_paths=None, dependency_ids=None):
+    """
+    Return what a worker needs to register the publish of ``item``.
+
+    :param plugin: the publish plugin, its ``get_publish_*`` methods are
+        evaluated now, in the interactive session.
+    :param str path: file written by the export.
+    :param str publish_type: PublishedFile type.
+    :param str name: publish name, the one of ``item`` by default.
+    :param list dependency_paths: the dependencies of ``item`` by default.
+    :param list dependency_ids: ids of the PublishedFiles depended on, the
+        publish of the parent item by default, as the base class does.
+    """
+    import sgtk
+    from cfa_pipeline import item_groups
+
+    if dependency_paths is None and dependency_ids is None:
+        dependency_paths = plugin.get_publish_dependencies(settings, item)
+        parent = item_groups.publish_parent(item)
+        parent_data = parent.properties.get("sg_publish_data") \
+            if parent is not None else None
+        if parent_data:
+            dependency_ids = [parent_data["id"]]
+    return {
+        "path": path,
+        "name": name or plugin.get_publish_name(settings, item),
+        "version_number": plugin.get_publish_version(settings, item),
+        "published_file_type": publish_type,
+        "dependency_paths": dependency_paths or [],
+        "dependency_ids": dependency_ids or [],
+        "comment": item.description,
+        "checksum_field": checksum.field(settings, plugin.parent.sgtk,
+                                         plugin.logger),
+        # carries the user credentials, the worker is authenticated with it
+        "context": item.context.serialize(),
+        "sgtk_path": os.path.dirname(os.path.dirname(sgtk.__file__)),
+    }
+
+
+def submit(item, kind, export, publish=None, queue=None, workers=None,
+           after=None):
+    """
+    Queue an export of the current scene and make sure workers run it.
+
+    :param item: publish item, used to save the scene once per publish.
+    :param str kind: exporter name, a key of ``EXPORTERS``.
+    :param dict export: exporter arguments.
+    :param publish: registration data, see :func:`publish_data`, or a list
+        of them for exports writing several publishes.
+    :param queue: :class:`~export_queue.JobQueue`, the default queue if None.
+    :param int workers: maximum number of workers, see :func:`ensure_workers`.
+    :param int after: id of a job whose publishes the publishes of this job
+        depend on, the job waits for it.
+    :returns: the job id.
+    """
+    queue = queue or export_queue.JobQueue()
+    scene = handoff_scene(item)
+    job_id = queue.put(kind, scene, {"export": export, "publish": publish},
+                       after)
+    if not os.path.isfile(scene):
+        # released by a worker between the handoff and the put, the job now
+        # keeps it
+        _copy_handoff(_handoff_source(scene), scene)
+    ensure_workers(queue, workers)
+    return job_id
+
+
+def handoff_scene(item):
+    """
+    Save the scene if needed and return a copy the workers can open.
+
+    The copy is made once per saved state of the scene, the work file can be
+    versioned up or modified while the jobs are running. It is deleted by
+    :func:`release_handoff` once its jobs are finished.
+    """
+    import maya.cmds as cmds
+    # imports sgtk, not available in the workers before a job is run
+    from cfa_pipeline import save_coordinator
+
+    save_coordinator.get(item).save()
+    scene = cmds.file(query=True, sn=True)
+    key = (scene, os.path.getmtime(scene))
+    if key not in _handoffs or not os.path.isfile(_handoffs[key]):
+        if not os.path.isdir(HANDOFF_DIR):
+            os.makedirs(HANDOFF_DIR)
+        (name, _) = os.path.splitext(os.path.basename(scene))
+        # the scene keeps its name, its xgen files are found next to it
+        folder = tempfile.mkdtemp(prefix="%s." % name, dir=HANDOFF_DIR)
+        path = os.path.join(folder, os.path.basename(scene))
+        _copy_handoff(scene, path)
+        _handoffs[key] = path
+    return _handoffs[key]
+
+
+def release_handoff(queue, scene):
+    """
+    Delete the handed-off ``scene`` if no job on it is queued or running.
+
+    :param queue: :class:`~export_queue.JobQueue` the jobs are in.
+    :returns: True if the handoff was deleted.
+    """
+    folder = os.path.dirname(os.path.abspath(scene))
+    if os.path.normcase(os.path.dirname(folder)) != \
+            os.path.normcase(os.path.abspath(HANDOFF_DIR)):
+        # not a handoff
+        return False
+    return queue.release(
+        scene, lambda _: shutil.rmtree(folder, ignore_errors=True))
+
+
+def ensure_workers(queue, workers=None, mayapy=None):
+    """
+    Start headless workers for the queued jobs.
+
+    A started worker counts as alive before it is initialized, see
+    :meth:`~export_queue.JobQueue.start_workers`.
+
+    :param int workers: maximum number of workers, one core is left to the
+        interactive session by default.
+    :param str mayapy: mayapy executable, found next to the running maya (or
+        ``CFA_MAYAPY``) if not given.
+    :returns: the number of workers started.
+    """
+    import multiprocessing
+
+    if workers is None:
+        workers = max(1, multiprocessing.cpu_count() - 1)
+    queue.requeue_stale()
+
+    mayapy = mayapy or _mayapy()
+    script = os.path.join(os.path.dirname(__file__), "export_worker.py")
+    kwargs = {"close_fds": True}
+    if sys.platform == "win32":
+        # CREATE_NO_WINDOW
+        kwargs = {"creationflags": 0x08000000}
+
+    def spawn():
+        return subprocess.Popen(
+            [mayapy, script, "--queue", queue.path], **kwargs).pid
+
+    return queue.start_workers(workers, spawn)
+
+
+def run_job(job, open_scene=None, queue=None):
+    """
+    Run the exporter of ``job`` and register its publish.
+
+    :param job: :class:`~export_queue.Job`.
+    :param open_scene: callable opening ``job.scene``, None to run on the
+        scene currently open.
+    :param queue: :class:`~export_queue.JobQueue` of the job, to find the
+        publishes of the job it waits for.
+    :returns: the job result, ``{"path": ..., "publish_id": ...,
+        "publish_ids": [...]}``.
+    :raises RuntimeError: if the job it waits for registered nothing.
+    """
+    publishes = job.payload.get("publish") or []
+    if isinstance(publishes, dict):
+        publishes = [publishes]
+    if job.after_job is not None:
+        after = queue.get(job.after_job) if queue is not None else None
+        ids = ((after.result if after else None) or {}).get("publish_ids")
+        if not ids:
+            raise RuntimeError(
+                "Job %s registered no publish to depend on." % job.after_job)
+        for data in publishes:
+            data["dependency_ids"] = list(data.get("dependency_ids") or []) + ids
+
+    if open_scene is not None:
+        open_scene(job.scene)
+    path = EXPORTERS[job.kind](job.payload["export"])
+    publish_ids = [register_publish(data) for data in publishes]
+    return {
+        "path": path,
+        "publish_id": publish_ids[0] if publish_ids else None,
+        "publish_ids": publish_ids,
+    }
+
+
+def register_publish(data):
+    """
+    Register the PublishedFile described by ``data`` (see
+    :func:`publish_data`).
+
+    :returns: the id of the PublishedFile.
+    """
+    if data["sgtk_path"] not in sys.path:
+        sys.path.insert(0, data["sgtk_path"])
+    import sgtk
+
+    # also authenticates the user the context was serialized with
+    context = sgtk.Context.deserialize(str(data["context"]))
+    publish = sgtk.util.register_publish(
+        context.sgtk,
+        context,
+        data["path"],
+        data["name"],
+        data["version_number"],
+        comment=data.get("comment") or "",
+        published_file_type=data["published_file_type"],
+        dependency_paths=data.get("dependency_paths") or [],
+        dependency_ids=data.get("dependency_ids") or [],
+    )
+    if data.get("checksum_field") and os.path.isfile(data["path"]):
+        service = checksum.ChecksumService()
+        try:
+            checksum.attach(context.sgtk, service, [
+                (publish, data["path"], data["checksum_field"])],
+                sgtk.platform.get_logger(__name__))
+        finally:
+            service.close()
+    return publish["id"]
+
+
+class LocalExecutor(object):
+    """
+    Runs the queued jobs in the current process, one after the other.
+
+    Stand-in for the mayapy workers, exercises the queue where mayapy is not
+    available.
+
+    :param queue: :class:`~export_queue.JobQueue` to run.
+    :param open_scene: callable opening a job's scene, None to run the jobs
+        on the scene currently open.
+    """
+
+    def __init__(self, queue, open_scene=None, name="local"):
+        self.queue = queue
+        self.open_scene = open_scene
+        self.name = name
+
+    def run(self, max_jobs=None):
+        """
+        Run queued jobs until the queue is empty or ``max_jobs`` ran.
+
+        :returns: the jobs run, with their final status.
+        """
+        jobs = []
+        while max_jobs is None or len(jobs) < max_jobs:
+            self.queue.heartbeat(self.name)
+            job = self.queue.claim(self.name)
+            if job is None:
+                break
+            try:
+                self.queue.complete(
+                    job.id, run_job(job, self.open_scene, self.queue))
+            except Exception as e:
+                self.queue.fail(job.id, str(e))
+            if job.scene:
+                release_handoff(self.queue, job.scene)
+            jobs.append(self.queue.get(job.id))
+        return jobs
+
+
+def _copy_handoff(scene, path):
+    (folder, name) = os.path.split(scene)
+    target = os.path.dirname(path)
+    if not os.path.isdir(target):
+        os.makedirs(target)
+    pairs = [(scene, path)]
+    for sidecar in glob.glob(os.path.join(
+            folder, _SIDECAR_PATTERN % os.path.splitext(name)[0])):
+        if os.path.isfile(sidecar):
+            pairs.append(
+                (sidecar, os.path.join(target, os.path.basename(sidecar))))
+    file_copy.copy_files(pairs)
+
+
+def _handoff_source(path):
+    for ((scene, _), handoff) in _handoffs.items():
+        if handoff == path:
+            return scene
+    raise KeyError(path)
+
+
+def _ensure_folder(path):
+    folder = os.path.dirname(path)
+    if folder and not os.path.isdir(folder):
+        os.makedirs(folder)
+
+
+def _mayapy():
+    mayapy = os.environ.get("CFA_MAYAPY")
+    if mayapy:
+        return mayapy
+    name = "mayapy.exe" if sys.platform == "win32" else "mayapy"
+    return os.path.join(os.path.dirname(sys.executable), name)
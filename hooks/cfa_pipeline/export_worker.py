@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+'''
+@ author：huangsheng
+@ date: 2026/10/21 11:30
+@ description:
+    Headless export worker, run with mayapy:
+
+        mayapy export_worker.py --queue <export_queue.db> [--idle 60]
+
+    Claims the jobs of the queue one by one, keeps the handed-off scene open
+    between jobs of the same scene, and exits when the queue stayed empty for
+    ``--idle`` seconds.
+
+'''
+
+import argparse
+import os
+import sys
+import threading
+import time
+import traceback
+
+# make the cfa_pipeline package importable
+_hooks = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _hooks not in sys.path:
+    sys.path.insert(0, _hooks)
+
+from cfa_pipeline import export_queue, export_service
+
+# seconds between two heartbeats, and between two polls of an empty queue
+HEARTBEAT = 20
+POLL = 2
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless maya export worker.")
+    parser.add_argument("--queue", default=export_queue.default_queue_path())
+    parser.add_argument("--idle", type=float, default=60,
+                        help="exit after that many seconds without jobs")
+    args = parser.parse_args(argv)
+
+    name = export_queue.worker_name()
+    queue = export_queue.JobQueue(args.queue)
+    # counted by the interactive sessions while maya starts, they don't
+    # start other workers for the same jobs
+    queue.heartbeat(name, starting=True)
+
+    import maya.standalone
+    maya.standalone.initialize(name="python")
+
+    queue.heartbeat(name)
+    stop = threading.Event()
+    heartbeat = threading.Thread(
+        target=_heartbeat, args=(args.queue, name, stop))
+    heartbeat.daemon = True
+    heartbeat.start()
+
+    scene = {"path": None}
+
+    def open_scene(path):
+        if path != scene["path"]:
+            import maya.cmds as cmds
+            cmds.file(path, open=True, force=True, prompt=False)
+            scene["path"] = path
+
+    idle_since = time.time()
+    try:
+        while True:
+            job = queue.claim(name, scene["path"])
+            if job is None:
+                if time.time() - idle_since > args.idle:
+                    break
+                time.sleep(POLL)
+                continue
+            try:
+                queue.complete(
+                    job.id, export_service.run_job(job, open_scene, queue))
+            except Exception:
+                queue.fail(job.id, traceback.format_exc())
+            if job.scene and export_service.release_handoff(queue, job.scene):
+                # a job put on it later gets a new copy
+                scene["path"] = None
+            idle_since = time.time()
+    finally:
+        stop.set()
+        heartbeat.join()
+        queue.remove_worker(name)
+        queue.close()
+        maya.standalone.uninitialize()
+
+
+def _heartbeat(path, name, stop):
+    # sqlite connections can't be shared between threads
+    queue = export_queue.JobQueue(path)
+    while not stop.wait(HEARTBEAT):
+        queue.heartbeat(name)
+    queue.close()
+
+
+if __name__ == "__main__":
+    main()
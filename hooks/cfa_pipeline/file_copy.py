@@ -0,0 +1,217 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+'''
+@ author：huangsheng
+@ date: 2026/10/28 15:00
+@ description:
+    Copy engine for the publish outputs.
+
+    Files are copied by the system without going through python buffers
+    where it can: ``CopyFileW`` on windows (a server side copy between SMB
+    shares), ``copy_file_range`` or ``sendfile`` on linux, a large buffer
+    loop otherwise. Each file is written to a temporary file next to the
+    destination, gets the times and mode of the source and is renamed over
+    the destination, readers never see a partial file. Folders are copied
+    by a thread pool::
+
+        from cfa_pipeline import file_copy
+        stats = file_copy.copy_folder(src, dst)
+        logger.info(stats.report())
+
+'''
+
+import os
+import shutil
+import sys
+import threading
+import time
+from multiprocessing.pool import ThreadPool
+
+# threads copying the files of a folder
+THREADS = 8
+
+# read/write buffer of the python fallback
+BUFFER_SIZE = 8 * 1024 * 1024
+
+# names skipped by copy_folder, as sgtk.util.filesystem.copy_folder
+SKIP_LIST = [".svn", ".git", ".gitignore", ".hg", ".hgignore"]
+
+_WINDOWS = sys.platform.startswith("win")
+
+try:
+    _TEXT = unicode
+except NameError:
+    _TEXT = str
+
+
+class CopyStats(object):
+    """
+    Files and bytes copied and the time it took.
+    """
+
+    def __init__(self):
+        self.files = 0
+        self.bytes = 0
+        self.seconds = 0.0
+        self._lock = threading.Lock()
+
+    def add(self, size):
+        with self._lock:
+            self.files += 1
+            self.bytes += size
+
+    @property
+    def throughput(self):
+        """
+        Bytes per second.
+        """
+        return self.bytes / self.seconds if self.seconds else 0.0
+
+    def report(self):
+        return "%d file(s), %.1f MB in %.2fs (%.1f MB/s)" % (
+            self.files, self.bytes / 1048576.0, self.seconds,
+            self.throughput / 1048576.0)
+
+
+def copy_file(src, dst, stats=None):
+    """
+    Copy ``src`` to ``dst`` through a temporary file, with the times and
+    mode of ``src``. The folder of ``dst`` must exist.
+
+    :param stats: :class:`CopyStats` the copy is added to.
+    :returns: the number of bytes copied.
+    """
+    folder, name = os.path.split(dst)
+    tmp = os.path.join(folder, ".%s.%d.%d.tmp" % (
+        name, os.getpid(), threading.current_thread().ident))
+    try:
+        _copy_data(src, tmp)
+        shutil.copystat(src, tmp)
+        _replace(tmp, dst)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    size = os.path.getsize(dst)
+    if stats is not None:
+        stats.add(size)
+    return size
+
+
+def copy_files(pairs, threads=THREADS):
+    """
+    Copy the ``(src, dst)`` pairs on a thread pool, the destination folders
+    are created.
+
+    :returns: :class:`CopyStats`
+    """
+    stats = CopyStats()
+    start = time.time()
+    pairs = list(pairs)
+    for folder in set(os.path.dirname(dst) for (_, dst) in pairs):
+        if folder and not os.path.isdir(folder):
+            os.makedirs(folder)
+    if len(pairs) == 1 or threads <= 1:
+        for (src, dst) in pairs:
+            copy_file(src, dst, stats)
+    elif pairs:
+        pool = ThreadPool(min(threads, len(pairs)))
+        try:
+            # the largest first, they set the wall clock time
+            pairs.sort(key=lambda pair: -os.path.getsize(pair[0]))
+            pool.map(lambda pair: copy_file(pair[0], pair[1], stats), pairs,
+                     chunksize=1)
+        finally:
+            pool.close()
+            pool.join()
+    stats.seconds = time.time() - start
+    return stats
+
+
+def copy_folder(src, dst, threads=THREADS, skip_list=None):
+    """
+    Copy the folder ``src`` into ``dst``, merged with what ``dst`` already
+    has.
+
+    :param list skip_list: file and folder names not copied,
+        ``SKIP_LIST`` by default.
+    :returns: :class:`CopyStats`
+    """
+    skip = set(SKIP_LIST if skip_list is None else skip_list)
+    pairs = []
+    for (root, folders, files) in os.walk(src):
+        folders[:] = [folder for folder in folders if folder not in skip]
+        target = os.path.join(dst, os.path.relpath(root, src))
+        if not os.path.isdir(target):
+            os.makedirs(target)
+        for name in files:
+            if name not in skip:
+                pairs.append((os.path.join(root, name),
+                              os.path.join(target, name)))
+    return copy_files(pairs, threads)
+
+
+def _copy_data(src, dst):
+    if _WINDOWS:
+        _windows_copy(src, dst)
+        return
+    with open(src, "rb") as fsrc:
+        with open(dst, "wb") as fdst:
+            size = os.fstat(fsrc.fileno()).st_size
+            if hasattr(os, "copy_file_range"):
+                try:
+                    _kernel_copy(os.copy_file_range, fsrc, fdst, size)
+                    return
+                except OSError:
+                    # other file systems, or not supported by the kernel
+                    fsrc.seek(0)
+                    fdst.seek(0)
+                    fdst.truncate()
+            if hasattr(os, "sendfile") and sys.platform.startswith("linux"):
+                try:
+                    _kernel_copy(_sendfile, fsrc, fdst, size)
+                    return
+                except OSError:
+                    fsrc.seek(0)
+                    fdst.seek(0)
+                    fdst.truncate()
+            shutil.copyfileobj(fsrc, fdst, BUFFER_SIZE)
+
+
+def _kernel_copy(func, fsrc, fdst, size):
+    infd, outfd = fsrc.fileno(), fdst.fileno()
+    copied = 0
+    while copied < size:
+        sent = func(infd, outfd, min(size - copied, 1 << 30))
+        if sent == 0:
+            break
+        copied += sent
+
+
+def _sendfile(infd, outfd, count):
+    return os.sendfile(outfd, infd, None, count)
+
+
+def _windows_copy(src, dst):
+    import ctypes
+    if not ctypes.windll.kernel32.CopyFileW(
+            _text(src), _text(dst), False):
+        raise ctypes.WinError()
+
+
+def _replace(src, dst):
+    if hasattr(os, "replace"):
+        os.replace(src, dst)
+    elif _WINDOWS:
+        import ctypes
+        # MOVEFILE_REPLACE_EXISTING
+        if not ctypes.windll.kernel32.MoveFileExW(
+                _text(src), _text(dst), 1):
+            raise ctypes.WinError()
+    else:
+        os.rename(src, dst)
+
+
+def _text(path):
+    if isinstance(path, _TEXT):
+        return path
+    return path.decode("utf-8")
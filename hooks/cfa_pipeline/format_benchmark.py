@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+'''
+@ author：huangsheng
+@ date: 2026/10/25 17:00
+@ description:
+    Compares the maya export formats on synthetic scenes, run with mayapy:
+
+        mayapy format_benchmark.py [--meshes 200] [--subdivisions 40]
+               [--shaders 20] [--repeat 3] [--report report.json]
+
+    For each format of ``maya_formats.FORMATS`` the same scene is exported,
+    then referenced in an empty scene. Export time, file size and reference
+    load time (best of the repeats) are printed.
+
+'''
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+# make the cfa_pipeline package importable
+_hooks = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _hooks not in sys.path:
+    sys.path.insert(0, _hooks)
+
+from cfa_pipeline import maya_formats
+
+
+def build_scene(meshes, subdivisions, shaders):
+    """
+    New scene with ``meshes`` spheres under one group, shared by
+    ``shaders`` lambert networks.
+
+    :returns: the group.
+    """
+    import maya.cmds as cmds
+
+    cmds.file(new=True, force=True)
+    nodes = []
+    for i in range(meshes):
+        (sphere, _) = cmds.polySphere(subdivisionsX=subdivisions,
+                                      subdivisionsY=subdivisions,
+                                      name="bench_geo%d" % i)
+        cmds.move(i % 20 * 2.5, 0, i // 20 * 2.5, sphere)
+        nodes.append(sphere)
+    cmds.delete(nodes, constructionHistory=True)
+
+    for i in range(shaders):
+        shader = cmds.shadingNode("lambert", asShader=True,
+                                  name="bench_mtl%d" % i)
+        texture = cmds.shadingNode("file", asTexture=True,
+                                   name="bench_tex%d" % i)
+        cmds.connectAttr(texture + ".outColor", shader + ".color")
+        group = cmds.sets(renderable=True, noSurfaceShader=True, empty=True,
+                          name=shader + "SG")
+        cmds.connectAttr(shader + ".outColor", group + ".surfaceShader")
+        if nodes[i::shaders]:
+            cmds.sets(nodes[i::shaders], edit=True, forceElement=group)
+    return cmds.group(nodes, name="bench_grp")
+
+
+def measure(root, folder, repeat):
+    """
+    Export ``root`` in every format and reference the files back.
+
+    :returns: ``{format: {"export": s, "size": bytes, "load": s}}``
+    """
+    import maya.cmds as cmds
+
+    results = {}
+    scene = os.path.join(folder, "source.mb")
+    cmds.file(rename=scene)
+    cmds.file(save=True, force=True, type="mayaBinary")
+
+    for (export_format, ext) in sorted(maya_formats.FORMATS.items()):
+        path = os.path.join(folder, "bench.%s" % ext)
+        export_times = []
+        for _ in range(repeat):
+            cmds.select(root, replace=True)
+            start = time.time()
+            maya_formats.export_selected(path, preserveReferences=True)
+            export_times.append(time.time() - start)
+
+        load_times = []
+        for _ in range(repeat):
+            cmds.file(new=True, force=True)
+            start = time.time()
+            cmds.file(path, reference=True, namespace="bench")
+            load_times.append(time.time() - start)
+        cmds.file(scene, open=True, force=True)
+
+        results[export_format] = {
+            "export": min(export_times),
+            "size": os.path.getsize(path),
+            "load": min(load_times),
+        }
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Compare the maya export formats.")
+    parser.add_argument("--meshes", type=int, default=200)
+    parser.add_argument("--subdivisions", type=int, default=40)
+    parser.add_argument("--shaders", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--report", help="json file the results go to")
+    args = parser.parse_args(argv)
+
+    import maya.standalone
+    maya.standalone.initialize(name="python")
+
+    folder = tempfile.mkdtemp(prefix="cfa_format_benchmark.")
+    try:
+        root = build_scene(args.meshes, args.subdivisions, args.shaders)
+        results = measure(root, folder, args.repeat)
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+        maya.standalone.uninitialize()
+
+    print("%-12s %10s %12s %10s" % ("format", "export s", "size MB", "load s"))
+    for (export_format, result) in sorted(results.items()):
+        print("%-12s %10.2f %12.1f %10.2f" % (
+            export_format, result["export"], result["size"] / 1048576.0,
+            result["load"]))
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump({"arguments": vars(args), "results": results}, f,
+                      indent=4)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,160 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+'''
+@ author：huangsheng
+@ date: 2026/10/23 10:00
+@ description:
+    Frame sequences of the image directories.
+
+    A directory is listed once and its files are grouped into sequences
+    (``name.####.ext``) with their frame range and missing frames. Results
+    are cached by the modification time of the directory, a new or removed
+    frame invalidates them.
+
+'''
+
+import fnmatch
+import os
+import re
+
+try:
+    _scandir = os.scandir
+except AttributeError:
+    try:
+        from scandir import scandir as _scandir
+    except ImportError:
+        _scandir = None
+
+# head, frame number and extension of a frame file name
+FRAME_PATTERN = re.compile(r"^(?P<head>.*?)(?P<frame>\d+)(?P<tail>\.[^.\d][^.]*)$")
+
+# directory -> (mtime, sequences)
+_cache = {}
+
+
+class Sequence(object):
+    """
+    Frames of one image sequence of a directory.
+
+    :param str directory: directory of the frames.
+    :param str head: file name before the frame number, ``beauty.``
+    :param str tail: file name after the frame number, ``.exr``
+    :param int padding: digits of the frame numbers.
+    """
+
+    def __init__(self, directory, head, tail, padding):
+        self.directory = directory
+        self.head = head
+        self.tail = tail
+        self.padding = padding
+        self.frames = []
+
+    def __len__(self):
+        return len(self.frames)
+
+    def __repr__(self):
+        return "<Sequence %s %d-%d>" % (self.pattern, self.first, self.last)
+
+    @property
+    def first(self):
+        return self.frames[0]
+
+    @property
+    def last(self):
+        return self.frames[-1]
+
+    @property
+    def pattern(self):
+        """
+        Path of the sequence with a ``%0Nd`` frame spec.
+        """
+        return os.path.join(
+            self.directory, "%s%%0%dd%s" % (self.head, self.padding, self.tail))
+
+    @property
+    def missing(self):
+        """
+        Frames between the first and the last frame that are not on disk.
+        """
+        frames = set(self.frames)
+        return [f for f in range(self.first, self.last + 1) if f not in frames]
+
+    def name(self, frame):
+        return "%s%0*d%s" % (self.head, self.padding, frame, self.tail)
+
+    def path(self, frame):
+        return os.path.join(self.directory, self.name(frame))
+
+    def paths(self):
+        return [self.path(frame) for frame in self.frames]
+
+
+def scan(directory):
+    """
+    Return the frame sequences of ``directory``, sorted by name. A missing
+    directory has no sequences.
+    """
+    directory = os.path.normpath(directory)
+    try:
+        mtime = os.stat(directory).st_mtime
+    except OSError:
+        _cache.pop(directory, None)
+        return []
+
+    cached = _cache.get(directory)
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    sequences = {}
+    match = FRAME_PATTERN.match
+    for name in _list_files(directory):
+        m = match(name)
+        if m is None:
+            continue
+        digits = m.group("frame")
+        key = (m.group("head"), m.group("tail"))
+        sequence = sequences.get(key)
+        if sequence is None:
+            sequence = sequences[key] = Sequence(
+                directory, key[0], key[1], len(digits))
+        elif len(digits) < sequence.padding:
+            # 0999, 1000: the padding is the shortest frame number
+            sequence.padding = len(digits)
+        sequence.frames.append(int(digits))
+
+    result = sorted(sequences.values(), key=lambda s: (s.head, s.tail))
+    for sequence in result:
+        sequence.frames.sort()
+    _cache[directory] = (mtime, result)
+    return result
+
+
+def find(path_glob):
+    """
+    Return the sequences of the directory of ``path_glob`` whose frames match
+    its file name pattern, e.g. ``.../images/shot/beauty.*.exr``.
+    """
+    directory, pattern = os.path.split(path_glob)
+    regex = re.compile(fnmatch.translate(pattern))
+    return [s for s in scan(directory) if regex.match(s.name(s.first))]
+
+
+def clear():
+    """
+    Forget the scanned directories.
+    """
+    _cache.clear()
+
+
+def _list_files(directory):
+    # one directory read, the names of the files only
+    if _scandir is None:
+        return os.listdir(directory)
+    names = []
+    for entry in _scandir(directory):
+        try:
+            if not entry.is_dir():
+                names.append(entry.name)
+        except OSError:
+            pass
+    return names
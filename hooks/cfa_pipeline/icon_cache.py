@@ -0,0 +1,55 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+'''
+@ author：huangsheng
+@ date: 2026/10/22 14:10
+@ description:
+    Process-wide cache of the icons set on the publish items.
+
+    ``item.set_icon_from_path`` decodes the image for every item. The first
+    item of a path decodes it, the other items get the same pixmap.
+
+'''
+
+import os
+
+# icon path -> pixmap
+_pixmaps = {}
+# (disk location, icon name) -> icon path
+_paths = {}
+
+
+def icon_path(disk_location, name):
+    """
+    Return the path of the icon ``name`` of the config's ``icons`` folder,
+    for a hook living in ``disk_location``.
+    """
+    key = (disk_location, name)
+    if key not in _paths:
+        _paths[key] = os.path.normpath(
+            os.path.join(disk_location, os.pardir, "icons", name))
+    return _paths[key]
+
+
+def set_icon(item, path):
+    """
+    Set the icon of ``item`` from ``path``, decoding the image only once per
+    process.
+    """
+    pixmap = _pixmaps.get(path)
+    if pixmap is not None:
+        item._icon_path = path
+        item._icon_pixmap = pixmap
+        return
+    item.set_icon_from_path(path)
+    pixmap = getattr(item, "_icon_pixmap", None)
+    if pixmap is not None:
+        _pixmaps[path] = pixmap
+
+
+def clear():
+    """
+    Forget the cached pixmaps, e.g. after the icons changed on disk.
+    """
+    _pixmaps.clear()
+    _paths.clear()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+'''
+@ author：huangsheng
+@ date: 2026/10/22 14:30
+@ description:
+    Groups the per-object items of a collector under one collapsed item.
+
+    A collector adds its objects to an ``ItemGroup``. Nothing is created
+    until ``create_items``: a few objects become items of the session as
+    before, above the threshold they are parented to a single collapsed
+    group item so the tree stays readable with thousands of objects. All
+    items share one cached icon.
+
+    The publishes of grouped items still depend on the session publish: the
+    plugins call ``inherit_publish_data`` before registering, and look the
+    parent publish up with ``publish_parent``.
+
+'''
+
+from cfa_pipeline import icon_cache
+
+# item type of the group items, no publish plugin accepts it
+GROUP_TYPE = "maya.session.group"
+
+# property marking the group items
+GROUP_PROPERTY = "item_group"
+
+# session item properties the plugins read from their item's parent
+_INHERITED_PROPERTIES = ("work_template", "project_root")
+
+
+class ItemGroup(object):
+    """
+    Objects of one collector waiting to become publish items.
+
+    :param str item_type: type of the per-object items.
+    :param str display_type: display type of the per-object items.
+    :param str icon: path of the icon shared by the items.
+    :param int threshold: above that many objects, the items are grouped.
+    """
+
+    def __init__(self, item_type, display_type, icon, threshold=50):
+        self.item_type = item_type
+        self.display_type = display_type
+        self.icon = icon
+        self.threshold = threshold
+        self._objects = []
+
+    def __len__(self):
+        return len(self._objects)
+
+    def add(self, name, properties, expanded=False, active=True):
+        """
+        Add an object.
+
+        :param str name: display name of its item.
+        :param dict properties: item properties.
+        """
+        self._objects.append((name, properties, expanded, active))
+
+    def create_items(self, session_item, group_name=None):
+        """
+        Create the items under ``session_item``, or under a group item if
+        there are more objects than the threshold.
+
+        :param str group_name: display name of the group item.
+        :returns: the created per-object items.
+        """
+        if not self._objects:
+            return []
+
+        parent = session_item
+        if len(self._objects) > self.threshold:
+            parent = session_item.create_item(
+                GROUP_TYPE,
+                self.display_type,
+                "%s (%d)" % (group_name or self.display_type,
+                             len(self._objects))
+            )
+            icon_cache.set_icon(parent, self.icon)
+            parent.properties[GROUP_PROPERTY] = True
+            for key in _INHERITED_PROPERTIES:
+                if key in session_item.properties:
+                    parent.properties[key] = session_item.properties[key]
+            parent._expanded = False
+
+        items = []
+        for (name, properties, expanded, active) in self._objects:
+            item = parent.create_item(self.item_type, self.display_type, name)
+            icon_cache.set_icon(item, self.icon)
+            item.properties.update(properties)
+            item._expanded = expanded
+            item._active = active
+            items.append(item)
+        self._objects = []
+        return items
+
+
+def publish_parent(item):
+    """
+    Return the closest parent of ``item`` that is not a group item, the one
+    whose publish the publishes of ``item`` depend on.
+    """
+    parent = item.parent
+    while parent is not None and parent.properties.get(GROUP_PROPERTY):
+        parent = parent.parent
+    return parent
+
+
+def inherit_publish_data(item):
+    """
+    Give the group ``item`` is in the ``sg_publish_data`` of
+    :func:`publish_parent`. The publish plugin base class makes a publish
+    depend on the ``sg_publish_data`` of the item's parent, call this before
+    registering the publish of ``item``.
+    """
+    group = item.parent
+    if group is None or not group.properties.get(GROUP_PROPERTY):
+        return
+    parent = publish_parent(item)
+    data = parent.properties.get("sg_publish_data") if parent else None
+    if data:
+        group.properties["sg_publish_data"] = data
+
+
+def top_level_with(node_type):
+    """
+    Return the top-level transforms that have a ``node_type`` below them,
+    with a single scene query.
+    """
+    import maya.cmds as cmds
+
+    tops = []
+    seen = set()
+    for path in cmds.ls(type=node_type, long=True) or []:
+        top = path.split("|")[1]
+        if top not in seen:
+            seen.add(top)
+            tops.append(top)
+    # same order as cmds.ls(assemblies=True)
+    order = dict((name, i) for (i, name) in
+                 enumerate(cmds.ls(assemblies=True) or []))
+    return sorted(tops, key=lambda name: order.get(name, len(order)))
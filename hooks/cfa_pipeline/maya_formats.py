@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+'''
+@ author：huangsheng
+@ date: 2026/10/25 15:00
+@ description:
+    Maya file format of the publishes exporting maya files.
+
+    The "Export Format" setting of a plugin gives the ``{maya_extension}`` of
+    its publish template, the exported file type is then read from the
+    extension of the publish path. Loaders and hookups only see the path and
+    handle both formats the same way.
+
+'''
+
+import os
+
+# export format -> {maya_extension} of the templates
+FORMATS = {
+    "mayaAscii": "ma",
+    "mayaBinary": "mb",
+}
+
+# maya file type of the extensions
+FILE_TYPES = dict((ext, file_type) for (file_type, ext) in FORMATS.items())
+
+# plugin settings, merged into the settings of the plugins exporting maya
+# files
+SETTINGS = {
+    "Export Format": {
+        "type": "str",
+        "default": "mayaAscii",
+        "description": "Maya file type of the publish: mayaAscii or "
+                       "mayaBinary. Sets the maya_extension field of the "
+                       "publish template.",
+    },
+}
+
+
+def extension(settings):
+    """
+    Return the ``{maya_extension}`` of the "Export Format" setting.
+    """
+    export_format = settings["Export Format"].value \
+        if "Export Format" in settings else "mayaAscii"
+    if export_format not in FORMATS:
+        raise ValueError(
+            "Unknown Export Format '%s', expected one of: %s" % (
+                export_format, ", ".join(sorted(FORMATS))))
+    return FORMATS[export_format]
+
+
+def apply_format(settings, fields):
+    """
+    Set the ``maya_extension`` of the publish ``fields`` from the settings,
+    instead of the one of the work file.
+    """
+    fields["maya_extension"] = extension(settings)
+    return fields
+
+
+def file_type(path):
+    """
+    Return ``mayaAscii`` or ``mayaBinary`` for ``path``, None if it is not a
+    maya file.
+    """
+    ext = os.path.splitext(path)[1].lower().lstrip(".")
+    return FILE_TYPES.get(ext)
+
+
+def export_selected(path, **kwargs):
+    """
+    ``cmds.file`` export of the selection to ``path`` in the format of its
+    extension.
+    """
+    import maya.cmds as cmds
+
+    options = {
+        "force": True,
+        "options": "v=0",
+        "type": file_type(path) or "mayaAscii",
+        "exportSelected": True,
+        "prompt": False,
+    }
+    options.update(kwargs)
+    return cmds.file(path, **options)
@@ -0,0 +1,309 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+'''
+@ author：huangsheng
+@ date: 2026/10/25 10:00
+@ description:
+    Lightweight proxies of the geometry publishes.
+
+    After its export, a geometry plugin adds the proxies of its item to the
+    proxy batch of the publish, its finalize queues the batch as one
+    ``proxies`` job on the export queue: a headless worker opens the scene
+    once, writes a gpuCache, a decimated LOD and a bounding box manifest
+    next to each publish and registers each of them as a PublishedFile
+    depending on it. Each proxy has its own template setting, a proxy whose
+    template is not configured is not written.
+
+'''
+
+import json
+import os
+
+from cfa_pipeline import export_service, find_item_property, \
+    publish_batcher
+
+# item property the proxy batch is stored under
+PROPERTY = "proxy_batch"
+
+# plugin settings, merged into the settings of the geometry plugins
+SETTINGS = {
+    "GPU Proxy Template": {
+        "type": "template",
+        "default": None,
+        "description": "Template path for the gpuCache proxy written next "
+                       "to the publish. No proxy if not set.",
+    },
+    "LOD Proxy Template": {
+        "type": "template",
+        "default": None,
+        "description": "Template path for the decimated maya proxy written "
+                       "next to the publish. No proxy if not set.",
+    },
+    "BBox Proxy Template": {
+        "type": "template",
+        "default": None,
+        "description": "Template path for the bounding box json written next "
+                       "to the publish. No proxy if not set.",
+    },
+    "LOD Reduction": {
+        "type": "int",
+        "default": 75,
+        "description": "Percentage of the polygons removed in the LOD proxy.",
+    },
+}
+
+# proxy kind -> (template setting, PublishedFile type)
+PROXIES = (
+    ("gpu", "GPU Proxy Template", "GPU Cache Proxy"),
+    ("lod", "LOD Proxy Template", "Maya LOD Proxy"),
+    ("bbox", "BBox Proxy Template", "BBox Proxy"),
+)
+
+
+def proxy_paths(plugin, settings, item):
+    """
+    Return ``{kind: path}`` of the proxies of ``item``, built from the fields
+    of its publish path.
+    """
+    publisher = plugin.parent
+    publish_template = item.properties.get("publish_template")
+    if publish_template is None:
+        return {}
+    fields = publish_template.get_fields(item.properties["path"])
+    if fields is None:
+        return {}
+
+    paths = {}
+    for (kind, setting, _) in PROXIES:
+        template_name = settings[setting].value if setting in settings else None
+        if not template_name:
+            continue
+        template = publisher.get_template_by_name(template_name)
+        if template is None:
+            plugin.logger.warning("Unknown proxy template: %s" % template_name)
+            continue
+        paths[kind] = template.apply_fields(fields)
+    return paths
+
+
+class ProxyBatch(object):
+    """
+    The proxies of one publish session waiting to be queued, one job per
+    export job they wait for.
+    """
+
+    def __init__(self):
+        # export job waited for, None -> {"item", "proxies", "publishes"}
+        self._jobs = {}
+
+    def add(self, item, proxies, publishes, after=None):
+        """
+        Add the proxies of ``item`` to the job waiting for ``after``.
+
+        :param dict proxies: exporter arguments, see :func:`export_proxies`.
+        :param list publishes: their registration data.
+        """
+        job = self._jobs.setdefault(
+            after, {"item": item, "proxies": [], "publishes": []})
+        job["proxies"].append(proxies)
+        job["publishes"].extend(publishes)
+
+    def flush(self, logger):
+        """
+        Queue the added proxies.
+
+        :returns: the ids of the jobs queued.
+        """
+        jobs, self._jobs = self._jobs, {}
+        job_ids = []
+        for (after, job) in sorted(jobs.items(), key=lambda j: j[0] or 0):
+            try:
+                job_id = export_service.submit(
+                    job["item"],
+                    "proxies",
+                    {"proxies": job["proxies"]},
+                    job["publishes"],
+                    after=after
+                )
+            except Exception as e:
+                # the publishes are done, they don't fail for their proxies
+                logger.warning("Proxies not queued: %s" % e)
+                continue
+            logger.info("Proxy job %s queued for %d publish(es)." % (
+                job_id, len(job["proxies"])))
+            job_ids.append(job_id)
+        return job_ids
+
+
+def get(item):
+    """
+    Return the proxy batch of the publish ``item`` belongs to, created on
+    the root item if needed.
+    """
+    batch = find_item_property(item, PROPERTY)
+    if batch is None:
+        root = item
+        while root.parent is not None:
+            root = root.parent
+        batch = ProxyBatch()
+        root.properties[PROPERTY] = batch
+    return batch
+
+
+def flush(item, logger):
+    """
+    Queue the proxies added during the publish ``item`` belongs to, called
+    by the finalize of the geometry plugins. The first call queues them.
+
+    :returns: the ids of the jobs queued.
+    """
+    batch = find_item_property(item, PROPERTY)
+    if batch is None:
+        return []
+    return batch.flush(logger)
+
+
+def submit(plugin, settings, item, nodes=None):
+    """
+    Add the proxies of the publish of ``item`` to the proxy batch, queued
+    by :func:`flush`.
+
+    :param plugin: the geometry publish plugin.
+    :param list nodes: exported nodes, the top nodes holding meshes if None.
+    :returns: True if the proxies were added now, False if no proxy is
+        configured, if they are added once the publish of ``item`` is
+        registered or if that publish is not registered. With a background
+        export the proxies wait for the export job.
+    """
+    paths = proxy_paths(plugin, settings, item)
+    if not paths:
+        return False
+
+    if publish_batcher.pending(item):
+        # the proxies depend on the publish id, known at finalize
+        publish_batcher.get(item).after(
+            item, lambda: submit(plugin, settings, item, nodes))
+        return False
+
+    sg_publish_data = item.properties.get("sg_publish_data")
+    after = None
+    if sg_publish_data:
+        dependencies = {"dependency_ids": [sg_publish_data["id"]]}
+    elif item.properties.get("export_job"):
+        # a worker registers the background export, the proxy job waits for
+        # its job and depends on the publish it registered
+        after = item.properties["export_job"]
+        dependencies = {"dependency_ids": []}
+    else:
+        plugin.logger.warning(
+            "Proxies not queued, the publish they depend on is not "
+            "registered: %s" % item.properties["path"])
+        return False
+
+    publishes = []
+    for (kind, _, publish_type) in PROXIES:
+        if kind in paths:
+            publishes.append(export_service.publish_data(
+                plugin, settings, item, paths[kind], publish_type,
+                name=plugin.parent.util.get_publish_name(paths[kind]),
+                **dependencies
+            ))
+
+    reduction = settings["LOD Reduction"].value \
+        if "LOD Reduction" in settings else 75
+    get(item).add(
+        item, {"nodes": nodes, "paths": paths, "reduction": reduction},
+        publishes, after)
+    plugin.logger.info("Proxies added to the proxy job: %s" % (
+        ", ".join(sorted(paths.values()))))
+    return True
+
+
+def export_proxies(data):
+    """
+    Write the proxies of every entry of ``data["proxies"]``, see
+    :func:`write_proxies`.
+
+    :returns: the first path written.
+    """
+    # jobs queued before the proxies were batched hold a single entry
+    entries = data["proxies"] if "proxies" in data else [data]
+    paths = []
+    for entry in entries:
+        paths.extend(write_proxies(entry))
+    return sorted(paths)[0] if paths else None
+
+
+def write_proxies(data):
+    """
+    Write the proxies of ``data["paths"]`` for ``data["nodes"]``.
+
+    The LOD reduces the meshes of the open scene in an undo chunk, undone
+    once the LOD is exported.
+
+    :returns: the paths written.
+    """
+    import maya.cmds as cmds
+
+    nodes = data.get("nodes") or _mesh_assemblies()
+    paths = data["paths"]
+    for path in paths.values():
+        folder = os.path.dirname(path)
+        if not os.path.isdir(folder):
+            os.makedirs(folder)
+
+    if "bbox" in paths:
+        bbox = cmds.exactWorldBoundingBox(nodes)
+        with open(paths["bbox"], "w") as f:
+            json.dump({"min": bbox[:3], "max": bbox[3:], "nodes": nodes},
+                      f, indent=4)
+
+    if "gpu" in paths:
+        if not cmds.pluginInfo("gpuCache", query=True, loaded=True):
+            cmds.loadPlugin("gpuCache", quiet=True)
+        frame = cmds.currentTime(query=True)
+        (folder, name) = os.path.split(paths["gpu"])
+        cmds.gpuCache(nodes, startTime=frame, endTime=frame, optimize=True,
+                      writeMaterials=True, directory=folder,
+                      fileName=os.path.splitext(name)[0])
+
+    if "lod" in paths:
+        # undo is off in mayapy
+        undo = cmds.undoInfo(query=True, state=True)
+        cmds.undoInfo(state=True)
+        cmds.undoInfo(openChunk=True)
+        try:
+            _export_lod(nodes, paths["lod"], data.get("reduction", 75))
+        finally:
+            cmds.undoInfo(closeChunk=True)
+            # back to the exported state for the next proxies and jobs of
+            # the scene
+            cmds.undo()
+            cmds.undoInfo(state=undo)
+
+    return sorted(paths.values())
+
+
+def _export_lod(nodes, path, reduction):
+    import maya.cmds as cmds
+
+    meshes = cmds.ls(nodes, dag=True, type="mesh", noIntermediate=True,
+                     long=True) or []
+    for mesh in meshes:
+        try:
+            cmds.polyReduce(mesh, version=1, percentage=reduction,
+                            keepQuadsWeight=1.0, keepBorder=True,
+                            replaceOriginal=True)
+        except RuntimeError:
+            # non manifold or too small, kept as is
+            pass
+    if meshes:
+        cmds.delete(meshes, constructionHistory=True)
+    cmds.select(nodes, replace=True)
+    cmds.file(path, force=True, options="v=0", type="mayaBinary",
+              exportSelected=True, preserveReferences=False, prompt=False)
+
+
+def _mesh_assemblies():
+    from cfa_pipeline import item_groups
+    return item_groups.top_level_with("mesh")
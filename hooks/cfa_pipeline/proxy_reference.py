@@ -0,0 +1,186 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+'''
+@ author：huangsheng
+@ date: 2026/10/24 15:00
+@ description:
+    Proxy references for set dressing.
+
+    The publish is referenced unloaded and stands in the scene as a light
+    placement transform showing a gpuCache, or a bounding box when there is
+    no cache. The full reference is loaded on demand, parented under the
+    placement so it follows the set dressing, and unloaded again when going
+    back to the proxy. From a shelf::
+
+        from cfa_pipeline import proxy_reference
+        proxy_reference.swap_to_full()      # selected proxies
+        proxy_reference.swap_to_proxy()     # every proxy of the scene
+
+    Stand-ins are the proxies ``proxy_publish`` writes next to the geometry
+    publishes (assembly, fbx, xgen geometry, session alembic):
+    ``<name>.gpu.abc`` for the gpuCache, ``<name>.bbox.json``
+    (``{"min": [x, y, z], "max": [x, y, z]}``) for the bounding box. An
+    alembic publish without proxy is its own gpuCache.
+
+'''
+
+import json
+import os
+
+# attribute marking the placement transforms, holds the reference node
+PROXY_ATTR = "cfaProxyReference"
+
+GPU_SUFFIX = ".gpu.abc"
+BBOX_SUFFIX = ".bbox.json"
+
+
+def stand_in(path):
+    """
+    Return ``("gpu", cache_path)``, ``("bbox", (min, max))`` or
+    ``("bbox", None)`` for the publish ``path``.
+    """
+    base, ext = os.path.splitext(path)
+    if os.path.exists(base + GPU_SUFFIX):
+        return ("gpu", base + GPU_SUFFIX)
+    if ext.lower() == ".abc":
+        return ("gpu", path)
+    if os.path.exists(base + BBOX_SUFFIX):
+        with open(base + BBOX_SUFFIX, "r") as f:
+            data = json.load(f)
+        return ("bbox", (data["min"], data["max"]))
+    return ("bbox", None)
+
+
+def create(path, namespace):
+    """
+    Reference ``path`` unloaded under ``namespace`` and create its proxy.
+
+    :returns: the placement transform.
+    """
+    import maya.cmds as cmds
+
+    kwargs = {}
+    if os.path.splitext(path)[1].lower() == ".fbx":
+        if not cmds.pluginInfo("fbxmaya", query=True, loaded=True):
+            cmds.loadPlugin("fbxmaya", quiet=True)
+        kwargs["type"] = "FBX"
+    ref_path = cmds.file(path, reference=True, deferReference=True,
+                         mergeNamespacesOnClash=False, namespace=namespace,
+                         **kwargs)
+    ref_node = cmds.referenceQuery(ref_path, referenceNode=True)
+    namespace = cmds.referenceQuery(ref_node, namespace=True,
+                                    shortName=True)
+
+    kind, data = stand_in(path)
+    proxy = cmds.createNode("transform", name=namespace + "_PROXY")
+    if kind == "gpu":
+        cmds.loadPlugin("gpuCache", quiet=True)
+        shape = cmds.createNode("gpuCache", parent=proxy,
+                                name=namespace + "_PROXYShape")
+        cmds.setAttr(shape + ".cacheFileName", data, type="string")
+    else:
+        _bbox_shape(proxy, namespace, data)
+
+    cmds.addAttr(proxy, longName=PROXY_ATTR, dataType="string")
+    cmds.setAttr("%s.%s" % (proxy, PROXY_ATTR), ref_node, type="string")
+    return proxy
+
+
+def proxies():
+    """
+    Return the placement transforms of the scene.
+    """
+    import maya.cmds as cmds
+
+    return cmds.ls("*.%s" % PROXY_ATTR, objectsOnly=True, recursive=True) or []
+
+
+def swap_to_full(nodes=None):
+    """
+    Load the full references of the proxies among ``nodes``, the selection
+    by default.
+    """
+    import maya.cmds as cmds
+
+    if nodes is None:
+        nodes = cmds.ls(selection=True, long=True) or []
+    for proxy in _proxies_of(nodes):
+        ref_node = _reference_node(proxy)
+        if not cmds.referenceQuery(ref_node, isLoaded=True):
+            cmds.file(loadReference=ref_node)
+        # parent the loaded top nodes to the placement, the edit is kept
+        # by the reference for the next loads
+        loaded = cmds.referenceQuery(ref_node, nodes=True, dagPath=True)
+        tops = cmds.ls(loaded or [], assemblies=True) or []
+        if tops:
+            cmds.parent(tops, proxy, relative=True)
+        _show_stand_in(proxy, False)
+
+
+def swap_to_proxy(nodes=None):
+    """
+    Unload the full references of the proxies among ``nodes``, every proxy
+    of the scene by default.
+    """
+    import maya.cmds as cmds
+
+    targets = proxies() if nodes is None else _proxies_of(nodes)
+    for proxy in targets:
+        ref_node = _reference_node(proxy)
+        if cmds.referenceQuery(ref_node, isLoaded=True):
+            cmds.file(unloadReference=ref_node)
+        _show_stand_in(proxy, True)
+
+
+def _proxies_of(nodes):
+    # the proxies of the nodes, or of one of their parents
+    import maya.cmds as cmds
+
+    result = []
+    for node in cmds.ls(nodes, long=True) or []:
+        for parent in _ancestors(node):
+            if cmds.attributeQuery(PROXY_ATTR, node=parent, exists=True):
+                if parent not in result:
+                    result.append(parent)
+                break
+    return result
+
+
+def _ancestors(path):
+    parts = path.split("|")
+    return ["|".join(parts[:i]) for i in range(len(parts), 1, -1)
+            if parts[i - 1]]
+
+
+def _reference_node(proxy):
+    import maya.cmds as cmds
+    return cmds.getAttr("%s.%s" % (proxy, PROXY_ATTR))
+
+
+def _show_stand_in(proxy, visible):
+    import maya.cmds as cmds
+
+    for shape in cmds.listRelatives(proxy, shapes=True, fullPath=True) or []:
+        cmds.setAttr(shape + ".visibility", visible)
+
+
+def _bbox_shape(proxy, namespace, bbox):
+    import maya.cmds as cmds
+
+    box = cmds.polyCube(name=namespace + "_PROXYBox",
+                        constructionHistory=False)[0]
+    if bbox:
+        (low, high) = bbox
+        cmds.xform(box, scale=[max(h - l, 1e-3) for (l, h) in zip(low, high)],
+                   translation=[(l + h) / 2.0 for (l, h) in zip(low, high)])
+        cmds.makeIdentity(box, apply=True, translate=True, scale=True)
+    shape = cmds.listRelatives(box, shapes=True, fullPath=True)[0]
+    cmds.parent(shape, proxy, shape=True, relative=True)
+    cmds.delete(box)
+    # wireframe box only
+    shape = cmds.listRelatives(proxy, shapes=True, fullPath=True)[0]
+    cmds.setAttr(shape + ".overrideEnabled", True)
+    cmds.setAttr(shape + ".overrideShading", False)
+    cmds.setAttr(shape + ".castsShadows", False)
+    cmds.setAttr(shape + ".receiveShadows", False)
+    cmds.setAttr(shape + ".primaryVisibility", False)
@@ -0,0 +1,360 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+'''
+@ author：huangsheng
+@ date: 2026/10/28 10:00
+@ description:
+    PublishedFile registration batched at finalize.
+
+    During the publish pass the plugins chained on ``publish_batched.py``
+    add the registration data of their items to the batcher of the publish
+    instead of registering them one by one. The first finalize registers
+    everything:
+
+        payloads    ``register_publish(dry_run=True)``, on a few threads
+        publishes   ``sg.batch`` creates, ``CHUNK_SIZE`` per request
+        dependencies  paths published in the batch resolved in the batch,
+                    the others with one ``find_publish``, created batched
+        thumbnails  uploaded concurrently
+        checksums   hashed since ``add`` by ``checksum``, stored last
+
+    A failed batch request is retried, then its publishes are created one by
+    one so a bad publish only fails its own item: its error is kept for the
+    finalize of that item, see ``error``. Each item gets its
+    ``sg_publish_data`` as with the plain registration. Work waiting on the
+    registration of an item goes through ``after``.
+
+'''
+
+import os
+import time
+from multiprocessing.pool import ThreadPool
+
+from cfa_pipeline import checksum, find_item_property, item_groups, sg_async
+
+# item property the batcher is stored under
+PROPERTY = "publish_batcher"
+
+# creates per batch request
+CHUNK_SIZE = 50
+
+# attempts of a failed batch request, with a doubling delay
+RETRIES = 3
+RETRY_DELAY = 1.0
+
+# threads computing the payloads
+THREADS = 4
+
+
+class Entry(object):
+    """
+    One publish to register.
+    """
+
+    def __init__(self, item, data, parent_item, checksum_field=None):
+        self.item = item
+        self.data = data
+        self.parent_item = parent_item
+        self.checksum_field = checksum_field
+        self.entity_type = "PublishedFile"
+        self.payload = None
+        self.publish = None
+        self.error = None
+        self.callbacks = []
+
+
+class PublishBatcher(object):
+    """
+    The publishes of one publish session waiting for registration.
+    """
+
+    def __init__(self):
+        self._entries = []
+        self._failed = []
+
+    def add(self, plugin, settings, item):
+        """
+        Queue the registration of ``item``, with the data the publish plugin
+        base class registers.
+        """
+        publisher = plugin.parent
+        data = {
+            "tk": publisher.sgtk,
+            "context": item.context,
+            "comment": item.description,
+            "path": plugin.get_publish_path(settings, item),
+            "name": plugin.get_publish_name(settings, item),
+            "version_number": plugin.get_publish_version(settings, item),
+            "thumbnail_path": item.get_thumbnail_as_path(),
+            "published_file_type": plugin.get_publish_type(settings, item),
+            "dependency_paths":
+                plugin.get_publish_dependencies(settings, item) or [],
+        }
+        if hasattr(plugin, "get_publish_user"):
+            data["created_by"] = plugin.get_publish_user(settings, item)
+        if hasattr(plugin, "get_publish_fields"):
+            data["sg_fields"] = plugin.get_publish_fields(settings, item)
+        if hasattr(plugin, "get_publish_kwargs"):
+            data.update(plugin.get_publish_kwargs(settings, item) or {})
+
+        # hashed while the other items export and the publishes register
+        checksum_field = checksum.field(settings, publisher.sgtk, plugin.logger)
+        if checksum_field and os.path.isfile(data["path"]):
+            checksum.get(item).submit(data["path"])
+        else:
+            checksum_field = None
+
+        self._entries.append(Entry(item, data,
+                                   item_groups.publish_parent(item),
+                                   checksum_field))
+        plugin.logger.info("Publish queued for registration: %s" % data["path"])
+
+    def pending(self, item):
+        """
+        Return True if the registration of ``item`` is waiting.
+        """
+        return self._entry(item) is not None
+
+    def after(self, item, callback):
+        """
+        Call ``callback()`` once ``item`` is registered, right away if it is
+        not waiting.
+        """
+        entry = self._entry(item)
+        if entry is None:
+            callback()
+        else:
+            entry.callbacks.append(callback)
+
+    def error(self, item):
+        """
+        Return the error the registration of ``item`` failed with, None if
+        it did not fail.
+        """
+        for entry in self._failed:
+            if entry.item is item:
+                return entry.error
+        return None
+
+    def flush(self, logger):
+        """
+        Register the queued publishes. The errors of the ones that could not
+        be registered are kept for :meth:`error`.
+        """
+        entries, self._entries = self._entries, []
+        if not entries:
+            return
+        start = time.time()
+        tk = entries[0].data["tk"]
+
+        _payloads(entries)
+        ready = [entry for entry in entries if entry.error is None]
+        for index in range(0, len(ready), CHUNK_SIZE):
+            _create(tk, ready[index:index + CHUNK_SIZE], logger)
+
+        registered = [entry for entry in entries if entry.publish]
+        for entry in registered:
+            entry.item.properties["sg_publish_data"] = entry.publish
+        _create_dependencies(tk, registered, logger)
+        _upload_thumbnails(tk, registered, logger)
+        _attach_checksums(tk, registered, logger)
+        logger.info("Registered %d publish(es) in %.2fs." % (
+            len(registered), time.time() - start))
+
+        for entry in registered:
+            for callback in entry.callbacks:
+                try:
+                    callback()
+                except Exception as e:
+                    logger.warning("After registration of %s: %s" % (
+                        entry.data["path"], e))
+
+        failed = [entry for entry in entries if entry.publish is None]
+        if failed:
+            logger.warning("%d publish(es) could not be registered." % (
+                len(failed)))
+            self._failed.extend(failed)
+
+    def _entry(self, item):
+        for entry in self._entries:
+            if entry.item is item:
+                return entry
+        return None
+
+
+def get(item):
+    """
+    Return the batcher of the publish ``item`` belongs to, created on the
+    root item if needed.
+    """
+    batcher = find_item_property(item, PROPERTY)
+    if batcher is None:
+        root = item
+        while root.parent is not None:
+            root = root.parent
+        batcher = PublishBatcher()
+        root.properties[PROPERTY] = batcher
+    return batcher
+
+
+def pending(item):
+    """
+    Return True if the registration of ``item`` waits for the finalize.
+    """
+    batcher = find_item_property(item, PROPERTY)
+    return batcher is not None and batcher.pending(item)
+
+
+def _payloads(entries):
+    # create data of the PublishedFiles, computed by the core without the
+    # thumbnail and dependencies, which are done batched here
+    import sgtk
+
+    def payload(entry):
+        kwargs = dict(entry.data)
+        kwargs.update({
+            "thumbnail_path": None,
+            "dependency_paths": [],
+            "dependency_ids": [],
+            "dry_run": True,
+        })
+        tk = kwargs.pop("tk")
+        context = kwargs.pop("context")
+        path = kwargs.pop("path")
+        name = kwargs.pop("name")
+        version_number = kwargs.pop("version_number")
+        try:
+            data = sgtk.util.register_publish(
+                tk, context, path, name, version_number, **kwargs)
+            entry.payload = dict(
+                (k, v) for (k, v) in data.items() if k not in ("type", "id"))
+            entry.entity_type = data.get("type", "PublishedFile")
+        except Exception as e:
+            entry.error = e
+
+    pool = ThreadPool(min(THREADS, len(entries)))
+    try:
+        pool.map(payload, entries)
+    finally:
+        pool.close()
+        pool.join()
+
+
+def _create(tk, entries, logger):
+    requests = [{
+        "request_type": "create",
+        "entity_type": entry.entity_type,
+        "data": entry.payload,
+    } for entry in entries]
+    try:
+        results = _batch(tk, requests)
+    except Exception as e:
+        # one by one, a bad publish fails alone
+        logger.warning("Batch registration failed (%s), registering %d "
+                       "publish(es) one by one." % (e, len(entries)))
+        for (entry, request) in zip(entries, requests):
+            try:
+                entry.publish = _batch(tk, [request])[0]
+            except Exception as e:
+                entry.error = e
+        return
+    for (entry, result) in zip(entries, results):
+        entry.publish = result
+
+
+def _batch(tk, requests):
+    delay = RETRY_DELAY
+    for attempt in range(RETRIES):
+        try:
+            return tk.shotgun.batch(requests)
+        except Exception:
+            if attempt == RETRIES - 1:
+                raise
+            time.sleep(delay)
+            delay *= 2
+
+
+def _create_dependencies(tk, entries, logger):
+    import sgtk
+
+    published = dict((_key(entry.data["path"]), entry.publish)
+                     for entry in entries)
+    outside = set()
+    for entry in entries:
+        for path in entry.data["dependency_paths"]:
+            if _key(path) not in published:
+                outside.add(path)
+    found = {}
+    if outside:
+        for (path, publish) in sgtk.util.find_publish(
+                tk, sorted(outside)).items():
+            found[_key(path)] = publish
+
+    requests = []
+    for entry in entries:
+        dependencies = []
+        parent_data = entry.parent_item.properties.get("sg_publish_data") \
+            if entry.parent_item is not None else None
+        if parent_data:
+            dependencies.append(parent_data)
+        for path in entry.data["dependency_paths"]:
+            dependency = published.get(_key(path)) or found.get(_key(path))
+            if dependency is None:
+                logger.warning("Dependency of %s is not published: %s" % (
+                    entry.data["path"], path))
+                continue
+            dependencies.append(dependency)
+        for dependency in dependencies:
+            requests.append({
+                "request_type": "create",
+                "entity_type": "PublishedFileDependency",
+                "data": {
+                    "published_file": _link(entry.publish),
+                    "dependent_published_file": _link(dependency),
+                },
+            })
+
+    for index in range(0, len(requests), CHUNK_SIZE):
+        try:
+            _batch(tk, requests[index:index + CHUNK_SIZE])
+        except Exception as e:
+            logger.warning("Publish dependencies not registered: %s" % e)
+
+
+def _upload_thumbnails(tk, entries, logger):
+    calls = []
+    paths = []
+    for entry in entries:
+        thumbnail = entry.data.get("thumbnail_path")
+        if thumbnail and os.path.exists(thumbnail):
+            calls.append(sg_async.Call(
+                "upload_thumbnail", entry.publish["type"],
+                entry.publish["id"], thumbnail))
+            paths.append(entry.data["path"])
+    # the core connection is per thread
+    results = sg_async.gather(lambda: tk.shotgun, calls,
+                              return_exceptions=True)
+    for (path, result) in zip(paths, results):
+        if isinstance(result, Exception):
+            logger.warning("Thumbnail of %s not uploaded: %s" % (path, result))
+
+
+def _attach_checksums(tk, entries, logger):
+    entries = [entry for entry in entries if entry.checksum_field]
+    if not entries:
+        return
+    service = checksum.get(entries[0].item)
+    try:
+        checksum.attach(tk, service, [
+            (entry.publish, entry.data["path"], entry.checksum_field)
+            for entry in entries], logger)
+    finally:
+        service.close()
+
+
+def _link(entity):
+    return {"type": entity["type"], "id": entity["id"]}
+
+
+def _key(path):
+    return os.path.normcase(os.path.normpath(path))
@@ -0,0 +1,389 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+'''
+@ author：huangsheng
+@ date: 2026/10/26 15:00
+@ description:
+    Local read-through cache of the publishes loaded by the loader and the
+    breakdown.
+
+    Opt-in per workstation: ``CFA_PUBLISH_CACHE`` is the cache folder (on a
+    local SSD), ``CFA_PUBLISH_CACHE_SIZE`` its size limit in GB (100 by
+    default). Without it, ``resolve`` returns the publish path unchanged.
+
+    Scenes always reference and import the publish path. The check file
+    callbacks of ``install_callbacks``, installed when tk-maya starts (see
+    ``core/hooks/engine_init.py``), make maya read the local copy of a
+    publish once it is cached, otherwise the network while background
+    threads copy it. Copies are hashed while written and read back, an entry
+    is only recorded when both hashes match. Publishes are immutable, a
+    recorded entry never goes stale; the least recently used entries are
+    evicted beyond the size limit. The local copy mirrors the publish path,
+    ``source_path`` maps it back::
+
+        from cfa_pipeline import publish_cache
+        path = publish_cache.resolve(publish_path)
+
+'''
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+try:
+    import Queue as queue
+except ImportError:
+    import queue
+
+# copy and hash block size
+CHUNK_SIZE = 4 * 1024 * 1024
+
+# background copy threads
+THREADS = 2
+
+DEFAULT_SIZE_GB = 100
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    source TEXT PRIMARY KEY,
+    local TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    sha1 TEXT NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used);
+"""
+
+_cache = None
+_callback_ids = []
+
+
+class PublishCache(object):
+    """
+    Publish path -> verified local copy, in an LRU of ``max_bytes``.
+
+    The index is a SQLite database in ``root``, shared by the maya sessions
+    of the workstation. Every call opens its own connection so the copy
+    threads can use the cache too.
+
+    :param str root: cache folder, created if needed.
+    :param int max_bytes: size limit of the copies.
+    """
+
+    def __init__(self, root, max_bytes):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.index_path = os.path.join(root, "index.db")
+        for folder in (self._files_root(), self._tmp_root()):
+            if not os.path.isdir(folder):
+                os.makedirs(folder)
+        connection = self._connect()
+        try:
+            connection.executescript(_SCHEMA)
+        finally:
+            connection.close()
+
+        self._queue = queue.Queue()
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._threads = []
+
+    def local_path(self, source):
+        """
+        Return the path of the copy of ``source`` in the cache.
+        """
+        return os.path.join(self._files_root(), _mirror(source))
+
+    def source_path(self, path):
+        """
+        Return the publish path of the copy ``path``, ``path`` itself if it
+        is not in the cache folder.
+        """
+        files_root = os.path.normcase(
+            os.path.normpath(self._files_root())) + os.sep
+        normalized = os.path.normpath(path)
+        if not os.path.normcase(normalized).startswith(files_root):
+            return path
+        return _unmirror(normalized[len(files_root):])
+
+    def lookup(self, source):
+        """
+        Return the local copy of ``source``, None if it is not cached.
+        """
+        source = _key(source)
+        connection = self._connect()
+        try:
+            row = connection.execute(
+                "SELECT local, size FROM entries WHERE source = ?",
+                (source,)).fetchone()
+            if row is None:
+                return None
+            (local, size) = row
+            if not os.path.isfile(local) or os.path.getsize(local) != size:
+                # removed behind our back
+                connection.execute(
+                    "DELETE FROM entries WHERE source = ?", (source,))
+                return None
+            connection.execute(
+                "UPDATE entries SET last_used = ? WHERE source = ?",
+                (time.time(), source))
+            return local
+        finally:
+            connection.close()
+
+    def fill(self, source):
+        """
+        Copy ``source`` into the cache and record it, then evict.
+
+        :returns: the local copy, None if the copy could not be verified.
+        """
+        local = self.lookup(source)
+        if local is not None:
+            return local
+
+        local = self.local_path(source)
+        tmp = os.path.join(self._tmp_root(), "%s.%s.%s" % (
+            os.getpid(), threading.current_thread().ident,
+            os.path.basename(local)))
+        try:
+            size, written = _copy(source, tmp)
+            if written != _sha1(tmp) or os.path.getsize(source) != size:
+                return None
+            folder = os.path.dirname(local)
+            if not os.path.isdir(folder):
+                os.makedirs(folder)
+            if os.path.exists(local):
+                os.remove(local)
+            os.rename(tmp, local)
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+        connection = self._connect()
+        try:
+            connection.execute(
+                "INSERT OR REPLACE INTO entries "
+                "(source, local, size, sha1, last_used) VALUES (?, ?, ?, ?, ?)",
+                (_key(source), local, size, written, time.time()))
+        finally:
+            connection.close()
+        self.evict(keep=local)
+        return local
+
+    def fill_async(self, source):
+        """
+        Queue the copy of ``source`` on the background threads.
+        """
+        with self._lock:
+            if source in self._pending:
+                return
+            self._pending.add(source)
+            if not self._threads:
+                for _ in range(THREADS):
+                    thread = threading.Thread(target=self._run)
+                    thread.daemon = True
+                    thread.start()
+                    self._threads.append(thread)
+        self._queue.put(source)
+
+    def evict(self, keep=None):
+        """
+        Remove the least recently used copies beyond the size limit.
+
+        :param str keep: copy never removed, the one just written.
+        :returns: the number of copies removed.
+        """
+        connection = self._connect()
+        removed = 0
+        try:
+            total = connection.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+            if total <= self.max_bytes:
+                return 0
+            rows = connection.execute(
+                "SELECT source, local, size FROM entries "
+                "ORDER BY last_used").fetchall()
+            for (source, local, size) in rows:
+                if total <= self.max_bytes:
+                    break
+                if local == keep:
+                    continue
+                try:
+                    if os.path.exists(local):
+                        os.remove(local)
+                except OSError:
+                    # in use, try the next one
+                    continue
+                connection.execute(
+                    "DELETE FROM entries WHERE source = ?", (source,))
+                total -= size
+                removed += 1
+        finally:
+            connection.close()
+        return removed
+
+    def size(self):
+        """
+        Return the number of bytes of the recorded copies.
+        """
+        connection = self._connect()
+        try:
+            return connection.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        finally:
+            connection.close()
+
+    def _run(self):
+        while True:
+            source = self._queue.get()
+            try:
+                self.fill(source)
+            except (IOError, OSError, sqlite3.Error):
+                # read from the network next time, copied again then
+                pass
+            finally:
+                with self._lock:
+                    self._pending.discard(source)
+
+    def _connect(self):
+        return sqlite3.connect(self.index_path, timeout=30,
+                               isolation_level=None)
+
+    def _files_root(self):
+        return os.path.join(self.root, "files")
+
+    def _tmp_root(self):
+        return os.path.join(self.root, "tmp")
+
+
+def get_cache():
+    """
+    Return the cache of ``CFA_PUBLISH_CACHE``, None if it is not set.
+    """
+    global _cache
+    root = os.environ.get("CFA_PUBLISH_CACHE")
+    if not root:
+        return None
+    if _cache is None or _cache.root != root:
+        size_gb = float(os.environ.get("CFA_PUBLISH_CACHE_SIZE") or
+                        DEFAULT_SIZE_GB)
+        _cache = PublishCache(root, int(size_gb * 1024 ** 3))
+    return _cache
+
+
+def resolve(path):
+    """
+    Return the local copy of the publish ``path`` if it is cached, else
+    ``path`` after queuing its copy.
+    """
+    cache = get_cache()
+    if cache is None or not os.path.isfile(path):
+        return path
+    local = cache.lookup(path)
+    if local is not None:
+        return local
+    cache.fill_async(path)
+    return path
+
+
+def source_path(path):
+    """
+    Return the publish path of a local copy, other paths as they are.
+    """
+    cache = get_cache()
+    if cache is None:
+        return path
+    return cache.source_path(path)
+
+
+def install_callbacks():
+    """
+    Read the local copies of the publishes maya references or imports.
+    Installed once per session.
+    """
+    if _callback_ids or get_cache() is None:
+        return
+    import maya.OpenMaya as om
+    for message in (om.MSceneMessage.kBeforeLoadReferenceCheck,
+                    om.MSceneMessage.kBeforeCreateReferenceCheck,
+                    om.MSceneMessage.kBeforeImportCheck):
+        _callback_ids.append(om.MSceneMessage.addCheckFileCallback(
+            message, _check_reference))
+
+
+def remove_callbacks():
+    if not _callback_ids:
+        return
+    import maya.OpenMaya as om
+    for callback_id in _callback_ids:
+        om.MMessage.removeCallback(callback_id)
+    del _callback_ids[:]
+
+
+def _check_reference(ret_code, file_object, client_data):
+    import maya.OpenMaya as om
+
+    om.MScriptUtil.setBool(ret_code, True)
+    path = file_object.resolvedFullName() or file_object.rawFullName()
+    if not path:
+        return
+    # scenes saved with the path of a local copy read its publish
+    local = resolve(source_path(path))
+    if os.path.normcase(local) != os.path.normcase(path):
+        file_object.setRawFullName(local)
+
+
+def _key(path):
+    return os.path.normcase(os.path.normpath(path))
+
+
+def _mirror(path):
+    # //host/share/a -> unc/host/share/a, X:/a -> drive/X/a, /a -> root/a
+    path = os.path.normpath(path).replace("\\", "/")
+    if path.startswith("//"):
+        return os.path.join("unc", *path[2:].split("/"))
+    drive, rest = os.path.splitdrive(path)
+    if not drive and len(path) > 1 and path[1] == ":":
+        drive, rest = path[:2], path[2:]
+    if drive:
+        return os.path.join("drive", drive[0], *rest.strip("/").split("/"))
+    return os.path.join("root", *path.strip("/").split("/"))
+
+
+def _unmirror(relative):
+    parts = relative.replace("\\", "/").split("/")
+    (kind, parts) = (parts[0], parts[1:])
+    if kind == "unc":
+        return os.path.normpath("//" + "/".join(parts))
+    if kind == "drive":
+        return os.path.normpath("%s:/%s" % (parts[0], "/".join(parts[1:])))
+    return os.path.normpath("/" + "/".join(parts))
+
+
+def _copy(source, destination):
+    # copy hashing the source stream, returns (size, sha1)
+    digest = hashlib.sha1()
+    size = 0
+    with open(source, "rb") as src:
+        with open(destination, "wb") as dst:
+            while True:
+                block = src.read(CHUNK_SIZE)
+                if not block:
+                    break
+                digest.update(block)
+                dst.write(block)
+                size += len(block)
+    return size, digest.hexdigest()
+
+
+def _sha1(path):
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        while True:
+            block = f.read(CHUNK_SIZE)
+            if not block:
+                break
+            digest.update(block)
+    return digest.hexdigest()
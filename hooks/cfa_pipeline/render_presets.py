@@ -0,0 +1,225 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+'''
+@ author：huangsheng
+@ date: 2026/10/24 10:00
+@ description:
+    Render setting presets of the light rigs, applied by the loader.
+
+    Presets are json files of ``{"node": {"attr": value}}`` or
+    ``{"node.attr": value}``, parsed once per modification time. The presets
+    of one load batch are merged (the last one wins), compared with the
+    current values of the scene and only the attributes that differ are set,
+    in one undo chunk. Files in another format, and presets with nodes not
+    in the scene yet (e.g. ``vraySettings`` before the V-Ray settings were
+    opened), go to the given fallback, which creates them. Without fallback
+    the missing plugs are skipped with a warning.
+
+'''
+
+import json
+import os
+
+# preset path -> (mtime, values or None)
+_cache = {}
+
+# floats closer than this are equal
+TOLERANCE = 1e-6
+
+try:
+    _STRING_TYPES = (str, unicode)
+except NameError:
+    _STRING_TYPES = (str,)
+
+
+def find_preset(directory):
+    """
+    Return the first json file of ``directory``, None if there is none.
+    """
+    try:
+        names = os.listdir(directory)
+    except OSError:
+        return None
+    for name in names:
+        if name.endswith(".json"):
+            return os.path.join(directory, name)
+    return None
+
+
+def read(path):
+    """
+    Return the ``{"node.attr": value}`` values of the preset ``path``, None
+    if it is not in a known format.
+    """
+    mtime = os.path.getmtime(path)
+    cached = _cache.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    with open(path, "r") as f:
+        values = _flatten(json.load(f))
+    _cache[path] = (mtime, values)
+    return values
+
+
+def missing(values):
+    """
+    Return the plugs of ``values`` that are not in the scene.
+    """
+    import maya.cmds as cmds
+
+    return sorted(plug for plug in values if not cmds.objExists(plug))
+
+
+def diff(values):
+    """
+    Return the values that differ from the scene, for the plugs that exist.
+    Plugs that can't be read are returned as well, setting them reports the
+    error.
+    """
+    import maya.cmds as cmds
+
+    changed = {}
+    for (plug, value) in values.items():
+        if not cmds.objExists(plug):
+            continue
+        try:
+            current = cmds.getAttr(plug)
+        except (RuntimeError, ValueError):
+            changed[plug] = value
+            continue
+        if not _equal(current, value):
+            changed[plug] = value
+    return changed
+
+
+def apply(values, logger=None):
+    """
+    Set ``values`` on the scene in one undo chunk.
+
+    :returns: the plugs that could not be set.
+    """
+    import maya.cmds as cmds
+
+    failed = []
+    cmds.undoInfo(openChunk=True)
+    try:
+        for plug in sorted(values):
+            value = values[plug]
+            try:
+                if isinstance(value, (list, tuple)):
+                    cmds.setAttr(plug, *_unwrap(value))
+                elif isinstance(value, _STRING_TYPES):
+                    cmds.setAttr(plug, value, type="string")
+                else:
+                    cmds.setAttr(plug, value)
+            except (RuntimeError, TypeError, ValueError) as e:
+                failed.append(plug)
+                if logger:
+                    logger.warning("Render preset: can't set %s: %s" % (plug, e))
+    finally:
+        cmds.undoInfo(closeChunk=True)
+    return failed
+
+
+def load(directories, fallback=None, logger=None):
+    """
+    Apply the presets of the light rig ``directories`` at once.
+
+    :param list directories: light rig folders, in load order.
+    :param fallback: called with ``(preset_name, directory)`` for the presets
+        in an unknown format or with nodes not in the scene.
+    :returns: the number of attributes set.
+    """
+    merged = {}
+    for directory in directories:
+        path = find_preset(directory)
+        if path is None:
+            continue
+        values = read(path)
+        absent = missing(values) if values is not None else []
+        if (values is None or absent) and fallback is not None:
+            if absent and logger:
+                logger.info(
+                    "Render preset %s: %d plug(s) not in the scene (%s), "
+                    "loaded by the render setting manager." % (
+                        path, len(absent), _summary(absent)))
+            # applied as it comes, later presets still override it
+            _apply_merged(merged, logger)
+            merged = {}
+            fallback(os.path.basename(path).split(".")[0], directory)
+            continue
+        if values is None:
+            if logger:
+                logger.warning("Render preset %s: unknown format, not "
+                               "applied." % path)
+            continue
+        if absent and logger:
+            logger.warning(
+                "Render preset %s: %d plug(s) not in the scene, skipped: %s" % (
+                    path, len(absent), ", ".join(absent)))
+        merged.update(values)
+    return _apply_merged(merged, logger)
+
+
+def clear():
+    """
+    Forget the parsed presets.
+    """
+    _cache.clear()
+
+
+def _apply_merged(values, logger):
+    if not values:
+        return 0
+    changed = diff(values)
+    failed = apply(changed, logger)
+    if logger:
+        logger.debug("Render preset: %d of %d attribute(s) changed." % (
+            len(changed) - len(failed), len(values)))
+    return len(changed) - len(failed)
+
+
+def _summary(plugs, count=5):
+    if len(plugs) <= count:
+        return ", ".join(plugs)
+    return "%s and %d more" % (", ".join(plugs[:count]), len(plugs) - count)
+
+
+def _flatten(data):
+    if not isinstance(data, dict):
+        return None
+    values = {}
+    for (key, value) in data.items():
+        if isinstance(value, dict):
+            for (attr, attr_value) in value.items():
+                if isinstance(attr_value, dict):
+                    return None
+                values["%s.%s" % (key, attr)] = attr_value
+        elif "." in key:
+            values[key] = value
+        else:
+            return None
+    return values
+
+
+def _unwrap(value):
+    # getAttr of a compound returns [(x, y, z)]
+    if len(value) == 1 and isinstance(value[0], (list, tuple)):
+        return list(value[0])
+    return list(value)
+
+
+def _equal(current, value):
+    if isinstance(current, (list, tuple)) or isinstance(value, (list, tuple)):
+        if not isinstance(current, (list, tuple)) or \
+                not isinstance(value, (list, tuple)):
+            return False
+        current, value = _unwrap(current), _unwrap(value)
+        return len(current) == len(value) and \
+            all(_equal(c, v) for (c, v) in zip(current, value))
+    if isinstance(current, float) or isinstance(value, float):
+        try:
+            return abs(float(current) - float(value)) < TOLERANCE
+        except (TypeError, ValueError):
+            return False
+    return current == value
@@ -0,0 +1,177 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+'''
+@ author：huangsheng
+@ date: 2026/10/18 10:12
+@ description:
+    Publish-session scoped memo for template lookups, field extraction,
+    publish path generation and the current scene path.
+
+    The maya collector attaches one cache to the root item, every publish
+    plugin reaches it through ``get(item)``. The cache is dropped whenever
+    the scene is saved, opened or renamed.
+
+'''
+
+import sgtk
+
+from cfa_pipeline import find_item_property
+
+# item property the cache is stored under
+PROPERTY = "resolve_cache"
+
+# the cache of the last collection. replaced (and its callbacks removed) on
+# every new collection so only one set of scene callbacks is alive.
+_active_cache = None
+
+
+class ResolveCache(object):
+    """
+    Memoizes the template work shared by all publish plugins of one publish.
+    """
+
+    def __init__(self):
+        self._session_path = None
+        self._normalized_path = None
+        self._templates = {}
+        self._fields = {}
+        self._paths = {}
+        self._callback_ids = []
+
+    def session_path(self):
+        """
+        Return the current scene path, as ``cmds.file(q=True, sn=True)``.
+
+        :returns: utf-8 encoded path, empty if the scene was never saved.
+        """
+        if self._session_path is None:
+            import maya.cmds as cmds
+            path = cmds.file(query=True, sn=True)
+            if not isinstance(path, str):
+                path = path.encode("utf-8")
+            self._session_path = path
+        return self._session_path
+
+    def normalized_session_path(self):
+        """
+        Return the current scene path normalized by ``ShotgunPath``.
+        """
+        if self._normalized_path is None:
+            path = self.session_path()
+            if not path:
+                return path
+            self._normalized_path = sgtk.util.ShotgunPath.normalize(path)
+        return self._normalized_path
+
+    def template(self, owner, template_name):
+        """
+        Return the template called ``template_name``.
+
+        :param owner: app or engine providing ``get_template_by_name``.
+        :param str template_name: name of the template in templates.yml.
+        """
+        if template_name not in self._templates:
+            self._templates[template_name] = owner.get_template_by_name(
+                template_name)
+        return self._templates[template_name]
+
+    def fields(self, template, path):
+        """
+        Return ``template.get_fields(path)``.
+
+        A new dict is returned on every call, plugins add their own keys to
+        the fields before applying them to the publish template.
+        """
+        key = (template.name, path)
+        if key not in self._fields:
+            self._fields[key] = template.get_fields(path)
+        return dict(self._fields[key])
+
+    def apply_fields(self, template, fields):
+        """
+        Return ``template.apply_fields(fields)``.
+        """
+        key = (template.name, tuple(sorted(fields.items())))
+        if key not in self._paths:
+            self._paths[key] = template.apply_fields(fields)
+        return self._paths[key]
+
+    def invalidate(self):
+        """
+        Forget everything derived from the scene path.
+
+        Template lookups do not depend on the scene and are kept.
+        """
+        self._session_path = None
+        self._normalized_path = None
+        self._fields.clear()
+        self._paths.clear()
+
+    def install_callbacks(self):
+        """
+        Invalidate the cache when the scene is saved, opened or reset.
+        """
+        import maya.OpenMaya as om
+        messages = (
+            om.MSceneMessage.kAfterSave,
+            om.MSceneMessage.kAfterOpen,
+            om.MSceneMessage.kAfterNew,
+        )
+        for message in messages:
+            self._callback_ids.append(
+                om.MSceneMessage.addCallback(message, self._on_scene_changed))
+
+    def remove_callbacks(self):
+        """
+        Remove the scene callbacks installed by :meth:`install_callbacks`.
+        """
+        if not self._callback_ids:
+            return
+        import maya.OpenMaya as om
+        for callback_id in self._callback_ids:
+            om.MMessage.removeCallback(callback_id)
+        self._callback_ids = []
+
+    def _on_scene_changed(self, *args):
+        self.invalidate()
+
+
+def attach(item):
+    """
+    Create a new cache for this publish and store it on ``item``.
+
+    :param item: the root item handed to the collector.
+    :returns: the new :class:`ResolveCache`.
+    """
+    global _active_cache
+    if _active_cache is not None:
+        _active_cache.remove_callbacks()
+    _active_cache = ResolveCache()
+    _active_cache.install_callbacks()
+    item.properties[PROPERTY] = _active_cache
+    return _active_cache
+
+
+def get(item):
+    """
+    Return the cache attached to ``item`` or one of its parents.
+
+    Falls back to the cache of the last collection (or a new one) so that
+    plugins keep working when run on items that were not collected by the
+    maya collector.
+    """
+    global _active_cache
+    cache = find_item_property(item, PROPERTY)
+    if cache is not None:
+        return cache
+    if _active_cache is None:
+        _active_cache = ResolveCache()
+    return _active_cache
+
+
+def invalidate():
+    """
+    Invalidate the cache of the last collection, e.g. after a rename.
+    """
+    if _active_cache is not None:
+        _active_cache.invalidate()
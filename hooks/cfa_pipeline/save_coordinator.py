@@ -0,0 +1,159 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+'''
+@ author：huangsheng
+@ date: 2026/10/18 14:20
+@ description:
+    Coalesces the scene saves of one maya publish.
+
+    Several plugins used to save the scene (xgen per collection, the session
+    publish, the version-up in finalize). The coordinator saves at most once
+    and only when the scene is modified, and versions up by copying the file
+    that was just saved instead of serializing the scene again.
+
+'''
+
+import os
+
+from sgtk.util.filesystem import ensure_folder_exists
+
+from cfa_pipeline import file_copy, find_item_property, maya_formats, \
+    resolve_cache, version_index
+
+# item property the coordinator is stored under
+PROPERTY = "save_coordinator"
+
+_active_coordinator = None
+
+
+class SaveCoordinator(object):
+    """
+    Saves the maya scene on behalf of the publish plugins.
+    """
+
+    def __init__(self):
+        self.saves = 0
+        self.avoided_saves = 0
+        self.avoided_bytes = 0
+        self.copied_version_ups = 0
+
+    def save(self, path=None):
+        """
+        Save the scene, unless it was already saved and is unmodified.
+
+        :param str path: save the scene to this path. Defaults to the current
+            scene path.
+        :returns: True if the scene was written.
+        """
+        import maya.cmds as cmds
+
+        current_path = _scene_path()
+        if path and _same_path(path, current_path):
+            path = None
+
+        if path is None and not _is_modified() and os.path.isfile(current_path):
+            self.avoided_saves += 1
+            self.avoided_bytes += os.path.getsize(current_path)
+            return False
+
+        if path is not None:
+            # maya won't create the folder when saving
+            ensure_folder_exists(os.path.dirname(path))
+            cmds.file(rename=path)
+            resolve_cache.invalidate()
+            current_path = path
+
+        # maya can choose the wrong file type so set it explicitly based on
+        # the extension
+        maya_file_type = maya_formats.file_type(current_path)
+        if maya_file_type:
+            cmds.file(save=True, force=True, type=maya_file_type)
+        else:
+            cmds.file(save=True, force=True)
+
+        version_index.invalidate(os.path.dirname(current_path))
+        self.saves += 1
+        return True
+
+    def version_up(self, next_version_path):
+        """
+        Move the session to ``next_version_path``.
+
+        When the scene is unmodified since the last save, the saved file is
+        copied on disk and the session is only renamed. Otherwise (or when
+        the scene has xgen palettes, whose .xgen files are written by the
+        save) the scene is saved to the new path.
+
+        Matches the save callback signature of ``_save_to_next_version``.
+        """
+        import maya.cmds as cmds
+
+        current_path = _scene_path()
+        if (_is_modified() or not os.path.isfile(current_path)
+                or cmds.ls(type="xgmPalette")):
+            self.save(next_version_path)
+            return
+
+        ensure_folder_exists(os.path.dirname(next_version_path))
+        file_copy.copy_file(current_path, next_version_path)
+        cmds.file(rename=next_version_path)
+        resolve_cache.invalidate()
+        version_index.invalidate(os.path.dirname(next_version_path))
+
+        self.copied_version_ups += 1
+        self.avoided_saves += 1
+        self.avoided_bytes += os.path.getsize(next_version_path)
+
+    def report(self, logger):
+        """
+        Log how many saves were done and how many were avoided.
+        """
+        logger.info(
+            "Scene saved %d time(s), %d save(s) avoided (%.1f MB not "
+            "written by maya, %d version-up(s) done by file copy)." % (
+                self.saves,
+                self.avoided_saves,
+                self.avoided_bytes / (1024.0 * 1024.0),
+                self.copied_version_ups
+            )
+        )
+
+
+def attach(item):
+    """
+    Create the coordinator for this publish and store it on ``item``.
+
+    :param item: the root item handed to the collector.
+    """
+    global _active_coordinator
+    _active_coordinator = SaveCoordinator()
+    item.properties[PROPERTY] = _active_coordinator
+    return _active_coordinator
+
+
+def get(item):
+    """
+    Return the coordinator attached to ``item`` or one of its parents.
+    """
+    global _active_coordinator
+    coordinator = find_item_property(item, PROPERTY)
+    if coordinator is not None:
+        return coordinator
+    if _active_coordinator is None:
+        _active_coordinator = SaveCoordinator()
+    return _active_coordinator
+
+
+def _scene_path():
+    import maya.cmds as cmds
+    return cmds.file(query=True, sn=True)
+
+
+def _is_modified():
+    import maya.cmds as cmds
+    return cmds.file(query=True, modified=True)
+
+
+def _same_path(path, other):
+    return os.path.normcase(os.path.normpath(path)) == \
+        os.path.normcase(os.path.normpath(other))
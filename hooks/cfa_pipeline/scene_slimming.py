@@ -0,0 +1,269 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+'''
+@ author：huangsheng
+@ date: 2026/10/26 10:00
+@ description:
+    Slimming pass of the selection based maya exports.
+
+    Before ``exportSelected``, the nodes the export would carry for nothing
+    are removed from the selection closure (the selection, its shading
+    engines and their history), in one undo chunk undone right after the
+    export: the work scene is left as it was. Passes, in order:
+
+        unknown         unknown nodes of a missing plugin
+        history         construction history of the meshes, deformers kept
+        unused_shading  shading nodes feeding nothing exported
+        orphan_scripts  script nodes not selected
+
+    ``history`` bakes the history of every mesh exported, it is only run
+    when listed in the "Slim Export" setting.
+
+    Referenced, locked and default nodes are never removed. Nodes created
+    for the publish file only (the shader hookup script nodes) are given as
+    ``temporary``, exported and then deleted from the work scene.
+
+'''
+
+import os
+import shutil
+import tempfile
+
+from cfa_pipeline import maya_formats
+
+PASSES = ("unknown", "history", "unused_shading", "orphan_scripts")
+
+# passes run when the setting is not changed, the cheap ones
+DEFAULT_PASSES = ("unknown", "unused_shading", "orphan_scripts")
+
+# plugin settings, merged into the settings of the plugins exporting the
+# selection
+SETTINGS = {
+    "Slim Export": {
+        "type": "list",
+        "default": list(DEFAULT_PASSES),
+        "description": "Slimming passes run on the exported nodes: unknown, "
+                       "history, unused_shading, orphan_scripts. Empty to "
+                       "export the selection as it is.",
+    },
+    "Slim Export Report": {
+        "type": "bool",
+        "default": False,
+        "description": "Also export the selection unslimmed to a temporary "
+                       "file to report the bytes removed. The removed nodes "
+                       "are always reported.",
+    },
+}
+
+UNKNOWN_TYPES = ["unknown", "unknownDag", "unknownTransform"]
+
+# default lists every shading node is connected to
+_SHADING_LISTS = ("defaultShaderList", "defaultTextureList",
+                  "defaultRenderUtilityList", "materialInfo",
+                  "nodeGraphEditorInfo")
+
+
+def passes(settings):
+    """
+    Return the slimming passes of the "Slim Export" setting, in run order.
+    """
+    if "Slim Export" not in settings:
+        return list(DEFAULT_PASSES)
+    names = settings["Slim Export"].value or []
+    unknown = [name for name in names if name not in PASSES]
+    if unknown:
+        raise ValueError(
+            "Unknown Slim Export pass(es) %s, expected: %s" % (
+                ", ".join(unknown), ", ".join(PASSES)))
+    return [name for name in PASSES if name in names]
+
+
+def closure(nodes):
+    """
+    Return the long names of the nodes ``exportSelected`` writes for
+    ``nodes``.
+    """
+    import maya.cmds as cmds
+
+    roots = cmds.ls(nodes, long=True) or []
+    dag = cmds.ls(roots, dag=True, long=True) or []
+    shapes = cmds.ls(dag, shapes=True, long=True) or []
+    engines = cmds.listConnections(shapes, type="shadingEngine") \
+        if shapes else None
+    roots = set(roots + dag + (cmds.ls(engines or [], long=True) or []))
+    history = cmds.listHistory(list(roots)) or []
+    return roots | set(cmds.ls(history, long=True) or [])
+
+
+def slim(nodes, pass_names, keep=()):
+    """
+    Remove from the scene the nodes of the ``nodes`` closure found by
+    ``pass_names``. Meant to be run in an undo chunk.
+
+    :param list keep: nodes never removed, the selection always is.
+    :returns: ``{pass: removed node count}``
+    """
+    import maya.cmds as cmds
+
+    kept = set(cmds.ls(list(nodes) + list(keep), long=True) or [])
+    removed = {}
+    for name in pass_names:
+        exported = closure(nodes)
+        candidates = _removable(_PASSES[name](exported, kept))
+        if name == "history":
+            # baking removes the history nodes, the shapes stay
+            if candidates:
+                cmds.bakePartialHistory(candidates, prePostDeformers=True)
+            removed[name] = len([node for node in exported
+                                 if not cmds.objExists(node)])
+            continue
+        candidates = [node for node in candidates if node not in kept]
+        if candidates:
+            cmds.delete(candidates)
+        removed[name] = len(candidates)
+    return removed
+
+
+def export(plugin, settings, item, path, nodes, temporary=(), **kwargs):
+    """
+    Slim the closure of ``nodes``, export them to ``path`` and restore the
+    work scene.
+
+    The removed nodes are logged and set on the ``slimming`` property of
+    ``item``: ``{"nodes": {pass: count}, "bytes": saved or None}``.
+
+    :param list temporary: nodes of the publish file only, deleted from the
+        work scene after the export.
+    :param kwargs: ``maya_formats.export_selected`` options.
+    """
+    import maya.cmds as cmds
+
+    nodes = cmds.ls(nodes) or []
+    pass_names = passes(settings)
+    try:
+        if not pass_names:
+            cmds.select(nodes, replace=True)
+            return maya_formats.export_selected(path, **kwargs)
+        if not cmds.undoInfo(query=True, state=True):
+            plugin.logger.warning(
+                "Undo is off, %s exported without slimming." % path)
+            cmds.select(nodes, replace=True)
+            return maya_formats.export_selected(path, **kwargs)
+
+        cmds.undoInfo(openChunk=True)
+        try:
+            # never an empty chunk, the undo would take the previous one
+            cmds.select(nodes, replace=True)
+            removed = slim(nodes, pass_names)
+            cmds.select(nodes, replace=True)
+            result = maya_formats.export_selected(path, **kwargs)
+        finally:
+            cmds.undoInfo(closeChunk=True)
+            cmds.undo()
+
+        saved = None
+        report = settings["Slim Export Report"].value \
+            if "Slim Export Report" in settings else False
+        if report and sum(removed.values()):
+            saved = _saved_bytes(path, nodes, **kwargs)
+    finally:
+        temporary = [node for node in temporary if cmds.objExists(node)]
+        if temporary:
+            cmds.delete(temporary)
+
+    item.properties["slimming"] = {"nodes": removed, "bytes": saved}
+    plugin.logger.info("Slimmed %s: %d node(s) removed (%s)%s." % (
+        os.path.basename(path),
+        sum(removed.values()),
+        ", ".join("%s %d" % (name, removed[name]) for name in pass_names),
+        ", %d bytes saved" % saved if saved is not None else ""))
+    return result
+
+
+def _saved_bytes(path, nodes, **kwargs):
+    # size of the unslimmed export minus the one of the publish
+    import maya.cmds as cmds
+
+    folder = tempfile.mkdtemp(prefix="cfa_slimming.")
+    try:
+        unslimmed = os.path.join(folder, os.path.basename(path))
+        cmds.select(nodes, replace=True)
+        maya_formats.export_selected(unslimmed, **kwargs)
+        return os.path.getsize(unslimmed) - os.path.getsize(path)
+    except (OSError, RuntimeError):
+        return None
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+
+def _removable(nodes):
+    import maya.cmds as cmds
+
+    defaults = set(cmds.ls(defaultNodes=True, long=True) or [])
+    result = []
+    for node in nodes:
+        if node in defaults or not cmds.objExists(node):
+            continue
+        if cmds.referenceQuery(node, isNodeReferenced=True):
+            continue
+        if cmds.lockNode(node, query=True, lock=True)[0]:
+            continue
+        result.append(node)
+    return result
+
+
+def _unknown(exported, kept):
+    import maya.cmds as cmds
+    return cmds.ls(list(exported), type=UNKNOWN_TYPES, long=True) or []
+
+
+def _history(exported, kept):
+    # shapes with construction history nodes besides the deformers
+    import maya.cmds as cmds
+
+    shapes = cmds.ls(list(exported), type=["mesh", "nurbsSurface",
+                                           "nurbsCurve"],
+                     noIntermediate=True, long=True) or []
+    result = []
+    for shape in shapes:
+        history = cmds.listHistory(shape, pruneDagObjects=True) or []
+        deformers = set(cmds.ls(history, type="geometryFilter") or [])
+        if len(history) > len(deformers):
+            result.append(shape)
+    return result
+
+
+def _unused_shading(exported, kept):
+    # shading nodes whose outputs reach nothing exported, until stable
+    import maya.cmds as cmds
+
+    shading = set(cmds.ls(list(exported), type="shadingDependNode",
+                          long=True) or []) - kept
+    unused = set()
+    changed = True
+    while changed:
+        changed = False
+        for node in shading - unused:
+            outputs = cmds.listConnections(node, source=False,
+                                           destination=True) or []
+            outputs = set(cmds.ls(outputs, long=True) or [])
+            outputs = [output for output in outputs
+                       if output in exported and output not in unused and
+                       cmds.nodeType(output) not in _SHADING_LISTS]
+            if not outputs:
+                unused.add(node)
+                changed = True
+    return list(unused)
+
+
+def _orphan_scripts(exported, kept):
+    import maya.cmds as cmds
+    return cmds.ls(list(exported), type="script", long=True) or []
+
+
+_PASSES = {
+    "unknown": _unknown,
+    "history": _history,
+    "unused_shading": _unused_shading,
+    "orphan_scripts": _orphan_scripts,
+}
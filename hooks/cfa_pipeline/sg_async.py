@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+'''
+@ author：huangsheng
+@ date: 2026/10/27 15:00
+@ description:
+    Independent shotgun calls issued concurrently.
+
+    A hook lists its calls and gets their results back in order, the wall
+    clock time is about the one of the slowest call::
+
+        from cfa_pipeline import sg_async
+        (movie, thumbnail) = sg_async.gather(connect, [
+            sg_async.Call("upload", "Version", 12, movie_path,
+                          "sg_uploaded_movie"),
+            sg_async.Call("upload_thumbnail", "PublishedFile", 34, thumb),
+        ])
+
+    ``gather`` is the synchronous adapter for maya's main thread. On python
+    3 it runs the calls on a private asyncio loop through
+    ``sg_asyncio.AsyncShotgun``, which async code can use directly. On
+    python 2 a thread pool runs them. Shotgun connections are not thread
+    safe: ``connect`` is called once per worker thread.
+
+'''
+
+import sys
+import threading
+from multiprocessing.pool import ThreadPool
+
+# concurrent calls by default
+LIMIT = 4
+
+
+class Call(object):
+    """
+    A shotgun api call: ``Call("find_one", "Task", filters, fields)``.
+    """
+
+    def __init__(self, method, *args, **kwargs):
+        self.method = method
+        self.args = args
+        self.kwargs = kwargs
+
+    def __call__(self, sg):
+        return getattr(sg, self.method)(*self.args, **self.kwargs)
+
+    def __repr__(self):
+        return "<Call %s%r>" % (self.method, self.args)
+
+
+class ThreadConnections(object):
+    """
+    One shotgun connection per thread, made by ``connect``.
+    """
+
+    def __init__(self, connect):
+        self._connect = connect
+        self._local = threading.local()
+
+    def get(self):
+        sg = getattr(self._local, "sg", None)
+        if sg is None:
+            sg = self._local.sg = self._connect()
+        return sg
+
+
+def gather(connect, calls, limit=LIMIT, return_exceptions=False):
+    """
+    Run ``calls`` concurrently and return their results in order.
+
+    :param connect: callable returning a shotgun connection.
+    :param list calls: :class:`Call` objects.
+    :param int limit: maximum number of calls running at once.
+    :param bool return_exceptions: return the exception of a failed call as
+        its result instead of raising the first one.
+    """
+    calls = list(calls)
+    if not calls:
+        return []
+    if len(calls) == 1 or limit <= 1:
+        return _serial(connect(), calls, return_exceptions)
+    if sys.version_info[0] >= 3:
+        from cfa_pipeline import sg_asyncio
+        return sg_asyncio.run(connect, calls, limit, return_exceptions)
+
+    connections = ThreadConnections(connect)
+    pool = ThreadPool(min(limit, len(calls)))
+    try:
+        results = [pool.apply_async(_run, (connections, call))
+                   for call in calls]
+        outcomes = [result.get() for result in results]
+    finally:
+        pool.close()
+        pool.join()
+    return _unwrap(outcomes, return_exceptions)
+
+
+def _serial(sg, calls, return_exceptions):
+    outcomes = []
+    for call in calls:
+        try:
+            outcomes.append((True, call(sg)))
+        except Exception as e:
+            if not return_exceptions:
+                raise
+            outcomes.append((False, e))
+    return _unwrap(outcomes, return_exceptions)
+
+
+def _run(connections, call):
+    try:
+        return (True, call(connections.get()))
+    except Exception as e:
+        return (False, e)
+
+
+def _unwrap(outcomes, return_exceptions):
+    if not return_exceptions:
+        for (ok, value) in outcomes:
+            if not ok:
+                raise value
+    return [value for (_, value) in outcomes]
@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+'''
+@ author：huangsheng
+@ date: 2026/10/27 15:00
+@ description:
+    asyncio facade of the shotgun api, python 3 only. Hooks go through
+    ``sg_async.gather``, async code can use the client directly::
+
+        client = AsyncShotgun(connect, limit=4)
+        try:
+            (task, shot) = await asyncio.gather(
+                client.find_one("Task", [["id", "is", 12]], ["step"]),
+                client.find_one("Shot", [["id", "is", 34]], ["sg_cut_in"]))
+        finally:
+            client.close()
+
+    Every call runs the blocking api on a worker thread with its own
+    connection, a semaphore keeps at most ``limit`` calls in flight.
+
+'''
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from cfa_pipeline.sg_async import Call, ThreadConnections
+
+
+class AsyncShotgun(object):
+    """
+    Coroutine versions of the shotgun api methods: ``await client.find(...)``.
+
+    :param connect: callable returning a shotgun connection.
+    :param int limit: maximum number of calls in flight.
+    """
+
+    def __init__(self, connect, limit=4):
+        self._connections = ThreadConnections(connect)
+        self._executor = ThreadPoolExecutor(max_workers=limit)
+        self._semaphore = asyncio.Semaphore(limit)
+
+    async def call(self, call):
+        """
+        Run the :class:`~cfa_pipeline.sg_async.Call` ``call``.
+        """
+        async with self._semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._executor, self._run, call)
+
+    async def gather(self, calls, return_exceptions=False):
+        """
+        Run ``calls`` concurrently, their results in order.
+        """
+        return await asyncio.gather(
+            *[self.call(call) for call in calls],
+            return_exceptions=return_exceptions)
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+
+    def __getattr__(self, method):
+        if method.startswith("_"):
+            raise AttributeError(method)
+
+        async def api_call(*args, **kwargs):
+            return await self.call(Call(method, *args, **kwargs))
+
+        api_call.__name__ = method
+        return api_call
+
+    def _run(self, call):
+        return call(self._connections.get())
+
+
+def run(connect, calls, limit=4, return_exceptions=False):
+    """
+    Run ``calls`` on a private event loop and return their results, for
+    synchronous callers.
+    """
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(
+            _gather(connect, calls, limit, return_exceptions))
+    finally:
+        loop.close()
+
+
+async def _gather(connect, calls, limit, return_exceptions):
+    client = AsyncShotgun(connect, limit)
+    try:
+        return await client.gather(calls, return_exceptions)
+    finally:
+        client.close()
@@ -0,0 +1,482 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+'''
+@ author：huangsheng
+@ date: 2026/10/27 10:00
+@ description:
+    Local SQLite mirror of the Steps, Tasks, Shots and PublishedFiles of a
+    project, for the lookups the hooks make on every load and publish.
+
+    Each entity type is synced incrementally: only the records updated since
+    the last sync are fetched, at most once per ``SYNC_INTERVAL`` and
+    project. The module functions read the mirror and fall back to a live
+    query (stored in the mirror) for what it does not have yet::
+
+        from cfa_pipeline import sg_mirror
+        step = sg_mirror.task_step(_shotgun_server._shotgun, project_id,
+                                   task_id)
+
+    ``connect`` is any callable returning a shotgun connection, e.g. a
+    mockgun ``Shotgun`` for tests, called on the thread using it. The mirror
+    is ``CFA_SG_MIRROR`` or a file in the user's home folder,
+    ``CFA_SG_MIRROR=off`` queries shotgun live. Each sync also removes the
+    records retired since the last one.
+
+    The first sync of the PublishedFiles fetches the whole project, it runs
+    on a background thread and the publishes are queried live until it is
+    done.
+
+'''
+
+import calendar
+import datetime
+import json
+import os
+import sqlite3
+import threading
+import time
+
+# seconds between two syncs of an entity type of a project
+SYNC_INTERVAL = 300
+
+# seconds between two syncs of the PublishedFiles, new publishes matter
+PUBLISH_SYNC_INTERVAL = 30
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS steps (
+    id INTEGER PRIMARY KEY,
+    code TEXT,
+    short_name TEXT,
+    entity_type TEXT,
+    updated_at REAL
+);
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY,
+    project_id INTEGER,
+    content TEXT,
+    step_id INTEGER,
+    step_name TEXT,
+    entity_type TEXT,
+    entity_id INTEGER,
+    updated_at REAL
+);
+CREATE INDEX IF NOT EXISTS tasks_entity ON tasks (entity_type, entity_id);
+CREATE TABLE IF NOT EXISTS shots (
+    id INTEGER PRIMARY KEY,
+    project_id INTEGER,
+    code TEXT,
+    cut_in INTEGER,
+    cut_out INTEGER,
+    updated_at REAL
+);
+CREATE TABLE IF NOT EXISTS published_files (
+    id INTEGER PRIMARY KEY,
+    project_id INTEGER,
+    name TEXT,
+    version_number INTEGER,
+    published_file_type TEXT,
+    entity_type TEXT,
+    entity_id INTEGER,
+    task_id INTEGER,
+    path TEXT,
+    updated_at REAL
+);
+CREATE INDEX IF NOT EXISTS published_files_entity
+    ON published_files (entity_type, entity_id);
+CREATE TABLE IF NOT EXISTS sync_state (
+    entity_type TEXT,
+    project_id INTEGER,
+    last_updated REAL,
+    synced_at REAL,
+    PRIMARY KEY (entity_type, project_id)
+);
+"""
+
+
+def _link(value, key):
+    return (value or {}).get(key)
+
+
+def _timestamp(value):
+    # shotgun datetimes are timezone aware
+    if value is None:
+        return None
+    if value.tzinfo is not None:
+        return float(calendar.timegm(value.utctimetuple()))
+    return time.mktime(value.timetuple())
+
+
+# entity type -> (table, project scoped, shotgun fields, record -> row)
+ENTITIES = {
+    "Step": (
+        "steps", False,
+        ["code", "short_name", "entity_type"],
+        lambda r: (r["id"], r.get("code"), r.get("short_name"),
+                   r.get("entity_type"))),
+    "Task": (
+        "tasks", True,
+        ["project", "content", "step", "entity"],
+        lambda r: (r["id"], _link(r.get("project"), "id"), r.get("content"),
+                   _link(r.get("step"), "id"), _link(r.get("step"), "name"),
+                   _link(r.get("entity"), "type"),
+                   _link(r.get("entity"), "id"))),
+    "Shot": (
+        "shots", True,
+        ["project", "code", "sg_cut_in", "sg_cut_out"],
+        lambda r: (r["id"], _link(r.get("project"), "id"), r.get("code"),
+                   r.get("sg_cut_in"), r.get("sg_cut_out"))),
+    "PublishedFile": (
+        "published_files", True,
+        ["project", "name", "version_number", "published_file_type",
+         "entity", "task", "path"],
+        lambda r: (r["id"], _link(r.get("project"), "id"), r.get("name"),
+                   r.get("version_number"),
+                   _link(r.get("published_file_type"), "name"),
+                   _link(r.get("entity"), "type"),
+                   _link(r.get("entity"), "id"),
+                   _link(r.get("task"), "id"),
+                   json.dumps(r.get("path")))),
+}
+
+_mirror = None
+
+# (mirror path, entity type, project id) -> background sync thread
+_background_syncs = {}
+_background_lock = threading.Lock()
+
+try:
+    _TEXT = unicode
+except NameError:
+    _TEXT = None
+
+
+def default_mirror_path():
+    """
+    Return the path of the mirror database, ``CFA_SG_MIRROR`` or a file in
+    the user's home folder.
+    """
+    path = os.environ.get("CFA_SG_MIRROR")
+    if not path:
+        path = os.path.join(
+            os.path.expanduser("~"), ".cfa_pipeline", "sg_mirror.db")
+    return path
+
+
+class Mirror(object):
+    """
+    The mirror database. Every call opens its own connection, the mirror
+    can be used from worker threads.
+
+    :param connect: callable returning a shotgun connection.
+    :param str path: database file, created if needed.
+    """
+
+    def __init__(self, connect, path=None):
+        self.connect = connect
+        self.path = path or default_mirror_path()
+        folder = os.path.dirname(self.path)
+        if folder and not os.path.isdir(folder):
+            os.makedirs(folder)
+        connection = self._connect()
+        try:
+            connection.executescript(_SCHEMA)
+        finally:
+            connection.close()
+
+    def sync(self, project_id, entity_types=None, max_age=SYNC_INTERVAL):
+        """
+        Fetch the records updated since the last sync and remove the
+        retired ones.
+
+        :param int project_id: project of the project scoped types.
+        :param list entity_types: types to sync, all of ``ENTITIES`` if None.
+        :param max_age: seconds a sync is recent for, 0 to always sync.
+        :returns: ``{entity_type: number of records stored}``
+        """
+        counts = {}
+        sg = None
+        for entity_type in sorted(entity_types or ENTITIES):
+            (_, scoped, fields, _) = ENTITIES[entity_type]
+            scope = project_id if scoped else 0
+            state = self._sync_state(entity_type, scope)
+            if state and time.time() - state[1] < max_age:
+                continue
+
+            scope_filters = []
+            if scoped:
+                scope_filters.append(["project", "is",
+                                      {"type": "Project", "id": project_id}])
+            filters = list(scope_filters)
+            if state and state[0]:
+                # a second back, records of the same second are stored again
+                filters.append(["updated_at", "greater_than",
+                                datetime.datetime.fromtimestamp(state[0] - 1)])
+            if sg is None:
+                sg = self.connect()
+            records = sg.find(
+                entity_type, filters, fields + ["updated_at"],
+                order=[{"field_name": "updated_at", "direction": "asc"}])
+            retired = []
+            if state:
+                # retiring a record updates it, the ones retired since the
+                # last sync. the first sync stores no retired record
+                retired = [record["id"] for record in sg.find(
+                    entity_type, filters, ["id"], retired_only=True)]
+
+            last = state[0] if state else None
+            for record in records:
+                updated = _timestamp(record.get("updated_at"))
+                if updated is not None and (last is None or updated > last):
+                    last = updated
+            self._store(entity_type, records,
+                        state=(scope, last, time.time()), retired=retired)
+            counts[entity_type] = len(records)
+        return counts
+
+    def store(self, entity_type, records):
+        """
+        Store ``records`` of a live query, they need the fields of
+        ``ENTITIES``.
+        """
+        self._store(entity_type, records)
+
+    def task_step(self, task_id):
+        """
+        Return the ``{"type": "Step", "id", "name"}`` of the task, None if
+        the task is not mirrored.
+        """
+        row = self._fetch_one(
+            "SELECT step_id, step_name FROM tasks WHERE id = ?", (task_id,))
+        if row is None or row[0] is None:
+            return None
+        return {"type": "Step", "id": row[0], "name": row[1]}
+
+    def cut_range(self, shot_id):
+        """
+        Return the ``(cut_in, cut_out)`` of the shot, None if it is not
+        mirrored.
+        """
+        return self._fetch_one(
+            "SELECT cut_in, cut_out FROM shots WHERE id = ?", (shot_id,))
+
+    def published_files(self, entity_type, entity_id):
+        """
+        Return the PublishedFiles of the entity, as returned by ``sg.find``
+        with the ``published_file_type`` and ``path`` fields.
+        """
+        connection = self._connect()
+        try:
+            rows = connection.execute(
+                "SELECT id, name, version_number, published_file_type, path "
+                "FROM published_files WHERE entity_type = ? AND entity_id = ? "
+                "ORDER BY id", (entity_type, entity_id)).fetchall()
+        finally:
+            connection.close()
+        return [{
+            "type": "PublishedFile",
+            "id": row[0],
+            "name": row[1],
+            "version_number": row[2],
+            "published_file_type": {"type": "PublishedFileType",
+                                    "name": row[3]},
+            "path": _native(json.loads(row[4])) if row[4] else None,
+        } for row in rows]
+
+    def synced(self, entity_type, project_id):
+        """
+        Return True if ``entity_type`` of the project was synced once.
+        """
+        scope = project_id if ENTITIES[entity_type][1] else 0
+        return self._sync_state(entity_type, scope) is not None
+
+    def _store(self, entity_type, records, state=None, retired=()):
+        (table, _, _, to_row) = ENTITIES[entity_type]
+        rows = [to_row(record) + (_timestamp(record.get("updated_at")),)
+                for record in records]
+        connection = self._connect()
+        try:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                if rows:
+                    connection.executemany(
+                        "INSERT OR REPLACE INTO %s VALUES (%s)" % (
+                            table, ", ".join("?" * len(rows[0]))),
+                        rows)
+                if retired:
+                    connection.executemany(
+                        "DELETE FROM %s WHERE id = ?" % table,
+                        [(entity_id,) for entity_id in retired])
+                if state is not None:
+                    connection.execute(
+                        "INSERT OR REPLACE INTO sync_state "
+                        "(entity_type, project_id, last_updated, synced_at) "
+                        "VALUES (?, ?, ?, ?)", (entity_type,) + state)
+                connection.execute("COMMIT")
+            except Exception:
+                connection.execute("ROLLBACK")
+                raise
+        finally:
+            connection.close()
+
+    def _sync_state(self, entity_type, scope):
+        return self._fetch_one(
+            "SELECT last_updated, synced_at FROM sync_state "
+            "WHERE entity_type = ? AND project_id = ?", (entity_type, scope))
+
+    def _fetch_one(self, query, args):
+        connection = self._connect()
+        try:
+            return connection.execute(query, args).fetchone()
+        finally:
+            connection.close()
+
+    def _connect(self):
+        connection = sqlite3.connect(self.path, timeout=30,
+                                     isolation_level=None)
+        if _TEXT is not None:
+            # utf-8 str as the python 2 shotgun api returns
+            connection.text_factory = str
+        return connection
+
+
+def _native(value):
+    # the json of the python 2 paths gives unicode, shotgun gives utf-8 str
+    if _TEXT is None:
+        return value
+    if isinstance(value, dict):
+        return dict((_native(k), _native(v)) for (k, v) in value.items())
+    if isinstance(value, _TEXT):
+        return value.encode("utf-8")
+    return value
+
+
+def get_mirror(connect):
+    """
+    Return the mirror of ``default_mirror_path``, None if it is turned off.
+    """
+    global _mirror
+    path = default_mirror_path()
+    if path.lower() in ("off", "0", "false"):
+        return None
+    if _mirror is None or _mirror.path != path:
+        _mirror = Mirror(connect, path)
+    else:
+        _mirror.connect = connect
+    return _mirror
+
+
+def synced_mirror(connect, project_id, entity_type, max_age=SYNC_INTERVAL):
+    """
+    Return the mirror with ``entity_type`` of the project synced, None if
+    the mirror is off or can't be synced.
+    """
+    if not project_id:
+        return None
+    try:
+        mirror = get_mirror(connect)
+        if mirror is not None:
+            mirror.sync(project_id, [entity_type], max_age)
+        return mirror
+    except Exception:
+        # shotgun or the mirror unavailable, the caller queries live
+        return None
+
+
+def sync_in_background(connect, project_id, entity_type):
+    """
+    Sync ``entity_type`` of the project on a background thread, unless it
+    is being synced already.
+
+    :returns: the thread, None if the mirror is off.
+    """
+    if not project_id:
+        return None
+    try:
+        mirror = get_mirror(connect)
+    except Exception:
+        return None
+    if mirror is None:
+        return None
+    key = (mirror.path, entity_type, project_id)
+    with _background_lock:
+        thread = _background_syncs.get(key)
+        if thread is None or not thread.is_alive():
+            thread = threading.Thread(
+                target=_sync_quietly,
+                args=(Mirror(connect, mirror.path), project_id, entity_type))
+            thread.daemon = True
+            thread.start()
+            _background_syncs[key] = thread
+    return thread
+
+
+def _sync_quietly(mirror, project_id, entity_type):
+    try:
+        mirror.sync(project_id, [entity_type], 0)
+    except Exception:
+        # synced again by the next lookup
+        pass
+
+
+def task_step(connect, project_id, task_id):
+    """
+    Return the step ``{"type": "Step", "id", "name"}`` of the task.
+    """
+    mirror = synced_mirror(connect, project_id, "Task")
+    if mirror is not None:
+        step = mirror.task_step(task_id)
+        if step is not None:
+            return step
+    task = connect().find_one(
+        "Task", [["id", "is", task_id]],
+        ENTITIES["Task"][2] + ["updated_at"])
+    if task is None:
+        return None
+    if mirror is not None:
+        mirror.store("Task", [task])
+    return task.get("step")
+
+
+def cut_range(connect, project_id, shot_id):
+    """
+    Return the ``(sg_cut_in, sg_cut_out)`` of the shot.
+    """
+    # written into the shot data of the publish, the cut changes of the
+    # last minutes matter. one incremental find
+    mirror = synced_mirror(connect, project_id, "Shot", 0)
+    if mirror is not None:
+        cut = mirror.cut_range(shot_id)
+        if cut is not None:
+            return tuple(cut)
+    shot = connect().find_one(
+        "Shot", [["id", "is", shot_id]],
+        ENTITIES["Shot"][2] + ["updated_at"])
+    if shot is None:
+        return (None, None)
+    if mirror is not None:
+        mirror.store("Shot", [shot])
+    return (shot.get("sg_cut_in"), shot.get("sg_cut_out"))
+
+
+def published_files(connect, project_id, entity_type, entity_id):
+    """
+    Return the PublishedFiles of the entity with their
+    ``published_file_type`` and ``path``.
+    """
+    try:
+        mirror = get_mirror(connect) if project_id else None
+    except Exception:
+        mirror = None
+    if mirror is not None and mirror.synced("PublishedFile", project_id):
+        mirror = synced_mirror(connect, project_id, "PublishedFile",
+                               PUBLISH_SYNC_INTERVAL)
+        if mirror is not None:
+            # a synced mirror has every publish of the project, even none
+            return mirror.published_files(entity_type, entity_id)
+    elif mirror is not None:
+        # the whole project is fetched once, not while the user waits
+        sync_in_background(connect, project_id, "PublishedFile")
+    return connect().find(
+        "PublishedFile",
+        [["entity.%s.id" % entity_type, "is", entity_id]],
+        ["published_file_type", "path"])
@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+'''
+@ author：huangsheng
+@ date: 2026/10/19 14:02
+@ description:
+    Small staged pipeline: work that needs maya runs on the main thread,
+    shotgun calls and plain file writes run on a thread pool as soon as
+    their inputs are ready. Every stage is timed.
+
+'''
+
+import threading
+import time
+from multiprocessing.pool import ThreadPool
+
+
+class Stage(object):
+    """
+    Handle on a stage running in the background.
+    """
+
+    def __init__(self, name, async_result):
+        self.name = name
+        self._async_result = async_result
+
+    def result(self):
+        """
+        Block until the stage is done and return its result. Exceptions
+        raised by the stage are raised again here.
+        """
+        return self._async_result.get()
+
+
+class StagePipeline(object):
+    """
+    Runs the stages of an export and records how long each one took.
+
+    Background stages can take other :class:`Stage` objects as arguments,
+    they are resolved to their results in the worker before the stage runs.
+    A stage must be submitted after the stages it depends on, the pool picks
+    up work in order so a waiting worker never blocks its own dependency.
+    """
+
+    def __init__(self, workers=4):
+        self._pool = ThreadPool(max(2, workers))
+        self._stages = []
+        self._lock = threading.Lock()
+        self.timings = []
+
+    def run(self, name, func, *args, **kwargs):
+        """
+        Run a stage on the calling (main) thread and return its result.
+        """
+        return self._timed(name, "main", func, args, kwargs)
+
+    def submit(self, name, func, *args, **kwargs):
+        """
+        Run a stage on the thread pool.
+
+        :returns: :class:`Stage` to get the result from.
+        """
+        async_result = self._pool.apply_async(
+            self._timed, (name, "worker", func, args, kwargs))
+        stage = Stage(name, async_result)
+        self._stages.append(stage)
+        return stage
+
+    def wait(self):
+        """
+        Wait for all the background stages and shut the pool down.
+
+        The first exception raised by a stage is raised again.
+        """
+        try:
+            for stage in self._stages:
+                stage.result()
+        finally:
+            self.close()
+
+    def close(self):
+        """
+        Let the submitted stages finish and shut the pool down.
+        """
+        self._pool.close()
+        self._pool.join()
+
+    def report(self, logger):
+        """
+        Log the duration of every stage.
+        """
+        for (name, thread, seconds) in self.timings:
+            logger.info("%-30s %-6s %.2fs" % (name, thread, seconds))
+
+    def _timed(self, name, thread, func, args, kwargs):
+        args = [_resolve(a) for a in args]
+        kwargs = dict((k, _resolve(v)) for (k, v) in kwargs.items())
+        start = time.time()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            with self._lock:
+                self.timings.append((name, thread, time.time() - start))
+
+
+def _resolve(value):
+    if isinstance(value, Stage):
+        return value.result()
+    return value
@@ -0,0 +1,191 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+'''
+@ author：huangsheng
+@ date: 2026/10/23 15:00
+@ description:
+    Loads a published texture folder as maya file nodes.
+
+    The folder is listed once and its ``texturesets`` json read once. UDIM
+    folders get one node per texture (all the tiles of a channel), other
+    folders one node per image. The nodes are created in one undo chunk with
+    the viewport suspended, the uv tile previews are generated afterwards,
+    one per idle event, so maya stays usable while they build.
+
+'''
+
+import json
+import os
+import re
+
+# files of the folder that are not textures
+IGNORED_EXTENSIONS = ("", ".obj", ".mtl", ".json")
+
+# <name><tile>.<ext>, table_BaseColor.1001.png
+UDIM_PATTERN = re.compile(r"^(?P<name>.+?)(?P<tile>1\d{3})(?P<ext>\.[A-Za-z][^.]*)$")
+
+# color space of the channels, searched in the texture name
+COLOR_SPACES = (
+    (re.compile("Diffuse|Reflection", re.IGNORECASE), "sRGB"),
+    (re.compile("Glossiness|IOR|Normal", re.IGNORECASE), "Raw"),
+)
+
+# place2dTexture -> file connections made by the hypershade
+_PLACE2D_ATTRS = (
+    "coverage", "translateFrame", "rotateFrame", "mirrorU", "mirrorV",
+    "stagger", "wrapU", "wrapV", "repeatUV", "offset", "rotateUV",
+    "noiseUV", "vertexUvOne", "vertexUvTwo", "vertexUvThree",
+    "vertexCameraOne",
+)
+
+# file nodes waiting for their uv tile preview
+_preview_queue = []
+
+
+class Texture(object):
+    """
+    One file node to create.
+
+    :param str name: texture name, without tile and extension.
+    :param str path: image set on the node, the first tile for UDIMs.
+    :param list tiles: UDIM tiles, empty for a single image.
+    """
+
+    def __init__(self, name, path, tiles=None):
+        self.name = name
+        self.path = path
+        self.tiles = tiles or []
+
+    @property
+    def udim(self):
+        return bool(self.tiles)
+
+    @property
+    def color_space(self):
+        for (pattern, color_space) in COLOR_SPACES:
+            if pattern.search(self.name):
+                return color_space
+        return None
+
+
+def read_folder(folder):
+    """
+    Return the textures of a published texture folder, an empty list when
+    it has no ``texturesets`` json.
+    """
+    images = []
+    json_file = None
+    for name in sorted(os.listdir(folder)):
+        ext = os.path.splitext(name)[1].lower()
+        if ext == ".json":
+            json_file = os.path.join(folder, name)
+        elif ext not in IGNORED_EXTENSIONS:
+            images.append(name)
+    if not json_file:
+        return []
+
+    with open(json_file, "r") as f:
+        texturesets = json.load(f).get("texturesets")
+    if not texturesets:
+        return []
+
+    # texture sets named after their tile, "1001", are UDIM sets
+    if all(str(key).isdigit() for key in texturesets):
+        return _group_tiles(folder, images)
+    return [Texture(os.path.splitext(name)[0], os.path.join(folder, name))
+            for name in images]
+
+
+def create_file_nodes(textures):
+    """
+    Create a file node and its place2dTexture for each texture.
+
+    :returns: the file nodes.
+    """
+    import maya.cmds as cmds
+
+    file_nodes = []
+    cmds.undoInfo(openChunk=True)
+    cmds.refresh(suspend=True)
+    try:
+        for texture in textures:
+            file_nodes.append(_create_file_node(cmds, texture))
+    finally:
+        cmds.refresh(suspend=False)
+        cmds.undoInfo(closeChunk=True)
+    return file_nodes
+
+
+def queue_previews(file_nodes):
+    """
+    Generate the uv tile previews of ``file_nodes`` one by one when maya is
+    idle. Nothing is done in batch mode.
+    """
+    import maya.cmds as cmds
+
+    if cmds.about(batch=True) or not file_nodes:
+        return
+    start = not _preview_queue
+    _preview_queue.extend(file_nodes)
+    if start:
+        cmds.evalDeferred(_generate_next_preview, lowestPriority=True)
+
+
+def _generate_next_preview():
+    import maya.cmds as cmds
+    import maya.mel as mel
+
+    while _preview_queue:
+        file_node = _preview_queue.pop(0)
+        # the node may have been deleted since it was queued
+        if cmds.objExists(file_node):
+            try:
+                mel.eval("generateUvTilePreview %s" % file_node)
+            except RuntimeError:
+                pass
+            break
+    if _preview_queue:
+        cmds.evalDeferred(_generate_next_preview, lowestPriority=True)
+
+
+def _group_tiles(folder, images):
+    textures = {}
+    for name in images:
+        m = UDIM_PATTERN.match(name)
+        if m is None:
+            continue
+        key = (m.group("name"), m.group("ext"))
+        textures.setdefault(key, []).append(int(m.group("tile")))
+
+    result = []
+    for ((name, ext), tiles) in sorted(textures.items()):
+        tiles.sort()
+        first = "%s%d%s" % (name, tiles[0], ext)
+        result.append(Texture(name.rstrip("._"), os.path.join(folder, first),
+                              tiles))
+    return result
+
+
+def _create_file_node(cmds, texture):
+    node_name = re.sub(r"\W", "_", texture.name)
+    if not node_name or node_name[0].isdigit():
+        node_name = "file_" + node_name
+    file_node = cmds.shadingNode(
+        "file", asTexture=True, isColorManaged=True, name=node_name)
+    place2d = cmds.shadingNode("place2dTexture", asUtility=True)
+    for attr in _PLACE2D_ATTRS:
+        cmds.connectAttr("%s.%s" % (place2d, attr),
+                         "%s.%s" % (file_node, attr), force=True)
+    cmds.connectAttr(place2d + ".outUV", file_node + ".uvCoord", force=True)
+    cmds.connectAttr(place2d + ".outUvFilterSize",
+                     file_node + ".uvFilterSize", force=True)
+
+    cmds.setAttr(file_node + ".fileTextureName", texture.path, type="string")
+    if texture.udim:
+        # 'UDIM (Mari)' tiling, preview quality
+        cmds.setAttr(file_node + ".uvTilingMode", 3)
+        cmds.setAttr(file_node + ".uvTileProxyQuality", 4)
+        if texture.color_space:
+            cmds.setAttr(file_node + ".colorSpace", texture.color_space,
+                         type="string")
+    return file_node
@@ -0,0 +1,191 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+'''
+@ author：huangsheng
+@ date: 2026/10/18 11:05
+@ description:
+    Version index of a work or publish folder.
+
+    The folder is listed with a single scandir and every file name is parsed
+    through the matching template (or a compiled pattern when no template is
+    configured). Indexes are cached per folder and rebuilt only when the
+    folder mtime changes, so next-version, max-version and exists queries
+    never stat the candidate files one by one.
+
+'''
+
+import os
+import re
+
+try:
+    from os import scandir
+except ImportError:
+    try:
+        from scandir import scandir
+    except ImportError:
+        scandir = None
+
+# fallback for folders without a template: name.v001.ext, name_v001.ext ...
+VERSION_PATTERN = re.compile(
+    r"^(?P<name>.+)[._-]v(?P<version>\d+)\.(?P<extension>\w+)$")
+
+# {(folder, parser key): (mtime, VersionIndex)}
+_indexes = {}
+
+
+class VersionIndex(object):
+    """
+    Versions found in one folder, grouped by the non-version fields.
+    """
+
+    def __init__(self, folder, template=None, pattern=None):
+        """
+        :param str folder: folder to index.
+        :param template: sgtk template the file names are parsed with.
+        :param pattern: compiled regex with a ``version`` group, used when no
+            template is given.
+        """
+        self.folder = folder
+        self._template = template
+        self._pattern = pattern or VERSION_PATTERN
+        self._names = set()
+        self._versions = {}
+        self._scan()
+
+    def exists(self, path):
+        """
+        Return True if ``path`` is a file of the indexed folder.
+        """
+        return os.path.basename(path) in self._names
+
+    def versions(self, fields=None):
+        """
+        Return the sorted versions matching ``fields``.
+
+        :param dict fields: fields of any version of the file, the version
+            itself is ignored. None returns the versions of all the files.
+        """
+        if fields is None:
+            found = set()
+            for versions in self._versions.values():
+                found.update(versions)
+            return sorted(found)
+        return sorted(self._versions.get(_version_key(fields), {}))
+
+    def max_version(self, fields=None):
+        """
+        Return ``(version, filename)`` of the highest version matching
+        ``fields``, ``(None, None)`` if there is none.
+        """
+        best = (None, None)
+        if fields is None:
+            groups = self._versions.values()
+        else:
+            groups = [self._versions.get(_version_key(fields), {})]
+        for versions in groups:
+            for version, filename in versions.items():
+                if best[0] is None or version > best[0]:
+                    best = (version, filename)
+        return best
+
+    def next_version(self, fields=None):
+        """
+        Return the version following the highest one matching ``fields``.
+        """
+        version = self.max_version(fields)[0]
+        return (version or 0) + 1
+
+    def next_version_path(self, path):
+        """
+        Return ``(path, version)`` of the version of ``path`` following the
+        highest one in the folder, ``(None, None)`` if the name of ``path``
+        can't be parsed.
+        """
+        name = os.path.basename(path)
+        fields = self._parse(name)
+        if not fields or fields.get("version") is None:
+            return (None, None)
+        version = self.next_version(fields)
+        if self._template is not None:
+            fields = dict(fields, version=version)
+            return (self._template.apply_fields(fields), version)
+        # keep the padding of the version in the name
+        match = self._pattern.match(name)
+        (start, end) = match.span("version")
+        name = "%s%0*d%s" % (name[:start], end - start, version, name[end:])
+        return (os.path.join(os.path.dirname(path), name), version)
+
+    def _scan(self):
+        for name in _list_files(self.folder):
+            self._names.add(name)
+            fields = self._parse(name)
+            if not fields or fields.get("version") is None:
+                continue
+            versions = self._versions.setdefault(_version_key(fields), {})
+            versions[int(fields["version"])] = name
+
+    def _parse(self, name):
+        if self._template is not None:
+            return self._template.validate_and_get_fields(
+                os.path.join(self.folder, name))
+        match = self._pattern.match(name)
+        if not match:
+            return None
+        return match.groupdict()
+
+
+def get_index(folder, template=None, pattern=None):
+    """
+    Return the cached :class:`VersionIndex` of ``folder``.
+
+    The index is rebuilt when the folder mtime changed since it was built.
+    A missing folder gives an empty index.
+    """
+    if template is not None:
+        parser_key = template.name
+    else:
+        parser_key = (pattern or VERSION_PATTERN).pattern
+    key = (os.path.normpath(folder), parser_key)
+
+    try:
+        mtime = os.stat(folder).st_mtime
+    except OSError:
+        mtime = None
+
+    cached = _indexes.get(key)
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    index = VersionIndex(folder, template, pattern)
+    _indexes[key] = (mtime, index)
+    return index
+
+
+def invalidate(folder=None):
+    """
+    Drop the cached indexes of ``folder``, or all of them.
+
+    Needed after writing into a folder on file systems with a coarse mtime
+    resolution.
+    """
+    if folder is None:
+        _indexes.clear()
+        return
+    folder = os.path.normpath(folder)
+    for key in list(_indexes):
+        if key[0] == folder:
+            del _indexes[key]
+
+
+def _version_key(fields):
+    return tuple(sorted(
+        (k, v) for (k, v) in fields.items() if k != "version"))
+
+
+def _list_files(folder):
+    try:
+        if scandir is None:
+            return os.listdir(folder)
+        return [entry.name for entry in scandir(folder) if entry.is_file()]
+    except OSError:
+        return []
@@ -0,0 +1,60 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+'''
+@ author：huangsheng
+@ date: 2026/10/29 10:00
+@ description:
+    Export of the xgen palettes, shared by the xgen publish plugin and the
+    export workers.
+
+'''
+
+import os
+import re
+
+
+def export_palette(collection, path, project_path, version, logger=None):
+    """
+    Export the palette ``collection`` to ``path`` and point it at the
+    published collection, see :func:`publish_paths`.
+    """
+    import maya.cmds as cmds
+
+    if not cmds.pluginInfo("xgenToolkit", query=True, loaded=True):
+        cmds.loadPlugin("xgenToolkit", quiet=True)
+    import xgenm as xg
+
+    folder = os.path.dirname(path)
+    if folder and not os.path.isdir(folder):
+        os.makedirs(folder)
+    xg.exportPalette(str(collection), path)
+    publish_paths(path, project_path, version, collection, logger)
+    return path
+
+
+def publish_paths(xgen, project_path, version, collection, logger=None):
+    """
+    Rewrite the project and data paths of the exported palette ``xgen`` from
+    the work area to the collection published with ``version``.
+    """
+    if logger:
+        logger.debug("replace_path:%s" % project_path)
+
+    new_data_path = ""
+    with open(xgen, "r") as f:
+        lines = f.readlines()
+    for i in range(len(lines)):
+        if re.search("xgProjectPath", lines[i]):
+            lines[i] = re.sub("/work/", "/publish/", lines[i])
+        if re.search("xgDataPath", lines[i]):
+            if not new_data_path:
+                sp = lines[i].split('/collections/')
+                new_data_path = '{dir}/collections/{version}/{col_name}\n'.format(
+                    dir=sp[0],
+                    version='v%03d' % int(version),
+                    col_name=collection
+                )
+                new_data_path = re.sub("/work/", "/publish/", new_data_path)
+            lines[i] = new_data_path
+    with open(xgen, "w") as f:
+        f.writelines(lines)
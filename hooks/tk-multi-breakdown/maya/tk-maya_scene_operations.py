@@ -13,6 +13,14 @@ import maya.cmds as cmds
 import pymel.core as pm
 import os
 import sgtk
+import sys
+
+current_dir = os.path.dirname(__file__)
+_hooks = os.path.dirname(os.path.dirname(current_dir))
+if _hooks not in sys.path:
+    sys.path.append(_hooks)
+from cfa_pipeline import publish_cache
+
 class BreakdownSceneOperations(Hook):
     """
     Breakdown operations for Maya.
@@ -49,8 +57,10 @@ class BreakdownSceneOperations(Hook):
             node_name = x.refNode.longName()
 
             # get the path and make it platform dependent
-            # (maya uses C:/style/paths)
-            maya_path = x.path.replace("/", os.path.sep)
+            # (maya uses C:/style/paths). local copies of the publish
+            # cache are reported as the publish
+            maya_path = publish_cache.source_path(x.path)
+            maya_path = maya_path.replace("/", os.path.sep)
             refs.append( {"node": node_name, "type": "reference", "path": maya_path})
 
         # now look at file texture nodes
@@ -19,7 +19,14 @@ import pymel.core as pm
 import maya.cmds as cmds
 import maya.mel as mel
 import sgtk
-import json
+import sys
+
+current_dir = os.path.dirname(__file__)
+_hooks = os.path.dirname(current_dir)
+if _hooks not in sys.path:
+    sys.path.append(_hooks)
+from cfa_pipeline import proxy_reference, render_presets, sg_mirror, \
+    texture_sets
 
 HookBaseClass = sgtk.get_hook_baseclass()
 class MayaActions(HookBaseClass):
@@ -76,6 +83,13 @@ class MayaActions(HookBaseClass):
                                       "caption": "Create Reference", 
                                       "description": "This will add the item to the scene as a standard reference."} )
 
+        if "proxy_reference" in actions:
+            action_instances.append( {"name": "proxy_reference",
+                                      "params": None,
+                                      "caption": "Create Proxy Reference",
+                                      "description": "This will add the item to the scene as an unloaded reference "
+                                                     "shown as a gpu cache or a bounding box."} )
+
         if "import" in actions:
             action_instances.append( {"name": "import", 
                                       "params": None,
@@ -137,12 +151,18 @@ class MayaActions(HookBaseClass):
 
         :param list actions: Action dictionaries.
         """
-        for single_action in actions:
-            name = single_action["name"]
-            print "action_name:",name
-            sg_publish_data = single_action["sg_publish_data"]
-            params = single_action["params"]
-            self.execute_action(name, params, sg_publish_data)
+        # light rig presets of the batch, applied once at the end
+        self._preset_dirs = []
+        try:
+            for single_action in actions:
+                name = single_action["name"]
+                print "action_name:",name
+                sg_publish_data = single_action["sg_publish_data"]
+                params = single_action["params"]
+                self.execute_action(name, params, sg_publish_data)
+        finally:
+            preset_dirs, self._preset_dirs = self._preset_dirs, None
+            self._load_render_presets(preset_dirs)
 
     def execute_action(self, name, params, sg_publish_data):
         """
@@ -166,6 +186,9 @@ class MayaActions(HookBaseClass):
         if name == "reference":
             self._create_reference(path, sg_publish_data)
 
+        if name == "proxy_reference":
+            self._create_proxy_reference(path, sg_publish_data)
+
         if name == "import":
             self._do_import(path, sg_publish_data)
         
@@ -184,24 +207,22 @@ class MayaActions(HookBaseClass):
         # update render setting
         from func import _shotgun_server,replace_special_character as rsc
 
-        sg = _shotgun_server._shotgun()
         task = sg_publish_data.get('task')
-        task_find = sg.find_one('Task', [['id', 'is', task.get('id')]], ['step'])
+        step = sg_mirror.task_step(_shotgun_server._shotgun,
+                                   _project_id(sg_publish_data), task.get('id'))
         import_preset_step = [150,155,7,144]
-        publish_file_step = task_find.get('step').get('id')
+        publish_file_step = step.get('id')
         if publish_file_step in import_preset_step:
             current_dir,filename = os.path.split(path)
             current_dir = rsc.replaceSpecialCharacter(current_dir)
             load_path = current_dir
             if 'lightRig' not in current_dir:
                 load_path = load_path + "/lightRig"
-            _files = os.listdir(load_path)
-            for _f in _files:
-                if _f.endswith('.json'):
-                    print _f
-                    preset_name = _f.split(".")[0]
-                    self._load_render_setting(preset_name,load_path)
-                    break
+            if getattr(self, "_preset_dirs", None) is not None:
+                # within a load batch
+                self._preset_dirs.append(load_path)
+            else:
+                self._load_render_presets([load_path])
         # udpate resolution
         update_resolution()
     ##############################################################################################################
@@ -230,10 +251,11 @@ class MayaActions(HookBaseClass):
         published_file_type = sg_publish_data.get('published_file_type').get('name')
         if published_file_type != "MAYA Camera":
             from func import _shotgun_server
-            sg = _shotgun_server._shotgun()
             task = sg_publish_data.get('task')
-            task_find = sg.find_one('Task',[['id','is',task.get('id')]],['step'])
-            if task_find.get('step').get('id') in import_step:
+            step = sg_mirror.task_step(_shotgun_server._shotgun,
+                                       _project_id(sg_publish_data),
+                                       task.get('id'))
+            if step.get('id') in import_step:
                 self._do_import(path,sg_publish_data)
                 return
         # no_namespace_step = [136,15]
@@ -274,6 +296,23 @@ class MayaActions(HookBaseClass):
             _hookup_shaders("XGSHADER_HOOKUP_","xgmDescription",str(collection))
             return
 
+    def _create_proxy_reference(self, path, sg_publish_data):
+        """
+        Create an unloaded reference with a gpu cache or bounding box
+        stand-in, swapped to the full reference on demand.
+
+        :param path: Path to file.
+        :param sg_publish_data: Shotgun data dictionary with all the standard publish fields.
+        :returns: The placement transform of the proxy
+        """
+        if not os.path.exists(path):
+            raise Exception("File not found on disk - '%s'" % path)
+
+        name = sg_publish_data.get('name')
+        namespace = (name.split(".")[0])
+        namespace = namespace.replace(" ", "_")
+        return proxy_reference.create(path, namespace)
+
     def _do_import(self, path, sg_publish_data):
         """
         Create a reference with the same settings Maya would use
@@ -390,52 +429,16 @@ class MayaActions(HookBaseClass):
         Create file texture nodes from texture folder
         :returns:       file nodes list
         """
-        _files = os.listdir(path)
-        full_file_name =[]
-        json_file = ''
-        other_file = []
-        for _file in _files:
-            _file_full_name = path + '\\' +_file
-            full_file_name.append(_file_full_name)
-            name,ext = os.path.splitext(_file_full_name)
-            if not ext:
-                other_file.append(_file_full_name)
-            elif ext == ".obj":
-                other_file.append(_file_full_name)
-            elif ext == ".mtl":
-                other_file.append(_file_full_name)
-            elif ext == '.json':
-                json_file = _file_full_name
-                other_file.append(json_file)
-            else:
-                continue
-        if not json_file:
+        textures = texture_sets.read_folder(path)
+        if not textures:
             return
-        for otf in other_file:
-            full_file_name.remove(otf)
-        with open(json_file,'r') as f:
-            _data = json.load(f)
-        texturesets = _data.get("texturesets")
-        if not texturesets:
-            return
-        k = texturesets.keys()[0]
-        try:
-            temp = int(k)
-            config = "UDIM"
-        except ValueError, e:
-            config = "Texture"
-        file_nodes = []
-        if config == "UDIM":
-            for image_file in full_file_name:
-                if re.match(".+(1001\.[a-z].+)", image_file):
-                    file_nodes.append(self._create_udim_texture_node(image_file,sg_publish_data))
-        elif config == "Texture":
-            for image_file in full_file_name:
-                file_nodes.append(self._create_texture_node_func(image_file,sg_publish_data))
+        file_nodes = texture_sets.create_file_nodes(textures)
+        # uv tile previews are built when maya is idle
+        texture_sets.queue_previews(
+            [node for (node, texture) in zip(file_nodes, textures)
+             if texture.udim])
         return file_nodes
 
-
-
     def _create_image_plane(self, path, sg_publish_data):
         """
         Create a file texture node for a UDIM (Mari) texture
@@ -501,9 +504,19 @@ class MayaActions(HookBaseClass):
                 self._maya_major_version = int(major_version_number_str)
         return self._maya_major_version
 
+    def _load_render_presets(self, preset_dirs):
+        """
+        Apply the render setting presets of the loaded light rigs, only the
+        attributes that differ from the scene are set.
+
+        :param list preset_dirs: light rig folders, in load order.
+        """
+        if preset_dirs:
+            render_presets.load(preset_dirs, self._load_render_setting,
+                                self.parent.logger)
+
     def _load_render_setting(self,preset_name,path):
         from __Maya.lighting._self import renderSettingManage
-        reload(renderSettingManage)
         renderSettingManage.load_render_setting(preset_name, path)
 
 
@@ -539,6 +552,13 @@ class MayaActions(HookBaseClass):
 #                     continue
 #                 cmds.select(node, replace=True)
 #                 cmds.hyperShade(assign=shader)
+
+
+def _project_id(sg_publish_data):
+    project = sg_publish_data.get('project') or {}
+    return project.get('id')
+
+
 def _shader_hookup_data(hookup_prefix):
     shader_hookups = {}  # {geo:shader}
     for node in cmds.ls(type="script"):
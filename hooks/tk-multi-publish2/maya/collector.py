@@ -8,13 +8,21 @@
 # agreement to the Shotgun Pipeline Toolkit Source Code License. All rights 
 # not expressly granted therein are reserved by Shotgun Software Inc.
 
-import glob
 import os
 import re
+import sys
 import maya.cmds as cmds
 import maya.mel as mel
 import sgtk
 from sgtk.util import shotgun
+
+current_dir = os.path.dirname(__file__)
+_hooks = os.path.dirname(os.path.dirname(current_dir))
+if _hooks not in sys.path:
+    sys.path.append(_hooks)
+from cfa_pipeline import alembic_batcher, camera_bake, collection_queue, \
+    frame_sequences, icon_cache, item_groups, resolve_cache, \
+    save_coordinator, sg_mirror
 HookBaseClass = sgtk.get_hook_baseclass()
 ISASSEMBLY = False
 class MayaSessionCollector(HookBaseClass):
@@ -57,6 +65,13 @@ class MayaSessionCollector(HookBaseClass):
                                "to publish plugins via the collected item's "
                                "properties. ",
             },
+            "Group Threshold": {
+                "type": "int",
+                "default": 50,
+                "description": "Meshes, cameras and uv maps are grouped "
+                               "under one collapsed item when there are more "
+                               "of them than this.",
+            },
         }
 
         # update the base settings with these settings
@@ -73,24 +88,30 @@ class MayaSessionCollector(HookBaseClass):
         :param parent_item: Root item instance
 
         """
-        path = cmds.file(query=True, sn=True)
+        # fresh publish-scoped helpers (resolve cache, save coordinator,
+        # alembic batcher, camera baker), shared by all the plugins
+        cache = resolve_cache.attach(parent_item)
+        save_coordinator.attach(parent_item)
+        alembic_batcher.attach(parent_item)
+        camera_bake.attach(parent_item)
+        path = cache.session_path()
         if not path:
             em = "Please save the scene first."
             self.logger.error(em)
             raise Exception(em)
         filename = os.path.basename(path)
+        self._group_threshold = settings["Group Threshold"].value
         isProxy = False
         if "RSProxyRig" in filename:
             isProxy = True
 
-        # create an item representing the current maya session
+        # create an item representing the current maya session, first so
+        # that there is something to show right away
         item = self.collect_current_maya_session(settings, parent_item)
         project_root = item.properties["project_root"]
         context = item.context
         # self.logger.debug("collector:session----%s----" % context)
         self.logger.debug("collector:session----%s----" % context.task)
-        # look at the render layers to find rendered images on disk
-        self.collect_rendered_images(item)
         step_id = context.step.get('id')
         # self.logger.debug("step_id:---%s---" % step_id)
         # if we can determine a project root, collect other files to publish
@@ -105,11 +126,6 @@ class MayaSessionCollector(HookBaseClass):
                     }
                 }
             )
-            # self.collect_playblasts(item, project_root)
-            if step_id == 138:
-                self._collect_xgen(item, project_root)
-                self._collect_xgen_shader(item)
-                self._collect_xgen_geometry(item)
         else:
             self.logger.info(
                 "Could not determine the current Maya project.",
@@ -122,31 +138,51 @@ class MayaSessionCollector(HookBaseClass):
                 }
             )
 
+        # the other collectors run cheapest first, disk and shotgun backed
+        # ones last. cancelling keeps what was collected so far.
+        queue = collection_queue.CollectionQueue(self.logger)
+        SCENE = collection_queue.SCENE
+        SCENE_HEAVY = collection_queue.SCENE_HEAVY
+        DISK = collection_queue.DISK
+
         if step_id in [106,35]:
-            self._collect_cameras(item)
+            queue.add("cameras", SCENE, self._collect_cameras, item)
+        if step_id in [143]:
+            queue.add("sim curves", SCENE, self._collect_simcrv, item)
+        queue.add("light rig", SCENE, self._collect_lightrig, item)
         if step_id in[15]:
             if not isProxy:
-                self._collect_meshes(item)
+                queue.add("meshes", SCENE_HEAVY, self._collect_meshes, item)
         # if step_id in [14,15]:
         #     self._collect_assembly(item)
         if step_id in [16,136]:
-            self._collect_fbx_geometry(item)
+            queue.add("fbx geometry", SCENE_HEAVY,
+                      self._collect_fbx_geometry, item)
             # self._collect_uvmap(item)
-        if step_id in [143]:
-            self._collect_simcrv(item)
-        self._collect_lightrig(item)
         # print "ISASSEMBLY:",ISASSEMBLY
         if step_id not in [138,150,155]:
             if cmds.ls(geometry=True, noIntermediate=True):
                 # if not ISASSEMBLY:
                 if not isProxy:
-                    self._collect_session_geometry(item)
+                    queue.add("session geometry", SCENE,
+                              self._collect_session_geometry, item)
         if project_root:
+            # self.collect_playblasts(item, project_root)
+            if step_id == 138:
+                # kept together and in this order, the palette is published
+                # before its shaders and geometry
+                queue.add("xgen", DISK, self._collect_xgen, item, project_root)
+                queue.add("xgen shaders", DISK,
+                          self._collect_xgen_shader, item)
+                queue.add("xgen geometry", DISK,
+                          self._collect_xgen_geometry, item)
             # if not ISASSEMBLY:
             if not isProxy:
-                self.collect_alembic_caches(item, project_root)
-
-
+                queue.add("alembic caches", DISK,
+                          self.collect_alembic_caches, item, project_root)
+        # look at the render layers to find rendered images on disk
+        queue.add("rendered images", DISK, self.collect_rendered_images, item)
+        queue.run()
 
     def collect_current_maya_session(self, settings, parent_item):
         """
@@ -160,7 +196,7 @@ class MayaSessionCollector(HookBaseClass):
         publisher = self.parent
 
         # get the path to the current file
-        path = cmds.file(query=True, sn=True)
+        path = resolve_cache.get(parent_item).session_path()
 
         # determine the display name for the item
         if path:
@@ -195,8 +231,8 @@ class MayaSessionCollector(HookBaseClass):
         work_template_setting = settings.get("Work Template")
         if work_template_setting:
 
-            work_template = publisher.engine.get_template_by_name(
-                work_template_setting.value)
+            work_template = resolve_cache.get(parent_item).template(
+                publisher.engine, work_template_setting.value)
 
             # store the template on the item for use by publish plugins. we
             # can't evaluate the fields here because there's no guarantee the
@@ -254,9 +290,11 @@ class MayaSessionCollector(HookBaseClass):
         scene_data = shotgun_func.getSceneSGData()
         current_id = scene_data.get('entity').get('id')
         current_entity_type = scene_data.get('entity').get('type')
-        sg = _shotgun_server._shotgun()
-        publish_files = sg.find("PublishedFile", [['entity.%s.id'%current_entity_type, 'is', current_id]],
-                                ['published_file_type', 'path'])
+        project_id = (scene_data.get('project') or {}).get('id')
+        publish_files = sg_mirror.published_files(_shotgun_server._shotgun,
+                                                  project_id,
+                                                  current_entity_type,
+                                                  current_id)
         abc_publish_files = []
         for pf in publish_files:
             if pf.get('published_file_type').get('name') == "Alembic Cache":
@@ -404,7 +442,7 @@ class MayaSessionCollector(HookBaseClass):
         :param parent_item: Parent Item instance
         :return:
         """
-        scene = cmds.file(q=True, sn=True)
+        scene = resolve_cache.get(parent_item).session_path()
         basename = os.path.basename(scene)
         _name, ext = os.path.splitext(basename)
         work_dir = cmds.workspace(q=True, sn=True)
@@ -412,8 +450,6 @@ class MayaSessionCollector(HookBaseClass):
 
         # get a list of render layers not defined in the file
         render_layers = []
-        _render = cmds.getAttr("defaultRenderGlobals.currentRenderer")
-        # _prefix = cmds.getAttr("vraySettings.fileNamePrefix")
         for layer_node in cmds.ls(type="renderLayer"):
             try:
                 # if this succeeds, the layer is defined in a referenced file
@@ -422,42 +458,57 @@ class MayaSessionCollector(HookBaseClass):
                 # runtime error means the layer is defined in this session
                 render_layers.append(layer_node)
 
+        # the v-ray prefix is read once, from its settings node. the node
+        # only exists once the render settings were opened for v-ray, the
+        # generic render settings are used without it.
+        _image_format = None
+        _render = cmds.getAttr("defaultRenderGlobals.currentRenderer")
+        if _render == "vray" and cmds.objExists("vraySettings"):
+            fileprefix = cmds.getAttr('vraySettings.fileNamePrefix')
+            if fileprefix == '<Scene>/<Layer>/<Scene>':
+                _image_format = cmds.getAttr("vraySettings.imageFormatStr")
+
         # iterate over defined render layers and query the render settings for
         # information about a potential render
         for layer in render_layers:
 
             self.logger.info("Processing render layer: %s" % (layer,))
 
-            # use the render settings api to get a path where the frame number
-            # spec is replaced with a '*' which we can use to glob
-            (frame_glob,) = cmds.renderSettings(
-                genericFrameImageName="*",
-                fullPath=True,
-                layer=layer
-            )
-            if _render == "vray":
-                try:
-
-                    mel.eval("unifiedRenderGlobalsWindow;")
-                    cmds.workspaceControl("unifiedRenderGlobalsWindow", e=True, vis=0, r=True)
-                    fileprefix = cmds.getAttr('vraySettings.fileNamePrefix')
-                    _image_format = cmds.getAttr("vraySettings.imageFormatStr")
-                    if fileprefix == '<Scene>/<Layer>/<Scene>':
-                        image_file = image_dir + '/' + _name + '/' + layer + '/' + _name + '*.%s'%_image_format
-                        frame_glob = image_file
-                except:
-                    pass
-            # see if there are any files on disk that match this pattern
-            rendered_paths = glob.glob(frame_glob)
-            self.logger.debug( "rendered_paths: ----%s----"%rendered_paths)
-            if rendered_paths:
-                # we only need one path to publish, so take the first one and
-                # let the base class collector handle it
+            if _image_format:
+                frame_glob = image_dir + '/' + _name + '/' + layer + '/' + \
+                    _name + '*.%s' % _image_format
+            else:
+                # use the render settings api to get a path where the frame
+                # number spec is replaced with a '*'
+                (frame_glob,) = cmds.renderSettings(
+                    genericFrameImageName="*",
+                    fullPath=True,
+                    layer=layer
+                )
+
+            # the frame sequences on disk that match this pattern, the image
+            # directory is read once for all its layers and sequences
+            sequences = frame_sequences.find(frame_glob)
+            self.logger.debug("rendered sequences: ----%s----" % sequences)
+            if sequences:
+                # we only need one sequence to publish, let the base class
+                # collector handle its first frame
+                sequence = sequences[0]
                 item = super(MayaSessionCollector, self)._collect_file(
                     parent_item,
-                    rendered_paths[0],
+                    sequence.path(sequence.first),
                     frame_sequence=True
                 )
+                item.properties["sequence_paths"] = sequence.paths()
+                item.properties["frame_range"] = (sequence.first,
+                                                  sequence.last)
+                item.properties["missing_frames"] = sequence.missing
+                if item.properties["missing_frames"]:
+                    self.logger.warning(
+                        "Render layer %s is missing %d frame(s) between %d "
+                        "and %d." % (layer, len(sequence.missing),
+                                     sequence.first, sequence.last)
+                    )
 
                 # the item has been created. update the display name to include
                 # the an indication of what it is and why it was collected
@@ -465,6 +516,10 @@ class MayaSessionCollector(HookBaseClass):
                 item._expanded = False
                 item._active = False
 
+    def _threshold(self):
+        # number of items of one kind above which they are grouped
+        return getattr(self, "_group_threshold", 50)
+
     def _collect_meshes(self, parent_item):
         """
         Collect mesh definitions and create publish items for them.
@@ -476,49 +531,22 @@ class MayaSessionCollector(HookBaseClass):
         # location refers to the path of this hook file. this means that
         # the icon should live one level above the hook in an "icons"
         # folder.
-        icon_path = os.path.join(
-            self.disk_location,
-            os.pardir,
-            "icons",
-            "mesh.png"
-        )
+        icon_path = icon_cache.icon_path(self.disk_location, "mesh.png")
 
-        # iterate over all top-level transforms and create mesh items
-        # for any mesh.
         context = parent_item.context
+        # if step is shading , active is True.
+        active = context.step.get('id') == 15
 
-        for object in cmds.ls(assemblies=True):
-
-            if not cmds.ls(object, dag=True, type="mesh"):
-                # ignore non-meshes
-                continue
-
-            # create a new item parented to the supplied session item. We
-            # define an item type (maya.session.mesh) that will be
-            # used by an associated shader publish plugin as it searches for
-            # items to act upon. We also give the item a display type and
-            # display name (the group name). In the future, other publish
-            # plugins might attach to these mesh items to publish other things
-
+        # iterate over all top-level transforms and create mesh items
+        # for any mesh. items of type maya.session.mesh are used by the
+        # shader publish plugin. In the future, other publish plugins might
+        # attach to these mesh items to publish other things
+        group = item_groups.ItemGroup(
+            "maya.session.mesh", "Shader", icon_path, self._threshold())
+        for object in item_groups.top_level_with("mesh"):
             # object = object.replace(":","_")
-            mesh_item = parent_item.create_item(
-                "maya.session.mesh",
-                "Shader",
-                object
-            )
-
-            # set the icon for the item
-            mesh_item.set_icon_from_path(icon_path)
-
-            # finally, add information to the mesh item that can be used
-            # by the publish plugin to identify and export it properly
-            mesh_item.properties["object"] = object
-
-            mesh_item._expanded = False
-            mesh_item._active = False
-            # if step is shading , active is True.
-            if context.step.get('id') == 15:
-                mesh_item._active = True
+            group.add(object, {"object": object}, active=active)
+        group.create_items(parent_item, "Shaders")
 
     def _collect_cameras(self, parent_item):
         """
@@ -533,14 +561,12 @@ class MayaSessionCollector(HookBaseClass):
         # folder.
 
         self.logger.debug("Camera publish...")
-        icon_path = os.path.join(
-            self.disk_location,
-            os.pardir,
-            "icons",
-            "camera.png"
-        )
+        icon_path = icon_cache.icon_path(self.disk_location, "camera.png")
 
-        # iterate over each camera and create an item for it
+        # iterate over each camera and create an item for it. items of type
+        # maya.session.camera are used by the camera publish plugin
+        group = item_groups.ItemGroup(
+            "maya.session.camera", "Camera", icon_path, self._threshold())
         for camera_shape in cmds.ls(cameras=True):
 
             # try to determine the camera display name
@@ -550,61 +576,40 @@ class MayaSessionCollector(HookBaseClass):
                 # could not determine the name, just use the shape
                 camera_name = camera_shape
 
-            # create a new item parented to the supplied session item. We
-            # define an item type (maya.session.camera) that will be
-            # used by an associated camera publish plugin as it searches for
-            # items to act upon. We also give the item a display type and
-            # display name. In the future, other publish plugins might attach to
-            # these camera items to perform other actions
-            cam_item = parent_item.create_item(
-                "maya.session.camera",
-                "Camera",
-                camera_name
-            )
-
-            # set the icon for the item
-            cam_item.set_icon_from_path(icon_path)
-
             # store the camera name so that any attached plugin knows which
             # camera this item represents!
-            cam_item.properties["camera_name"] = camera_name
-            cam_item.properties["camera_shape"] = camera_shape
-
+            group.add(camera_name, {
+                "camera_name": camera_name,
+                "camera_shape": camera_shape,
+            }, expanded=True)
+        group.create_items(parent_item, "Cameras")
 
     def _collect_uvmap(self,parent_item):
 
         # if the step is uv ,display these items
 
         self.logger.info("uv map publish...")
-        icon_path = os.path.join(
-            self.disk_location,
-            os.pardir,
-            "icons",
-            "uvmap.png"
-        )
+        icon_path = icon_cache.icon_path(self.disk_location, "uvmap.png")
 
         objects = set()
+        # parents of all the meshes, in one query
         meshs = cmds.ls(type="mesh")
-        for m in meshs:
-            parent = cmds.listRelatives(m, p=True)[0]
+        parents = cmds.listRelatives(meshs, p=True) if meshs else None
+        for parent in parents or []:
             # parent = parent.replace(":", "_")
             # parent = parent.replace("_", "")
             objects.add(parent)
 
+        group = item_groups.ItemGroup(
+            "maya.session.uvmap", "UVMap", icon_path, self._threshold())
         for obj in objects:
-            uv_item = parent_item.create_item(
-                "maya.session.uvmap",
-                "UVMap",
-                obj
-            )
-
-            uv_item.set_icon_from_path(icon_path)
-            uv_item.properties["uvmap_name"] = obj
             file_name = obj.replace(":","_")
-            uv_item.properties["uvmap_file_name"] = file_name
-
-            uv_item._expanded = False
+            group.add(obj, {
+                "uvmap_name": obj,
+                "uvmap_file_name": file_name,
+            })
             # uv_item._active = False
+        group.create_items(parent_item, "UV Maps")
 
     def _collect_xgen(self,parent_item, project_root):
 
@@ -741,49 +746,20 @@ class MayaSessionCollector(HookBaseClass):
         :param parent_item: Parent Item instance
         """
         self.logger.debug('fbx collector...')
-        icon_path = os.path.join(
-            self.disk_location,
-            os.pardir,
-            "icons",
-            "fbx.jpg"
-        )
+        icon_path = icon_cache.icon_path(self.disk_location, "fbx.jpg")
 
         # iterate over all top-level transforms and create mesh items
-        # for any mesh.
-
-        for object in cmds.ls(assemblies=True):
-
-            if not cmds.ls(object, dag=True, type="mesh"):
-                # ignore non-meshes
-                continue
-            print "object is %s:",object
-
-            # create a new item parented to the supplied session item. We
-            # define an item type (maya.session.mesh) that will be
-            # used by an associated shader publish plugin as it searches for
-            # items to act upon. We also give the item a display type and
-            # display name (the group name). In the future, other publish
-            # plugins might attach to these mesh items to publish other things
-
+        # for any mesh. items of type maya.fbx.geometry are used by the
+        # fbx geometry publish plugin
+        group = item_groups.ItemGroup(
+            "maya.fbx.geometry", "FBXGeometry", icon_path, self._threshold())
+        for object in item_groups.top_level_with("mesh"):
             # object = object.replace(":","_")
-            mesh_item = parent_item.create_item(
-                "maya.fbx.geometry",
-                "FBXGeometry",
-                object
-            )
-
-            # set the icon for the item
-            mesh_item.set_icon_from_path(icon_path)
-
-            # finally, add information to the mesh item that can be used
-            # by the publish plugin to identify and export it properly
-            mesh_item.properties["object"] = object
-
-            mesh_item._expanded = False
-            mesh_item._active = True
+            group.add(object, {"object": object}, active=True)
             # if step is shading , active is True.
             # if context.step.get('id') in [16,136]:
             #     mesh_item._active = True
+        group.create_items(parent_item, "FBX Geometry")
 
     def _collect_lightrig(self,parent_item):
         self.logger.debug('lightrig collector...')
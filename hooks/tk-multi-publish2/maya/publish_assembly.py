@@ -15,6 +15,13 @@ import maya.cmds as cmds
 import maya.mel as mel
 import sgtk
 
+current_dir = os.path.dirname(__file__)
+_hooks = os.path.dirname(os.path.dirname(current_dir))
+if _hooks not in sys.path:
+    sys.path.append(_hooks)
+from cfa_pipeline import maya_formats, proxy_publish, resolve_cache, \
+    scene_slimming
+
 HookBaseClass = sgtk.get_hook_baseclass()
 
 
@@ -81,6 +88,9 @@ class MayaAssemblyPublishPlugin(HookBaseClass):
 
         # update the base settings
         base_settings.update(maya_publish_settings)
+        base_settings.update(maya_formats.SETTINGS)
+        base_settings.update(scene_slimming.SETTINGS)
+        base_settings.update(proxy_publish.SETTINGS)
 
         return base_settings
 
@@ -135,7 +145,8 @@ class MayaAssemblyPublishPlugin(HookBaseClass):
             accepted = False
 
         # ensure the publish template is defined and valid and that we also have
-        publish_template = publisher.get_template_by_name(template_name)
+        publish_template = resolve_cache.get(item).template(
+            publisher, template_name)
         if not publish_template:
             self.logger.debug(
                 "The valid publish template could not be determined for the "
@@ -160,7 +171,8 @@ class MayaAssemblyPublishPlugin(HookBaseClass):
         }
 
     def validate(self, settings, item):
-        path = _session_path()
+        cache = resolve_cache.get(item)
+        path = cache.session_path()
         # ---- ensure the session has been saved
 
         if not path:
@@ -176,7 +188,7 @@ class MayaAssemblyPublishPlugin(HookBaseClass):
         # get the normalized path. checks that separators are matching the
         # current operating system, removal of trailing separators and removal
         # of double separators, etc.
-        path = sgtk.util.ShotgunPath.normalize(path)
+        path = cache.normalized_session_path()
 
         assembly_str = item.properties["assemblyName"]
         if not assembly_str:
@@ -199,7 +211,7 @@ class MayaAssemblyPublishPlugin(HookBaseClass):
         work_template = item.parent.properties.get("work_template")
         publish_template = item.properties.get("publish_template")
         self.logger.debug("work_template:---%s"%work_template)
-        work_fields = work_template.get_fields(path)
+        work_fields = cache.fields(work_template, path)
         object_display = re.sub(r'[\W_]+', '', (assembly_objects[0] + '...'))
         work_fields["name"] = object_display
 
@@ -223,8 +235,9 @@ class MayaAssemblyPublishPlugin(HookBaseClass):
 
         # create the publish path by applying the fields. store it in the item's
         # properties. Also set the publish_path to be explicit.
+        maya_formats.apply_format(settings, work_fields)
         self.logger.debug("work_fields:--%s"%work_fields)
-        item.properties["path"] = publish_template.apply_fields(work_fields)
+        item.properties["path"] = cache.apply_fields(publish_template, work_fields)
         item.properties["publish_path"] = item.properties["path"]
 
         # use the work file's version number when publishing
@@ -258,8 +271,8 @@ class MayaAssemblyPublishPlugin(HookBaseClass):
         assembly_objects = assembly_str.split(";")
 
         try:
-            cmds.select(assembly_objects,r = True)
-            cmds.file(publish_path, force=True, options="v=0", typ="mayaAscii", pr=True, es=True)
+            scene_slimming.export(self, settings, item, publish_path,
+                                  assembly_objects, preserveReferences=True)
         except Exception, e:
             self.logger.error("Failed to export assembly: %s" % e)
             return
@@ -270,18 +283,22 @@ class MayaAssemblyPublishPlugin(HookBaseClass):
         # Now that the path has been generated, hand it off to the
         super(MayaAssemblyPublishPlugin, self).publish(settings, item)
 
+        # gpu cache, lod and bounding box, written by a worker
+        proxy_publish.submit(self, settings, item, assembly_objects)
 
-def _session_path():
-    """
-    Return the path to the current session
-    :return:
-    """
-    path = cmds.file(query=True, sn=True)
+    def finalize(self, settings, item):
+        """
+        Execute the finalization pass, then queue the proxies of the
+        publish in one job.
 
-    if isinstance(path, unicode):
-        path = path.encode("utf-8")
+        :param settings: Dictionary of Settings. The keys are strings, matching
+            the keys returned in the settings property. The values are `Setting`
+            instances.
+        :param item: Item to process
+        """
+        super(MayaAssemblyPublishPlugin, self).finalize(settings, item)
+        proxy_publish.flush(item, self.logger)
 
-    return path
 
 
 def _get_save_as_action():
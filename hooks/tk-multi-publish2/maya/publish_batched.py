@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+'''
+@ author：huangsheng
+@ date: 2026/10/28 10:00
+@ description:
+    Chained between the publisher's ``publish_file.py`` and the maya plugins
+    publishing many items: the registrations of the publish pass are queued
+    and written batched by the first finalize, see
+    ``cfa_pipeline.publish_batcher``. The published files are checksummed in
+    the background meanwhile, see ``cfa_pipeline.checksum``.
+
+'''
+
+import os
+import sys
+
+import sgtk
+
+current_dir = os.path.dirname(__file__)
+_hooks = os.path.dirname(os.path.dirname(current_dir))
+if _hooks not in sys.path:
+    sys.path.append(_hooks)
+from cfa_pipeline import checksum, item_groups, publish_batcher
+
+HookBaseClass = sgtk.get_hook_baseclass()
+
+
+class BatchedPublishPlugin(HookBaseClass):
+    """
+    Base publish plugin registering the PublishedFiles at finalize, in
+    batches.
+    """
+
+    @property
+    def settings(self):
+        """
+        The base class settings, "Batch Registration" and "Checksum Field".
+        """
+        plugin_settings = super(BatchedPublishPlugin, self).settings or {}
+        plugin_settings.update({
+            "Batch Registration": {
+                "type": "bool",
+                "default": True,
+                "description": "Register the publishes at finalize with "
+                               "batched requests instead of one request "
+                               "per item.",
+            },
+        })
+        plugin_settings.update(checksum.SETTINGS)
+        return plugin_settings
+
+    def publish(self, settings, item):
+        """
+        Queue the registration of the publish of ``item``.
+
+        :param settings: Dictionary of Settings. The keys are strings, matching
+            the keys returned in the settings property. The values are `Setting`
+            instances.
+        :param item: Item to process
+        """
+        # grouped items depend on the publish above their group
+        item_groups.inherit_publish_data(item)
+        if "Batch Registration" in settings and \
+                not settings["Batch Registration"].value:
+            super(BatchedPublishPlugin, self).publish(settings, item)
+            checksum.attach_publish(self, settings, item)
+            return
+        publish_batcher.get(item).add(self, settings, item)
+
+    def finalize(self, settings, item):
+        """
+        Register the queued publishes of the session, then finalize ``item``.
+
+        :param settings: Dictionary of Settings. The keys are strings, matching
+            the keys returned in the settings property. The values are `Setting`
+            instances.
+        :param item: Item to process
+        :raises RuntimeError: if the publish of ``item`` was not registered.
+        """
+        batcher = publish_batcher.get(item)
+        batcher.flush(self.logger)
+        error = batcher.error(item)
+        if error is not None:
+            raise RuntimeError("Publish of %s not registered: %s" % (
+                self.get_publish_path(settings, item), error))
+        super(BatchedPublishPlugin, self).finalize(settings, item)
@@ -10,12 +10,20 @@
 
 import fnmatch
 import os
+import sys
 
 import maya.cmds as cmds
 import maya.mel as mel
 
 import sgtk
 
+current_dir = os.path.dirname(__file__)
+_hooks = os.path.dirname(os.path.dirname(current_dir))
+if _hooks not in sys.path:
+    sys.path.append(_hooks)
+from cfa_pipeline import alembic_batcher, alembic_profiles, camera_bake, \
+    checksum, item_groups, maya_formats, resolve_cache, scene_slimming
+
 # this method returns the evaluated hook base class. This could be the Hook
 # class defined in Toolkit core or it could be the publisher app's base publish
 # plugin class as defined in the configuration.
@@ -105,11 +113,21 @@ class MayaCameraPublishPlugin(HookBaseClass):
                 "default": ["camera*"],
                 "description": "Glob-style list of camera names to publish. "
                                "Example: ['camMain', 'camAux*']."
+            },
+            "Alembic Camera": {
+                "type": "bool",
+                "default": False,
+                "description": "Also publish a baked alembic camera. The "
+                               "alembic cameras of a publish are written by "
+                               "one AbcExport."
             }
         }
 
         # update the base settings
         plugin_settings.update(maya_camera_publish_settings)
+        plugin_settings.update(maya_formats.SETTINGS)
+        plugin_settings.update(scene_slimming.SETTINGS)
+        plugin_settings.update(checksum.SETTINGS)
 
         return plugin_settings
 
@@ -215,7 +233,8 @@ class MayaCameraPublishPlugin(HookBaseClass):
             return {"accepted": False}
 
         # ensure the publish template is defined and valid and that we also have
-        publish_template = publisher.get_template_by_name(template_name)
+        publish_template = resolve_cache.get(item).template(
+            publisher, template_name)
         if publish_template:
             item.properties["publish_template"] = publish_template
             # because a publish template is configured, disable context change.
@@ -263,7 +282,8 @@ class MayaCameraPublishPlugin(HookBaseClass):
 
         :returns: True if item is valid, False otherwise.
         """
-        path = _session_path()
+        cache = resolve_cache.get(item)
+        path = cache.session_path()
         publisher = self.parent
         print 'tk:', publisher.sgtk
         # ---- ensure the session has been saved
@@ -279,7 +299,7 @@ class MayaCameraPublishPlugin(HookBaseClass):
             raise Exception(error_msg)
 
         # get the normalized path
-        path = sgtk.util.ShotgunPath.normalize(path)
+        path = cache.normalized_session_path()
 
         cam_name = item.properties["camera_name"]
 
@@ -300,7 +320,7 @@ class MayaCameraPublishPlugin(HookBaseClass):
 
         # get the current scene path and extract fields from it using the work
         # template:
-        work_fields = work_template.get_fields(path)
+        work_fields = cache.fields(work_template, path)
 
         # include the camera name in the fields
         # work_fields["name"] = cam_name
@@ -317,7 +337,8 @@ class MayaCameraPublishPlugin(HookBaseClass):
         # create the publish path by applying the fields. store it in the item's
         # properties. This is the path we'll create and then publish in the base
         # publish plugin. Also set the publish_path to be explicit.
-        publish_path = publish_template.apply_fields(work_fields)
+        maya_formats.apply_format(settings, work_fields)
+        publish_path = cache.apply_fields(publish_template, work_fields)
         item.properties["path"] = publish_path
         item.properties["publish_path"] = publish_path
 
@@ -326,7 +347,12 @@ class MayaCameraPublishPlugin(HookBaseClass):
             item.properties["publish_version"] = work_fields["version"]
 
         # run the base class validation
-        return super(MayaCameraPublishPlugin, self).validate(settings, item)
+        valid = super(MayaCameraPublishPlugin, self).validate(settings, item)
+
+        # queue the alembic camera, the queued cameras are exported together
+        if valid and settings["Alembic Camera"].value:
+            self._queue_abc_camera(item)
+        return valid
 
     def publish(self, settings, item):
         """
@@ -341,6 +367,9 @@ class MayaCameraPublishPlugin(HookBaseClass):
         :param item: The :class:`~.processing.Item` instance to validate.
         """
 
+        # grouped cameras depend on the publish above their group
+        item_groups.inherit_publish_data(item)
+
         # keep track of everything currently selected. we will restore at the
         # end of the publish method
         
@@ -364,11 +393,12 @@ class MayaCameraPublishPlugin(HookBaseClass):
         long_name = cmds.ls(camera_name, l=True)[0]
         top_parent = long_name[1:].split("|")[0]
         try:
-            cmds.select(top_parent, r=True)
-            cmds.file(publish_path, force=True, options="v=0", typ="mayaAscii", pr=True, es=True)
+            scene_slimming.export(self, settings, item, publish_path,
+                                  top_parent, preserveReferences=True)
         except Exception, e:
             self.logger.error("Failed to export camera: %s" % e)
             return
+        checksum.submit(self, settings, item, publish_path)
         # print cam_export_cmd
         # set the publish type in the item's properties. the base plugin will
         # use this when registering the file with Shotgun
@@ -379,59 +409,73 @@ class MayaCameraPublishPlugin(HookBaseClass):
 
         # Now that the path has been generated, hand it off to the
         super(MayaCameraPublishPlugin, self).publish(settings, item)
-        # publish abc camera
-        #self.publish_abc_camera(settings,item)
+        # publish abc camera, the maya camera hashes meanwhile
+        if settings["Alembic Camera"].value:
+            self.publish_abc_camera(settings, item)
+        checksum.attach_publish(self, settings, item, publish_path)
         # restore selection
         cmds.select(cur_selection)
-    def publish_abc_camera(self,settings, item):
-
-        # the camera to publish
-        cam_shape = item.properties["camera_shape"]
-
-        # make sure it is selected
-        cmds.select(cam_shape)
+    def publish_abc_camera(self, settings, item):
 
         # get the path to create and publish
         publish_path = item.properties["publish_path"]
 
-        # ensure the publish folder exists:
-        publish_folder = os.path.dirname(publish_path)
-        self.parent.ensure_folder_exists(publish_folder)
-
-        # get camera frame range
-        camera_name = item.properties['camera_name']
-        # long_name = cmds.ls(camera_name, l=True)[0]
-        # top_parent = long_name[1:].split("|")[0]
-        min,max = _find_scene_animation_range()
-        # fbx_export_cmd = 'FBXExport -f "%s" -s' % (publish_path.replace(os.path.sep, "/"),)
-        # print "publish path:",publish_path.replace(os.path.sep, "/")
-        from func import replace_special_character as rsc
-        from __Maya.animation import exportAbcCamera
-        reload(exportAbcCamera)
-        camera_path = rsc.replaceSpecialCharacter(publish_path)
-        camera_path = os.path.splitext(camera_path)[0] + '.abc'
-        publish_camera = exportAbcCamera.copyBakeCamera(camera_name)
-        cam_export_cmd = 'AbcExport -j "-frameRange {min} {max} -dataFormat ogawa -root {name} -file {file}";'.format(
-            min=min,
-            max=max,
-            name=publish_camera,
-            file=camera_path
-        )
-
-        # ...and execute it:
+        # writes every queued alembic camera on first call
+        batcher = alembic_batcher.get(item)
+        if not batcher.has_job(publish_path):
+            self._queue_abc_camera(item)
         try:
-            self.logger.debug("Executing command: %s" % cam_export_cmd)
-            mel.eval(cam_export_cmd)
-            cmds.delete(publish_camera)
+            camera_path = batcher.export(publish_path)
         except Exception, e:
             self.logger.error("Failed to export camera: %s" % e)
             return
-
+        checksum.submit(self, settings, item, camera_path)
+
+        # register the alembic as its own publish, then restore the maya
+        # camera publish data on the item
+        maya_path = item.properties["path"]
+        maya_publish_data = item.properties.get("sg_publish_data")
+        item.properties["path"] = camera_path
+        item.properties["publish_path"] = camera_path
         item.properties["publish_type"] = "ABC Camera"
-        # item.properties["publish_type"] = "MAYA Camera"
+        try:
+            super(MayaCameraPublishPlugin, self).publish(settings, item)
+            checksum.attach_publish(self, settings, item, camera_path)
+        finally:
+            item.properties["path"] = maya_path
+            item.properties["publish_path"] = publish_path
+            item.properties["publish_type"] = "MAYA Camera"
+            item.properties["sg_publish_data"] = maya_publish_data
+
+    def _queue_abc_camera(self, item):
+        """
+        Queue the alembic export of the camera of ``item``. The queued
+        cameras are baked together in one timeline pass right before the
+        batched export, each baked camera is deleted after it.
+        """
+        from func import replace_special_character as rsc
 
-        # Now that the path has been generated, hand it off to the
-        super(MayaCameraPublishPlugin, self).publish(settings, item)
+        camera_name = item.properties['camera_name']
+        camera_path = rsc.replaceSpecialCharacter(item.properties["publish_path"])
+        camera_path = os.path.splitext(camera_path)[0] + '.abc'
+        min,max = _find_scene_animation_range()
+        # the baked camera is created at export time, it is always exported
+        # over the whole range
+        step = item.context.step or {}
+        profile = alembic_profiles.get_profile(item.type, step.get("id"))
+        baker = camera_bake.get(item)
+        alembic_batcher.get(item).add(
+            item.properties["publish_path"],
+            lambda: baker.baked(camera_name, min, max),
+            camera_path,
+            min,
+            max,
+            flags=alembic_profiles.job_flags(profile),
+            cleanup=cmds.delete,
+            item=item,
+            # only the exported cameras are baked, in one pass
+            prepare=lambda: baker.add(camera_name)
+        )
 
     def _cam_name_matches_settings(self, cam_name, settings):
         """
@@ -454,18 +498,6 @@ class MayaCameraPublishPlugin(HookBaseClass):
         return False
 
 
-def _session_path():
-    """
-    Return the path to the current session
-    :return:
-    """
-    path = cmds.file(query=True, sn=True)
-
-    if isinstance(path, unicode):
-        path = path.encode("utf-8")
-
-    return path
-
 
 def _get_save_as_action():
     """
@@ -15,6 +15,12 @@ import maya.cmds as cmds
 import maya.mel as mel
 import sgtk
 
+current_dir = os.path.dirname(__file__)
+_hooks = os.path.dirname(os.path.dirname(current_dir))
+if _hooks not in sys.path:
+    sys.path.append(_hooks)
+from cfa_pipeline import export_service, proxy_publish, resolve_cache
+
 HookBaseClass = sgtk.get_hook_baseclass()
 
 
@@ -76,11 +82,19 @@ class MayaFBXGeometryPublishPlugin(HookBaseClass):
                 "description": "Template path for published work files. Should"
                                "correspond to a template defined in "
                                "templates.yml.",
+            },
+            "Background Export": {
+                "type": "bool",
+                "default": False,
+                "description": "Run the export in a headless mayapy worker "
+                               "which also registers the publish, instead of "
+                               "in this session."
             }
         }
 
         # update the base settings
         base_settings.update(maya_publish_settings)
+        base_settings.update(proxy_publish.SETTINGS)
 
         return base_settings
 
@@ -135,7 +149,8 @@ class MayaFBXGeometryPublishPlugin(HookBaseClass):
             accepted = False
 
         # ensure the publish template is defined and valid and that we also have
-        publish_template = publisher.get_template_by_name(template_name)
+        publish_template = resolve_cache.get(item).template(
+            publisher, template_name)
         if not publish_template:
             self.logger.debug(
                 "The valid publish template could not be determined for the "
@@ -168,7 +183,8 @@ class MayaFBXGeometryPublishPlugin(HookBaseClass):
         }
 
     def validate(self, settings, item):
-        path = _session_path()
+        cache = resolve_cache.get(item)
+        path = cache.session_path()
         # ---- ensure the session has been saved
 
         if not path:
@@ -184,7 +200,7 @@ class MayaFBXGeometryPublishPlugin(HookBaseClass):
         # get the normalized path. checks that separators are matching the
         # current operating system, removal of trailing separators and removal
         # of double separators, etc.
-        path = sgtk.util.ShotgunPath.normalize(path)
+        path = cache.normalized_session_path()
 
         object_name = item.properties["object"]
         self.logger.debug("object_name:%s"%object_name)
@@ -205,7 +221,7 @@ class MayaFBXGeometryPublishPlugin(HookBaseClass):
         self.logger.debug("work_template:---%s"%work_template)
         # get the current scene path and extract fields from it using the work
         # template:
-        work_fields = work_template.get_fields(path)
+        work_fields = cache.fields(work_template, path)
 
         # we want to override the {name} token of the publish path with the
         # name of the object being exported. get the name stored by the
@@ -227,7 +243,7 @@ class MayaFBXGeometryPublishPlugin(HookBaseClass):
         # create the publish path by applying the fields. store it in the item's
         # properties. Also set the publish_path to be explicit.
         self.logger.debug("work_fields:--%s"%work_fields)
-        item.properties["path"] = publish_template.apply_fields(work_fields)
+        item.properties["path"] = cache.apply_fields(publish_template, work_fields)
         item.properties["publish_path"] = item.properties["path"]
 
         # use the work file's version number when publishing
@@ -267,6 +283,17 @@ class MayaFBXGeometryPublishPlugin(HookBaseClass):
             sys.path.append(_hooks)
         from func import replace_special_character as rsc
         publish_path = rsc.replaceSpecialCharacter(publish_path)
+        if settings["Background Export"].value:
+            # a worker exports and registers the publish
+            item.properties["export_job"] = export_service.submit(
+                item,
+                "fbx",
+                {"path": publish_path, "nodes": [mesh_object]},
+                export_service.publish_data(
+                    self, settings, item, publish_path, "FBXGeometry")
+            )
+            proxy_publish.submit(self, settings, item, [mesh_object])
+            return
         fbx_export_cmd = 'FBXExport -f "%s" -s' %(publish_path)
         try:
             self.logger.debug("Executing command: %s" % fbx_export_cmd)
@@ -278,18 +305,28 @@ class MayaFBXGeometryPublishPlugin(HookBaseClass):
         # Now that the path has been generated, hand it off to the
         super(MayaFBXGeometryPublishPlugin, self).publish(settings, item)
 
+        # gpu cache, lod and bounding box, written by a worker
+        proxy_publish.submit(self, settings, item, [mesh_object])
 
-def _session_path():
-    """
-    Return the path to the current session
-    :return:
-    """
-    path = cmds.file(query=True, sn=True)
+    def finalize(self, settings, item):
+        """
+        Execute the finalization pass, then queue the proxies of the publish
+        in one job. Background exports are registered by the worker, there is
+        nothing else to finalize here for them.
 
-    if isinstance(path, unicode):
-        path = path.encode("utf-8")
+        :param settings: Dictionary of Settings. The keys are strings, matching
+            the keys returned in the settings property. The values are `Setting`
+            instances.
+        :param item: Item to process
+        """
+        job_id = item.properties.get("export_job")
+        if job_id:
+            self.logger.info(
+                "Export job %s queued for: %s" % (job_id, item.properties["path"]))
+        else:
+            super(MayaFBXGeometryPublishPlugin, self).finalize(settings, item)
+        proxy_publish.flush(item, self.logger)
 
-    return path
 
 
 def _get_save_as_action():
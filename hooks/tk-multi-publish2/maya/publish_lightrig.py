@@ -10,12 +10,19 @@
 
 import fnmatch
 import os
+import sys
 
 import maya.cmds as cmds
 import maya.mel as mel
 
 import sgtk
 
+current_dir = os.path.dirname(__file__)
+_hooks = os.path.dirname(os.path.dirname(current_dir))
+if _hooks not in sys.path:
+    sys.path.append(_hooks)
+from cfa_pipeline import maya_formats, resolve_cache, scene_slimming
+
 # this method returns the evaluated hook base class. This could be the Hook
 # class defined in Toolkit core or it could be the publisher app's base publish
 # plugin class as defined in the configuration.
@@ -68,6 +75,8 @@ class MayaCameraPublishPlugin(HookBaseClass):
 
         # update the base settings
         plugin_settings.update(maya_camera_publish_settings)
+        plugin_settings.update(maya_formats.SETTINGS)
+        plugin_settings.update(scene_slimming.SETTINGS)
 
         return plugin_settings
 
@@ -155,7 +164,8 @@ class MayaCameraPublishPlugin(HookBaseClass):
             return {"accepted": False}
 
         # ensure the publish template is defined and valid and that we also have
-        publish_template = publisher.get_template_by_name(template_name)
+        publish_template = resolve_cache.get(item).template(
+            publisher, template_name)
         if publish_template:
             item.properties["publish_template"] = publish_template
             # because a publish template is configured, disable context change.
@@ -196,7 +206,8 @@ class MayaCameraPublishPlugin(HookBaseClass):
         :returns: True if item is valid, False otherwise.
         """
 
-        path = _session_path()
+        cache = resolve_cache.get(item)
+        path = cache.session_path()
         context = item.context
         _name = context.entity.get('name')
         _name = _name.replace('_','')
@@ -213,7 +224,7 @@ class MayaCameraPublishPlugin(HookBaseClass):
             raise Exception(error_msg)
 
         # get the normalized path
-        path = sgtk.util.ShotgunPath.normalize(path)
+        path = cache.normalized_session_path()
 
         lightRig = item.properties["lightRig"]
 
@@ -232,7 +243,7 @@ class MayaCameraPublishPlugin(HookBaseClass):
 
         # get the current scene path and extract fields from it using the work
         # template:
-        work_fields = work_template.get_fields(path)
+        work_fields = cache.fields(work_template, path)
         light_category = lightRig.split('_')[-1]
         # reset name field
         work_fields["name"] = _name + (light_category.capitalize())
@@ -248,7 +259,8 @@ class MayaCameraPublishPlugin(HookBaseClass):
         # create the publish path by applying the fields. store it in the item's
         # properties. This is the path we'll create and then publish in the base
         # publish plugin. Also set the publish_path to be explicit.
-        publish_path = publish_template.apply_fields(work_fields)
+        maya_formats.apply_format(settings, work_fields)
+        publish_path = cache.apply_fields(publish_template, work_fields)
         item.properties["path"] = publish_path
         item.properties["publish_path"] = publish_path
 
@@ -276,8 +288,8 @@ class MayaCameraPublishPlugin(HookBaseClass):
         try:
             # self.logger.debug("Executing command: %s" % cam_export_cmd)
             # mel.eval(cam_export_cmd)
-            cmds.select(lightRig, r=True)
-            cmds.file(publish_path, force=True, options="v=0", typ="mayaAscii", pr=True, es=True)
+            scene_slimming.export(self, settings, item, publish_path, lightRig,
+                                  preserveReferences=True)
         except Exception, e:
             self.logger.error("Failed to export lightRig: %s" % e)
             return
@@ -296,18 +308,6 @@ class MayaCameraPublishPlugin(HookBaseClass):
         # restore selection
 
 
-def _session_path():
-    """
-    Return the path to the current session
-    :return:
-    """
-    path = cmds.file(query=True, sn=True)
-
-    if isinstance(path, unicode):
-        path = path.encode("utf-8")
-
-    return path
-
 
 def _get_save_as_action():
     """
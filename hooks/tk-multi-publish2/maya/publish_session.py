@@ -8,11 +8,19 @@
 
 '''
 import os
+import sys
 import maya.cmds as cmds
 import maya.mel as mel
 import sgtk
 from sgtk.util.filesystem import ensure_folder_exists
 
+current_dir = os.path.dirname(__file__)
+_hooks = os.path.dirname(os.path.dirname(current_dir))
+if _hooks not in sys.path:
+    sys.path.append(_hooks)
+from cfa_pipeline import dependency_scanner, resolve_cache, save_coordinator, \
+    sg_mirror, stage_pipeline, version_index
+
 HookBaseClass = sgtk.get_hook_baseclass()
 
 
@@ -167,7 +175,7 @@ class MayaSessionPublishPlugin(HookBaseClass):
         if settings.get("Publish Template").value:
             item.context_change_allowed = False
 
-        path = _session_path()
+        path = resolve_cache.get(item).session_path()
 
         if not path:
             # the session has not been saved before (no path determined).
@@ -199,7 +207,8 @@ class MayaSessionPublishPlugin(HookBaseClass):
         :returns: True if item is valid, False otherwise.
         """
         publisher = self.parent
-        path = _session_path()
+        cache = resolve_cache.get(item)
+        path = cache.session_path()
 
         # ---- ensure the session has been saved
 
@@ -235,7 +244,7 @@ class MayaSessionPublishPlugin(HookBaseClass):
         # get the path in a normalized state. no trailing separator,
         # separators are appropriate for current os, no double separators,
         # etc.
-        path = sgtk.util.ShotgunPath.normalize(path)
+        path = cache.normalized_session_path()
 
         # if the session item has a known work template, see if the path
         # matches. if not, warn the user and provide a way to save the file to
@@ -266,15 +275,17 @@ class MayaSessionPublishPlugin(HookBaseClass):
 
         # check to see if the next version of the work file already exists on
         # disk. if so, warn the user and provide the ability to jump to save
-        # to that version now
+        # to that version now. the work folder is indexed by a single listing
+        # so the existence checks below don't stat every candidate file.
+        if work_template and not work_template.validate(path):
+            work_template = None
+        index = version_index.get_index(os.path.dirname(path), work_template)
         (next_version_path, version) = self._get_next_version_info(path, item)
-        if next_version_path and os.path.exists(next_version_path):
+        if next_version_path and index.exists(next_version_path):
 
-            # determine the next available version_number. just keep asking for
-            # the next one until we get one that doesn't exist.
-            while os.path.exists(next_version_path):
-                (next_version_path, version) = self._get_next_version_info(
-                    next_version_path, item)
+            # the next available version number, past the highest version
+            # of the folder
+            (next_version_path, version) = index.next_version_path(path)
 
             error_msg = "The next version of this file already exists on disk."
             self.logger.error(
@@ -294,8 +305,8 @@ class MayaSessionPublishPlugin(HookBaseClass):
 
         # populate the publish template on the item if found
         publish_template_setting = settings.get("Publish Template")
-        publish_template = publisher.engine.get_template_by_name(
-            publish_template_setting.value)
+        publish_template = cache.template(
+            publisher.engine, publish_template_setting.value)
         if publish_template:
             item.properties["publish_template"] = publish_template
 
@@ -322,19 +333,21 @@ class MayaSessionPublishPlugin(HookBaseClass):
         # print "pub_session_item:",item
 
         # cfa animation data publish
-        cfa_ani_publish()
+        cfa_ani_publish(self.logger)
 
-        path = sgtk.util.ShotgunPath.normalize(_session_path())
+        path = resolve_cache.get(item).normalized_session_path()
 
-        # ensure the session is saved
-        _save_session(path)
+        # ensure the session is saved. the coordinator skips the save if the
+        # scene was already saved during this publish and is unmodified.
+        save_coordinator.get(item).save(path)
 
         # update the item with the saved session path
         item.properties["path"] = path
 
         # add dependencies for the base class to register when publishing
         item.properties["publish_dependencies"] = \
-            _maya_find_additional_session_dependencies()
+            _maya_find_additional_session_dependencies(
+                self.parent.sgtk, self.logger)
 
         # let the base class register the publish
         super(MayaSessionPublishPlugin, self).publish(settings, item)
@@ -353,60 +366,23 @@ class MayaSessionPublishPlugin(HookBaseClass):
         # do the base class finalization
         super(MayaSessionPublishPlugin, self).finalize(settings, item)
 
-        # bump the session file to the next version
-        self._save_to_next_version(item.properties["path"], item, _save_session)
+        # bump the session file to the next version. the coordinator copies
+        # the just saved file rather than saving the whole scene again.
+        coordinator = save_coordinator.get(item)
+        self._save_to_next_version(
+            item.properties["path"], item, coordinator.version_up)
+        coordinator.report(self.logger)
 
 
-def _maya_find_additional_session_dependencies():
+def _maya_find_additional_session_dependencies(tk, logger=None):
     """
     Find additional dependencies from the session
-    """
 
-    # default implementation looks for references and
-    # textures (file nodes) and returns any paths that
-    # match a template defined in the configuration
-    ref_paths = set()
-
-    # first let's look at maya references
-    ref_nodes = cmds.ls(references=True)
-    for ref_node in ref_nodes:
-        # get the path:
-        ref_path = cmds.referenceQuery(ref_node, filename=True)
-        # make it platform dependent
-        # (maya uses C:/style/paths)
-        ref_path = ref_path.replace("/", os.path.sep)
-        if ref_path:
-            ref_paths.add(ref_path)
-
-    # now look at file texture nodes
-    for file_node in cmds.ls(l=True, type="file"):
-        # ensure this is actually part of this session and not referenced
-        if cmds.referenceQuery(file_node, isNodeReferenced=True):
-            # this is embedded in another reference, so don't include it in
-            # the breakdown
-            continue
-
-        # get path and make it platform dependent
-        # (maya uses C:/style/paths)
-        texture_path = cmds.getAttr(
-            "%s.fileTextureName" % file_node).replace("/", os.path.sep)
-        if texture_path:
-            ref_paths.add(texture_path)
-
-    return list(ref_paths)
-
-
-def _session_path():
+    References and file textures (file nodes) are read in one pass, udim and
+    frame tokens are expanded, missing files are dropped and only the paths
+    registered as PublishedFiles are returned.
     """
-    Return the path to the current session
-    :return:
-    """
-    path = cmds.file(query=True, sn=True)
-
-    if isinstance(path, unicode):
-        path = path.encode("utf-8")
-
-    return path
+    return dependency_scanner.scan_session_dependencies(tk, logger=logger)
 
 
 def _save_session(path):
@@ -428,12 +404,18 @@ def _save_session(path):
 
     cmds.file(rename=path)
 
+    # the scene path changed, drop everything resolved from the old one
+    resolve_cache.invalidate()
+
     # save the scene:
     if maya_file_type:
         cmds.file(save=True, force=True, type=maya_file_type)
     else:
         cmds.file(save=True, force=True)
 
+    # a new version may have been written to the folder
+    version_index.invalidate(folder)
+
 
 # TODO: method duplicated in all the maya hooks
 def _get_save_as_action():
@@ -460,13 +442,17 @@ def _get_save_as_action():
         }
     }
 
-def cfa_ani_publish():
+def cfa_ani_publish(logger=None):
     '''
         publish custom animation  data:
         scene data
         camera.abc
         shot json data
         related assets
+
+        maya exports run on the main thread, the shotgun calls and the
+        json export run on worker threads as soon as their inputs are ready.
+    :param logger: optional logger for the stage timings.
     :return:
     '''
     from func import shotgun_func, _shotgun_server
@@ -485,33 +471,49 @@ def cfa_ani_publish():
     work_dir = os.path.dirname(scene_path)
     publish_dir = work_dir.replace('/work/','/publish/')
     ablembic_path = work_dir + '/cache/alembic'
-    cmds.progressWindow(title=u'Export Animation Data',
-                        progress=0,
-                        status=u'waitting...: 0%',
-                        isInterruptable=True)
-    # export abc camera
-
-    exportAbcCamera.publish_abc_camera()
-    cmds.progressWindow(edit=True, progress=33, status=(u'export abc camera...'))
-    # export scene data
-    sdm.exportSceneData(publish_dir + '/sceneData')
-    cmds.progressWindow(edit=True, progress=60, status=(u'export scene data...'))
-    # export json
-    mesh_list = maya_func.get_mesh_list(maya_func.get_top_list())
-    _scene_obj_data = shotgun_func._getSceneObjectsData(scene_path, ablembic_path, mesh_list)
     entity = scene_sg_data.get('entity')
     project = scene_sg_data.get('project')
     shot_code = entity.get('name')
-    sg = _shotgun_server._shotgun()
-    shot_entity = sg.find_one(entity.get("type"), [['id', 'is', entity.get('id')], ['project', 'is', project]],
-                              ['sg_cut_in', 'sg_cut_out'])
-
-    start = shot_entity.get('sg_cut_in')
-    end = shot_entity.get('sg_cut_out')
-    export_ani_data.exportJsonFile(ablembic_path,shot_code,start,end,_scene_obj_data,_step.get('short_name'))
-    cmds.progressWindow(edit=True, progress=90, status=(u'export shot json...'))
-    # update related assets
-    shotgun_func.updateRelatedAssets(_scene_obj_data,entity.get('id'))
-    cmds.progressWindow(edit=True, progress=100, status=(u'update related assets...'))
-    cmds.progressWindow(endProgress=1)
 
+    def _find_cut_range():
+        # shotgun connections are not thread safe, one per live query
+        return sg_mirror.cut_range(_shotgun_server._shotgun, project.get('id'),
+                                   entity.get('id'))
+
+    def _export_json(cut_range, scene_obj_data):
+        (start, end) = cut_range
+        export_ani_data.exportJsonFile(ablembic_path, shot_code, start, end,
+                                       scene_obj_data, _step.get('short_name'))
+
+    pipeline = stage_pipeline.StagePipeline()
+    cmds.progressWindow(title=u'Export Animation Data',
+                        progress=0,
+                        status=u'waitting...: 0%',
+                        isInterruptable=True)
+    try:
+        # the cut range does not depend on the scene, fetch it right away
+        cut_range = pipeline.submit('shot cut range', _find_cut_range)
+        # export abc camera
+        pipeline.run('abc camera', exportAbcCamera.publish_abc_camera)
+        cmds.progressWindow(edit=True, progress=33, status=(u'export abc camera...'))
+        # export scene data
+        pipeline.run('scene data', sdm.exportSceneData, publish_dir + '/sceneData')
+        cmds.progressWindow(edit=True, progress=60, status=(u'export scene data...'))
+        # collect the scene objects for the json and the related assets
+        mesh_list = maya_func.get_mesh_list(maya_func.get_top_list())
+        _scene_obj_data = pipeline.run('scene objects', shotgun_func._getSceneObjectsData,
+                                       scene_path, ablembic_path, mesh_list)
+        # export json once the cut range is known
+        pipeline.submit('shot json', _export_json, cut_range, _scene_obj_data)
+        # update related assets
+        pipeline.submit('related assets', shotgun_func.updateRelatedAssets,
+                        _scene_obj_data, entity.get('id'))
+        cmds.progressWindow(edit=True, progress=90, status=(u'export shot json, update related assets...'))
+        pipeline.wait()
+        cmds.progressWindow(edit=True, progress=100, status=(u'done'))
+    finally:
+        pipeline.close()
+        cmds.progressWindow(endProgress=1)
+
+    if logger:
+        pipeline.report(logger)
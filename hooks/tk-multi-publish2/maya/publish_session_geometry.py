@@ -0,0 +1,150 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+'''
+@ author：huangsheng
+@ date: 2026/10/20 11:20
+@ description:
+    Session geometry publish exported through the alembic batcher, with the
+    export profile of the step. Static sets and props are written with one
+    sample instead of one per frame. Proxies of the geometry are queued
+    after the publish.
+
+    Derives from the engine's publish_session_geometry.py, which still does
+    the acceptance and validation.
+
+'''
+
+import os
+import sys
+
+import maya.cmds as cmds
+
+import sgtk
+
+current_dir = os.path.dirname(__file__)
+_hooks = os.path.dirname(os.path.dirname(current_dir))
+if _hooks not in sys.path:
+    sys.path.append(_hooks)
+from cfa_pipeline import alembic_batcher, alembic_profiles, checksum, \
+    proxy_publish
+
+HookBaseClass = sgtk.get_hook_baseclass()
+
+
+class MayaSessionGeometryProfilePublishPlugin(HookBaseClass):
+    """
+    Publishes the session geometry as an alembic cache using the export
+    profile of the item type and step.
+    """
+
+    @property
+    def settings(self):
+        """
+        Settings of the engine plugin, the proxy templates and the checksum
+        field.
+        """
+        base_settings = super(
+            MayaSessionGeometryProfilePublishPlugin, self).settings or {}
+        base_settings.update(proxy_publish.SETTINGS)
+        base_settings.update(checksum.SETTINGS)
+        return base_settings
+
+    def validate(self, settings, item):
+        """
+        Validates the item and queues its alembic export.
+
+        :param dict settings: The keys are strings, matching the keys returned
+            in the :data:`settings` property. The values are
+            :class:`~.processing.Setting` instances.
+        :param item: The :class:`~.processing.Item` instance to validate.
+        """
+        valid = super(MayaSessionGeometryProfilePublishPlugin, self).validate(
+            settings, item)
+        if valid:
+            self._queue_alembic(item)
+        return valid
+
+    def publish(self, settings, item):
+        """
+        Writes the alembic through the batcher and registers it.
+
+        :param dict settings: The keys are strings, matching the keys returned
+            in the :data:`settings` property. The values are
+            :class:`~.processing.Setting` instances.
+        :param item: The :class:`~.processing.Item` instance to publish.
+        """
+        publish_path = item.properties["path"]
+
+        batcher = alembic_batcher.get(item)
+        if not batcher.has_job(publish_path):
+            self._queue_alembic(item)
+        try:
+            batcher.export(publish_path)
+        except Exception, e:
+            self.logger.error("Failed to export Geometry: %s" % e)
+            return
+        checksum.submit(self, settings, item, publish_path)
+
+        item.properties["publish_type"] = "Alembic Cache"
+
+        # the engine plugin would export the geometry again, register the
+        # file with its base class directly
+        super(HookBaseClass, self).publish(settings, item)
+        checksum.attach_publish(self, settings, item, publish_path)
+
+        # gpu cache, lod and bounding box, written by a worker
+        proxy_publish.submit(self, settings, item)
+
+    def finalize(self, settings, item):
+        """
+        Finalizes the item, then queues the proxies of the publish in one
+        job.
+
+        :param dict settings: The keys are strings, matching the keys returned
+            in the :data:`settings` property. The values are
+            :class:`~.processing.Setting` instances.
+        :param item: The :class:`~.processing.Item` instance to finalize.
+        """
+        super(MayaSessionGeometryProfilePublishPlugin, self).finalize(settings, item)
+        proxy_publish.flush(item, self.logger)
+
+    def _queue_alembic(self, item):
+        """
+        Queue the alembic export of the session geometry.
+        """
+        step = item.context.step or {}
+        profile = alembic_profiles.get_profile(item.type, step.get("id"))
+        (start, end) = _find_scene_animation_range()
+        (start, end) = alembic_profiles.frame_range(profile, None, start, end)
+        if start == end:
+            self.logger.debug("Session geometry is static, one sample exported.")
+        alembic_batcher.get(item).add(
+            item.properties["path"],
+            None,
+            item.properties["path"],
+            start,
+            end,
+            flags=alembic_profiles.job_flags(profile),
+            item=item
+        )
+
+
+def _find_scene_animation_range():
+    """
+    Find the animation range from the current scene.
+    """
+    # look for any animation in the scene:
+    animation_curves = cmds.ls(typ="animCurve")
+
+    # if there aren't any animation curves then just return
+    # a single frame:
+    if not animation_curves:
+        return 1, 1
+
+    # something in the scene is animated so return the
+    # current timeline.  This could be extended if needed
+    # to calculate the frame range of the animated curves.
+    start = int(cmds.playbackOptions(q=True, min=True))
+    end = int(cmds.playbackOptions(q=True, max=True))
+
+    return start, end
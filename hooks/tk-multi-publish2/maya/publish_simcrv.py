@@ -9,11 +9,19 @@
 '''
 
 import os
+import sys
 import re
 import maya.cmds as cmds
 import maya.mel as mel
 import sgtk
 
+current_dir = os.path.dirname(__file__)
+_hooks = os.path.dirname(os.path.dirname(current_dir))
+if _hooks not in sys.path:
+    sys.path.append(_hooks)
+from cfa_pipeline import alembic_batcher, alembic_profiles, checksum, \
+    resolve_cache
+
 
 # this method returns the evaluated hook base class. This could be the Hook
 # class defined in Toolkit core or it could be the publisher app's base publish
@@ -68,6 +76,7 @@ class MayaXGenGeometryPublishPlugin(HookBaseClass):
 
         # update the base settings
         plugin_settings.update(shader_publish_settings)
+        plugin_settings.update(checksum.SETTINGS)
 
         return plugin_settings
 
@@ -99,7 +108,8 @@ class MayaXGenGeometryPublishPlugin(HookBaseClass):
             accepted = False
 
         # ensure the publish template is defined and valid
-        publish_template = publisher.get_template_by_name(template_name)
+        publish_template = resolve_cache.get(item).template(
+            publisher, template_name)
         self.logger.debug("TEMPLATE NAME: " + str(template_name))
         if not publish_template:
             self.logger.debug(
@@ -124,7 +134,8 @@ class MayaXGenGeometryPublishPlugin(HookBaseClass):
 
     def validate(self, settings, item):
 
-        path = _session_path()
+        cache = resolve_cache.get(item)
+        path = cache.session_path()
 
         if not path:
             # the session still requires saving. provide a save button.
@@ -136,7 +147,7 @@ class MayaXGenGeometryPublishPlugin(HookBaseClass):
             )
             raise Exception(error_msg)
 
-        path = sgtk.util.ShotgunPath.normalize(path)
+        path = cache.normalized_session_path()
 
         simcrv = item.properties["simCrvName"]
         self.logger.debug("publish_simcrv:%s"%simcrv)
@@ -147,6 +158,11 @@ class MayaXGenGeometryPublishPlugin(HookBaseClass):
             )
             self.logger.error(error_msg)
             raise Exception(error_msg)
+        # the batched export needs an unambiguous root
+        if len(cmds.ls(simcrv, l=True)) > 1:
+            error_msg = "More than one '%s' exists!" % simcrv
+            self.logger.error(error_msg)
+            raise Exception(error_msg)
 
         # get the configured work file template
         work_template = item.parent.properties.get("work_template")
@@ -154,7 +170,7 @@ class MayaXGenGeometryPublishPlugin(HookBaseClass):
         self.logger.debug("work_template:---%s"%work_template)
         # get the current scene path and extract fields from it using the work
         # template:
-        work_fields = work_template.get_fields(path)
+        work_fields = cache.fields(work_template, path)
         object_display = re.sub(r'[\W_]+', '', simcrv)
 
         work_fields["name"] = object_display
@@ -174,7 +190,7 @@ class MayaXGenGeometryPublishPlugin(HookBaseClass):
         # create the publish path by applying the fields. store it in the item's
         # properties. Also set the publish_path to be explicit.
         self.logger.debug("work_fields:--%s"%work_fields)
-        item.properties["path"] = publish_template.apply_fields(work_fields)
+        item.properties["path"] = cache.apply_fields(publish_template, work_fields)
         # item.properties["publish_path"] = item.properties["path"]
 
         # use the work file's version number when publishing
@@ -182,9 +198,15 @@ class MayaXGenGeometryPublishPlugin(HookBaseClass):
             item.properties["publish_version"] = work_fields["version"]
 
         # run the base class validation
-        return super(MayaXGenGeometryPublishPlugin, self).validate(
+        valid = super(MayaXGenGeometryPublishPlugin, self).validate(
             settings, item)
 
+        # queue the alembic export, all simcrvs are written by one AbcExport
+        # when the first of them is published
+        if valid:
+            self._queue_alembic(item)
+        return valid
+
     def publish(self, settings, item):
         publisher = self.parent
         # get the path to create and publish
@@ -192,32 +214,39 @@ class MayaXGenGeometryPublishPlugin(HookBaseClass):
         from func import replace_special_character as rsc
         publish_path = rsc.replaceSpecialCharacter(publish_path)
 
-        simcrv = item.properties['simCrvName']
-        fullname = cmds.ls(simcrv,l = True)
-        if len(fullname)>1:
-            raise Exception("More than one '%s' exists!"%simcrv)
-        publisher.ensure_folder_exists(os.path.split(publish_path)[0])
-        from __Maya.common import maya_func
-        start = cmds.playbackOptions(q=True, ast=True)
-        end = cmds.playbackOptions(q=True, aet=True)
-        maya_func.export_alembic(simcrv,publish_path,start,end)
+        # writes the alembic of every queued simcrv on first call
+        batcher = alembic_batcher.get(item)
+        if not batcher.has_job(item.properties["path"]):
+            self._queue_alembic(item)
+        batcher.export(item.properties["path"])
+        checksum.submit(self, settings, item, publish_path)
         self.logger.info("A Publish will be created in Shotgun and linked to:")
         self.logger.info("  %s" % (publish_path))
 
         item.properties["publish_type"] = "Maya SIMCRV"
         super(MayaXGenGeometryPublishPlugin, self).publish(settings, item)
+        checksum.attach_publish(self, settings, item, publish_path)
 
-def _session_path():
-    """
-    Return the path to the current session
-    :return:
-    """
-    path = cmds.file(query=True, sn=True)
-
-    if isinstance(path, unicode):
-        path = path.encode("utf-8")
-
-    return path
+    def _queue_alembic(self, item):
+        """
+        Queue the alembic export of the simcrv of ``item``.
+        """
+        from func import replace_special_character as rsc
+        simcrv = cmds.ls(item.properties["simCrvName"], l=True)[0]
+        step = item.context.step or {}
+        profile = alembic_profiles.get_profile(item.type, step.get("id"))
+        start = cmds.playbackOptions(q=True, ast=True)
+        end = cmds.playbackOptions(q=True, aet=True)
+        (start, end) = alembic_profiles.frame_range(profile, simcrv, start, end)
+        alembic_batcher.get(item).add(
+            item.properties["path"],
+            simcrv,
+            rsc.replaceSpecialCharacter(item.properties["path"]),
+            start,
+            end,
+            flags=alembic_profiles.job_flags(profile),
+            item=item
+        )
 
 
 def _get_save_as_action():
@@ -10,12 +10,19 @@
 
 import fnmatch
 import os
+import sys
 
 import maya.cmds as cmds
 import maya.mel as mel
 
 import sgtk
 
+current_dir = os.path.dirname(__file__)
+_hooks = os.path.dirname(os.path.dirname(current_dir))
+if _hooks not in sys.path:
+    sys.path.append(_hooks)
+from cfa_pipeline import export_service, resolve_cache
+
 # this method returns the evaluated hook base class. This could be the Hook
 # class defined in Toolkit core or it could be the publisher app's base publish
 # plugin class as defined in the configuration.
@@ -99,6 +106,13 @@ class MayaUVMapPublishPlugin(HookBaseClass):
                 "description": "Template path for published camera. Should"
                                "correspond to a template defined in "
                                "templates.yml.",
+            },
+            "Background Export": {
+                "type": "bool",
+                "default": False,
+                "description": "Run the export in a headless mayapy worker "
+                               "which also registers the publish, instead of "
+                               "in this session."
             }
         }
 
@@ -191,7 +205,8 @@ class MayaUVMapPublishPlugin(HookBaseClass):
             return {"accepted": False}
 
         # ensure the publish template is defined and valid and that we also have
-        publish_template = publisher.get_template_by_name(template_name)
+        publish_template = resolve_cache.get(item).template(
+            publisher, template_name)
         self.logger.debug("TEMPLATE NAME: " + str(template_name))
         if not publish_template:
             self.logger.debug(
@@ -229,7 +244,8 @@ class MayaUVMapPublishPlugin(HookBaseClass):
         :returns: True if item is valid, False otherwise.
         """
 
-        path = _session_path()
+        cache = resolve_cache.get(item)
+        path = cache.session_path()
 
         # ---- ensure the session has been saved
 
@@ -244,7 +260,7 @@ class MayaUVMapPublishPlugin(HookBaseClass):
             raise Exception(error_msg)
 
         # get the normalized path
-        path = sgtk.util.ShotgunPath.normalize(path)
+        path = cache.normalized_session_path()
 
         uvmap_name = item.properties["uvmap_name"]
         uvmap_file_name = item.properties["uvmap_file_name"]
@@ -266,7 +282,7 @@ class MayaUVMapPublishPlugin(HookBaseClass):
 
         # get the current scene path and extract fields from it using the work
         # template:
-        work_fields = work_template.get_fields(path)
+        work_fields = cache.fields(work_template, path)
 
         # include the camera name in the fields
         work_fields["unmap_name"] = uvmap_file_name
@@ -282,7 +298,7 @@ class MayaUVMapPublishPlugin(HookBaseClass):
         # create the publish path by applying the fields. store it in the item's
         # properties. This is the path we'll create and then publish in the base
         # publish plugin. Also set the publish_path to be explicit.
-        publish_path = publish_template.apply_fields(work_fields)
+        publish_path = cache.apply_fields(publish_template, work_fields)
         item.properties["path"] = publish_path
         item.properties["publish_path"] = publish_path
         self.logger.debug("publish_path:----%s----"%publish_path)
@@ -347,24 +363,41 @@ class MayaUVMapPublishPlugin(HookBaseClass):
         self.logger.info("  %s" % (publish_path))
         _format = "tif"
         _xr=_yr = 2048
+        if settings["Background Export"].value:
+            # a worker exports and registers the publish
+            item.properties["export_job"] = export_service.submit(
+                item,
+                "uv_snapshot",
+                {"path": publish_path, "node": uvmap_name,
+                 "format": _format, "resolution": _xr},
+                export_service.publish_data(
+                    self, settings, item, publish_path, "Image")
+            )
+            return
         cmds.uvSnapshot(uvmap_name,o = True,ff = _format,xr = _xr,yr = _yr,aa = True,n = publish_path)
         item.properties["publish_type"] = "Image"
 
         # Now that the path has been generated, hand it off to the
         super(MayaUVMapPublishPlugin, self).publish(settings, item)
 
+    def finalize(self, settings, item):
+        """
+        Execute the finalization pass. Background exports are registered by
+        the worker, there is nothing to finalize here for them.
 
-def _session_path():
-    """
-    Return the path to the current session
-    :return:
-    """
-    path = cmds.file(query=True, sn=True)
+        :param settings: Dictionary of Settings. The keys are strings, matching
+            the keys returned in the settings property. The values are `Setting`
+            instances.
+        :param item: Item to process
+        """
+        job_id = item.properties.get("export_job")
+        if job_id:
+            self.logger.info(
+                "Export job %s queued for: %s" % (job_id, item.properties["path"]))
+            return
+        super(MayaUVMapPublishPlugin, self).finalize(settings, item)
 
-    if isinstance(path, unicode):
-        path = path.encode("utf-8")
 
-    return path
 def _get_uvmap_uvmin_uvmax(poly_name):
     vertex_num = cmds.polyEvaluate(poly_name, v=True)
     u_values = cmds.polyEditUV("%s.map[%d:%d]" % (poly_name,0, vertex_num), q=True, u=True)
@@ -15,6 +15,13 @@ import sys
 import maya.cmds as cmds
 import sgtk
 
+current_dir = os.path.dirname(__file__)
+_hooks = os.path.dirname(os.path.dirname(current_dir))
+if _hooks not in sys.path:
+    sys.path.append(_hooks)
+from cfa_pipeline import checksum, export_service, file_copy, \
+    resolve_cache, save_coordinator, xgen_palette
+
 HookBaseClass = sgtk.get_hook_baseclass()
 
 
@@ -46,11 +53,19 @@ class MayaXGenPublishPlugin(HookBaseClass):
                 "description": "Template path for published shader networks. "
                                "Should correspond to a template defined in "
                                "templates.yml.",
+            },
+            "Background Export": {
+                "type": "bool",
+                "default": False,
+                "description": "Export the palette in a headless mayapy "
+                               "worker which also registers the publish, "
+                               "instead of in this session."
             }
         }
 
         # update the base settings
         plugin_settings.update(xgen_publish__settings)
+        plugin_settings.update(checksum.SETTINGS)
 
         return plugin_settings
 
@@ -82,7 +97,8 @@ class MayaXGenPublishPlugin(HookBaseClass):
             accepted = False
 
         # ensure the publish template is defined and valid
-        publish_template = publisher.get_template_by_name(template_name)
+        publish_template = resolve_cache.get(item).template(
+            publisher, template_name)
         self.logger.debug("TEMPLATE NAME: " + str(template_name))
         if not publish_template:
             self.logger.debug(
@@ -107,7 +123,8 @@ class MayaXGenPublishPlugin(HookBaseClass):
 
     def validate(self, settings, item):
 
-        path = _session_path()
+        cache = resolve_cache.get(item)
+        path = cache.session_path()
         _ext = os.path.splitext(path)[-1]
         project_root, basename = os.path.split(path)
         basename = basename.split(_ext)[0]
@@ -128,7 +145,7 @@ class MayaXGenPublishPlugin(HookBaseClass):
         # get the normalized path. checks that separators are matching the
         # current operating system, removal of trailing separators and removal
         # of double separators, etc.
-        path = sgtk.util.ShotgunPath.normalize(path)
+        path = cache.normalized_session_path()
 
         object_name = item.properties["collection"]
         self.logger.debug("object_name:%s" % object_name)
@@ -148,7 +165,7 @@ class MayaXGenPublishPlugin(HookBaseClass):
         self.logger.debug("work_template:---%s" % work_template)
         # get the current scene path and extract fields from it using the work
         # template:
-        work_fields = work_template.get_fields(path)
+        work_fields = cache.fields(work_template, path)
         work_fields["xgfilename"] = basename + "__" + collection
 
         # we want to override the {name} token of the publish path with the
@@ -168,7 +185,7 @@ class MayaXGenPublishPlugin(HookBaseClass):
             self.logger.error(error_msg)
             raise Exception(error_msg)
 
-        item.properties["path"] = publish_template.apply_fields(work_fields)
+        item.properties["path"] = cache.apply_fields(publish_template, work_fields)
         # use the work file's version number when publishing
         if "version" in work_fields:
             item.properties["publish_version"] = work_fields["version"]
@@ -183,11 +200,12 @@ class MayaXGenPublishPlugin(HookBaseClass):
 
     def publish(self, settings, item):
 
-        # save the file
-        cmds.file(save = True)
+        # save the file, once for all the collections of this publish
+        save_coordinator.get(item).save()
 
         publisher = self.parent
-        path = _session_path()
+        cache = resolve_cache.get(item)
+        path = cache.session_path()
         _ext = os.path.splitext(path)[-1]
         project_root,basename = os.path.split(path)
         # basename = basename.split(_ext)[0]
@@ -202,22 +220,34 @@ class MayaXGenPublishPlugin(HookBaseClass):
         # copy work's collection to publish path
         _, folder = os.path.split(collection_path)
         dst = os.path.join(publish_dir, folder)
-        sgtk.util.filesystem.copy_folder(collection_path, dst)
+        stats = file_copy.copy_folder(collection_path, dst)
+        self.logger.info("Copied the xgen collection: %s" % stats.report())
 
-        # export .xgen
+        # export .xgen, pointing at the published collection
+        publish_path_root = project_root.replace("/work/","/publish/") + "/"
+        if settings["Background Export"].value:
+            # a worker exports and registers the publish
+            item.properties["export_job"] = export_service.submit(
+                item,
+                "xgen",
+                {"path": publish_path,
+                 "collection": collection,
+                 "project_path": publish_path_root,
+                 "version": item.properties["publish_version"]},
+                export_service.publish_data(
+                    self, settings, item, publish_path, "Maya XGen")
+            )
+            return
         try:
-            import xgenm as xg
+            import xgenm
         except Exception,e:
             self.logger.debug(e)
             return
-        xg.exportPalette(collection,publish_path)
-        # change xgProjectPath
-        publish_path_root = project_root.replace("/work/","/publish/") + "/"
-        changeXGenProjectPath(publish_path,
-                              publish_path_root,
-                              item.properties["publish_version"],
-                              collection,
-                              self.logger)
+        xgen_palette.export_palette(collection,
+                                    publish_path,
+                                    publish_path_root,
+                                    item.properties["publish_version"],
+                                    self.logger)
 
         self.logger.info("A Publish will be created in Shotgun and linked to:")
         self.logger.info("  %s" % (publish_path))
@@ -227,44 +257,7 @@ class MayaXGenPublishPlugin(HookBaseClass):
 
         # plugin to do all the work to register the file with SG
         super(MayaXGenPublishPlugin, self).publish(settings, item)
-def changeXGenProjectPath(xgen,project_path,version,collection,logger):
-    xgProjectPath = "xgProjectPath"
-    xgDataPath = "xgDataPath"
-    from func import replace_special_character as rsc
-    rep_path = rsc.replaceSpecialCharacter(project_path)
-    # rep_path = rep_path.replace("\\","/")
-    logger.debug("replace_path:%s" % rep_path)
-
-    new_data_path = ""
-    with open(xgen,"r") as f:
-        lines = f.readlines()
-        for i in xrange(len(lines)):
-            if re.search(xgProjectPath,lines[i]):
-                lines[i] = re.sub("/work/","/publish/",lines[i])
-            if re.search(xgDataPath, lines[i]):
-                if not new_data_path:
-                    sp = lines[i].split('/collections/')
-                    new_data_path = '{dir}/collections/{version}/{col_name}\n'.format(
-                        dir = sp[0],
-                        version = 'v%03d'%int(version),
-                        col_name = collection
-                    )
-                    new_data_path = re.sub("/work/","/publish/",new_data_path)
-                lines[i] = new_data_path
-    with open(xgen,"w") as f:
-        f.writelines(lines)
-def _session_path():
-    """
-    Return the path to the current session
-    :return:
-    """
-    path = cmds.file(query=True, sn=True)
-
-    if isinstance(path, unicode):
-        path = path.encode("utf-8")
-
-    return path
-
+        checksum.attach_publish(self, settings, item, publish_path)
 def _get_save_as_action():
     """
     Simple helper for returning a log action dict for saving the session
@@ -9,11 +9,18 @@
 '''
 
 import os
+import sys
 import re
 import maya.cmds as cmds
 import maya.mel as mel
 import sgtk
 
+current_dir = os.path.dirname(__file__)
+_hooks = os.path.dirname(os.path.dirname(current_dir))
+if _hooks not in sys.path:
+    sys.path.append(_hooks)
+from cfa_pipeline import maya_formats, proxy_publish, resolve_cache
+
 
 # this method returns the evaluated hook base class. This could be the Hook
 # class defined in Toolkit core or it could be the publisher app's base publish
@@ -68,6 +75,8 @@ class MayaXGenGeometryPublishPlugin(HookBaseClass):
 
         # update the base settings
         plugin_settings.update(shader_publish_settings)
+        plugin_settings.update(maya_formats.SETTINGS)
+        plugin_settings.update(proxy_publish.SETTINGS)
 
         return plugin_settings
 
@@ -99,7 +108,8 @@ class MayaXGenGeometryPublishPlugin(HookBaseClass):
             accepted = False
 
         # ensure the publish template is defined and valid
-        publish_template = publisher.get_template_by_name(template_name)
+        publish_template = resolve_cache.get(item).template(
+            publisher, template_name)
         self.logger.debug("TEMPLATE NAME: " + str(template_name))
         if not publish_template:
             self.logger.debug(
@@ -124,7 +134,8 @@ class MayaXGenGeometryPublishPlugin(HookBaseClass):
 
     def validate(self, settings, item):
 
-        path = _session_path()
+        cache = resolve_cache.get(item)
+        path = cache.session_path()
 
         if not path:
             # the session still requires saving. provide a save button.
@@ -136,7 +147,7 @@ class MayaXGenGeometryPublishPlugin(HookBaseClass):
             )
             raise Exception(error_msg)
 
-        path = sgtk.util.ShotgunPath.normalize(path)
+        path = cache.normalized_session_path()
 
         xg_geometry = item.properties["geometry"]
         self.logger.debug("publish_geometry:%s"%xg_geometry)
@@ -156,7 +167,7 @@ class MayaXGenGeometryPublishPlugin(HookBaseClass):
         self.logger.debug("work_template:---%s"%work_template)
         # get the current scene path and extract fields from it using the work
         # template:
-        work_fields = work_template.get_fields(path)
+        work_fields = cache.fields(work_template, path)
         object_display = re.sub(r'[\W_]+', '', xg_geometry)
         work_fields["name"] = object_display
         # set the display name as the name to use in SG to represent the publish
@@ -172,8 +183,9 @@ class MayaXGenGeometryPublishPlugin(HookBaseClass):
 
         # create the publish path by applying the fields. store it in the item's
         # properties. Also set the publish_path to be explicit.
+        maya_formats.apply_format(settings, work_fields)
         self.logger.debug("work_fields:--%s"%work_fields)
-        item.properties["path"] = publish_template.apply_fields(work_fields)
+        item.properties["path"] = cache.apply_fields(publish_template, work_fields)
         # item.properties["publish_path"] = item.properties["path"]
 
         # use the work file's version number when publishing
@@ -198,31 +210,28 @@ class MayaXGenGeometryPublishPlugin(HookBaseClass):
         # parent = fullname[0].split("|")[1]
         publisher.ensure_folder_exists(os.path.split(publish_path)[0])
         cmds.select(geo,r = True)
-        cmds.file(
-            publish_path,
-            type='mayaAscii',
-            exportSelected=True,
-            options="v=0",
-            prompt=False,
-            force=True
-        )
+        maya_formats.export_selected(publish_path)
         self.logger.info("A Publish will be created in Shotgun and linked to:")
         self.logger.info("  %s" % (publish_path))
 
         item.properties["publish_type"] = "MAYA XGGeometry"
         super(MayaXGenGeometryPublishPlugin, self).publish(settings, item)
 
-def _session_path():
-    """
-    Return the path to the current session
-    :return:
-    """
-    path = cmds.file(query=True, sn=True)
+        # gpu cache, lod and bounding box, written by a worker
+        proxy_publish.submit(self, settings, item, [geo])
 
-    if isinstance(path, unicode):
-        path = path.encode("utf-8")
+    def finalize(self, settings, item):
+        """
+        Execute the finalization pass, then queue the proxies of the
+        publish in one job.
 
-    return path
+        :param settings: Dictionary of Settings. The keys are strings, matching
+            the keys returned in the settings property. The values are `Setting`
+            instances.
+        :param item: Item to process
+        """
+        super(MayaXGenGeometryPublishPlugin, self).finalize(settings, item)
+        proxy_publish.flush(item, self.logger)
 
 
 def _get_save_as_action():
@@ -9,10 +9,17 @@
 # not expressly granted therein are reserved by Shotgun Software Inc.
 
 import os
+import sys
 import re
 import maya.cmds as cmds
 import sgtk
 
+current_dir = os.path.dirname(__file__)
+_hooks = os.path.dirname(os.path.dirname(current_dir))
+if _hooks not in sys.path:
+    sys.path.append(_hooks)
+from cfa_pipeline import maya_formats, resolve_cache, scene_slimming
+
 
 # this method returns the evaluated hook base class. This could be the Hook
 # class defined in Toolkit core or it could be the publisher app's base publish
@@ -67,6 +74,8 @@ class MayaXGenShaderPublishPlugin(HookBaseClass):
 
         # update the base settings
         plugin_settings.update(shader_publish_settings)
+        plugin_settings.update(maya_formats.SETTINGS)
+        plugin_settings.update(scene_slimming.SETTINGS)
 
         return plugin_settings
 
@@ -98,7 +107,8 @@ class MayaXGenShaderPublishPlugin(HookBaseClass):
             accepted = False
 
         # ensure the publish template is defined and valid
-        publish_template = publisher.get_template_by_name(template_name)
+        publish_template = resolve_cache.get(item).template(
+            publisher, template_name)
         self.logger.debug("TEMPLATE NAME: " + str(template_name))
         if not publish_template:
             self.logger.debug(
@@ -123,7 +133,8 @@ class MayaXGenShaderPublishPlugin(HookBaseClass):
 
     def validate(self, settings, item):
 
-        path = _session_path()
+        cache = resolve_cache.get(item)
+        path = cache.session_path()
 
         # self.logger.debug("context:----%s----"%item.context)
         # self.logger.debug("task:----%s----" % item.context.task)
@@ -143,7 +154,7 @@ class MayaXGenShaderPublishPlugin(HookBaseClass):
         # get the normalized path. checks that separators are matching the
         # current operating system, removal of trailing separators and removal
         # of double separators, etc.
-        path = sgtk.util.ShotgunPath.normalize(path)
+        path = cache.normalized_session_path()
 
         collection_name = item.properties["collection"]
         self.logger.debug("collection_name:%s"%collection_name)
@@ -162,7 +173,7 @@ class MayaXGenShaderPublishPlugin(HookBaseClass):
         publish_template = item.properties.get("publish_template")
         self.logger.debug("work_template:---%s"%work_template)
 
-        work_fields = work_template.get_fields(path)
+        work_fields = cache.fields(work_template, path)
         object_display = re.sub(r'[\W_]+', '', collection_name)
         work_fields["name"] = object_display
         work_fields["xgcollection"] = collection_name
@@ -180,8 +191,9 @@ class MayaXGenShaderPublishPlugin(HookBaseClass):
 
         # create the publish path by applying the fields. store it in the item's
         # properties. Also set the publish_path to be explicit.
+        maya_formats.apply_format(settings, work_fields)
         self.logger.debug("work_fields:--%s"%work_fields)
-        item.properties["path"] = publish_template.apply_fields(work_fields)
+        item.properties["path"] = cache.apply_fields(publish_template, work_fields)
         # item.properties["publish_path"] = item.properties["path"]
 
         # use the work file's version number when publishing
@@ -273,20 +285,11 @@ class MayaXGenShaderPublishPlugin(HookBaseClass):
         select_nodes = list(shaders)
         select_nodes.extend(script_nodes)
 
-        cmds.select(select_nodes, replace=True)
         self.logger.debug("shader_node:%s"%select_nodes)
-        # write .ma file to the publish path with the shader network definitions
-        cmds.file(
-            publish_path,
-            type='mayaAscii',
-            exportSelected=True,
-            options="v=0",
-            prompt=False,
-            force=True
-        )
-
-        # clean up shader hookup nodes. they should exist in publish file only
-        _clean_shader_hookup_script_nodes()
+        # write the maya file to the publish path with the shader network
+        # definitions. the shader hookup nodes exist in publish file only
+        scene_slimming.export(self, settings, item, publish_path,
+                              select_nodes, temporary=script_nodes)
 
         # set the publish type in the item's properties. the base plugin will
         # use this when registering the file with Shotgun
@@ -296,18 +299,6 @@ class MayaXGenShaderPublishPlugin(HookBaseClass):
         # plugin to do all the work to register the file with SG
         super(MayaXGenShaderPublishPlugin, self).publish(settings, item)
 
-def _session_path():
-    """
-    Return the path to the current session
-    :return:
-    """
-    path = cmds.file(query=True, sn=True)
-
-    if isinstance(path, unicode):
-        path = path.encode("utf-8")
-
-    return path
-
 
 def _get_save_as_action():
     """
@@ -332,13 +323,3 @@ def _get_save_as_action():
             "callback": callback
         }
     }
-
-
-def _clean_shader_hookup_script_nodes():
-
-    # clean up any existing shader hookup nodes
-    hookup_prefix = "XGSHADER_HOOKUP_"
-    for node in cmds.ls(type="script"):
-        if node.startswith(hookup_prefix):
-            cmds.delete(node)
-
@@ -15,6 +15,12 @@ import uuid
 import sys
 import sgtk
 
+current_dir = os.path.dirname(__file__)
+_hooks = os.path.dirname(os.path.dirname(current_dir))
+if _hooks not in sys.path:
+    sys.path.append(_hooks)
+from cfa_pipeline import sg_async
+
 HookBaseClass = sgtk.get_hook_baseclass()
 
 
@@ -268,14 +274,15 @@ class PhotoshopUploadPNGVersionPlugin(HookBaseClass):
             upload_path = upload_path.decode("utf-8")
 
         # upload the file to SG
-        self.logger.info("Uploading content...")
-        self.parent.shotgun.upload(
-            "Version",
-            version["id"],
-            upload_path,
-            "sg_uploaded_movie"
-        )
-        self.logger.info("Upload complete!")
+        uploads = [
+            sg_async.Call(
+                "upload",
+                "Version",
+                version["id"],
+                upload_path,
+                "sg_uploaded_movie"
+            )
+        ]
 
         # thumbnail to upload is the one stored in item
         thumb = item.get_thumbnail_as_path()
@@ -285,13 +292,22 @@ class PhotoshopUploadPNGVersionPlugin(HookBaseClass):
 
         # go ahead and update the publish thumbnail (if there was one)
         if publish_data:
-            self.logger.info("Updating publish thumbnail...")
-            self.parent.shotgun.upload_thumbnail(
-                publish_data["type"],
-                publish_data["id"],
-                thumb
+            uploads.append(
+                sg_async.Call(
+                    "upload_thumbnail",
+                    publish_data["type"],
+                    publish_data["id"],
+                    thumb
+                )
             )
-            self.logger.info("Publish thumbnail updated!")            
+
+        # the uploads do not depend on each other, sent at the same time.
+        # the toolkit connection is per thread
+        self.logger.info("Uploading content...")
+        sg_async.gather(lambda: self.parent.shotgun, uploads)
+        self.logger.info("Upload complete!")
+        if publish_data:
+            self.logger.info("Publish thumbnail updated!")
 
         item.properties["upload_path"] = upload_path
 
@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+'''
+@ author：huangsheng
+@ date: 2026/10/29 11:00
+@ description:
+    The batch publish scheduler with stubbed scene publishes, without maya:
+
+        python -m pytest tests
+
+'''
+
+import os
+import sys
+import time
+import unittest
+
+# make the cfa_pipeline package importable
+_hooks = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "hooks")
+if _hooks not in sys.path:
+    sys.path.insert(0, _hooks)
+
+from cfa_pipeline import batch_publish
+
+
+def _init():
+    pass
+
+
+def _publish(scene):
+    # the scene name says what the stub does
+    if scene.startswith("crash"):
+        os._exit(3)
+    if scene.startswith("hang"):
+        time.sleep(60)
+    return {
+        "scene": scene,
+        "ok": not scene.startswith("fail"),
+        "seconds": 0,
+        "stages": {},
+        "items": 1,
+        "error": "failed" if scene.startswith("fail") else None,
+        "pid": os.getpid(),
+    }
+
+
+class RunBatchTest(unittest.TestCase):
+
+    def setUp(self):
+        self._poll = batch_publish.POLL
+        batch_publish.POLL = 0.1
+
+    def tearDown(self):
+        batch_publish.POLL = self._poll
+
+    def run_batch(self, scenes, workers=2, timeout=None):
+        return batch_publish.run_batch(
+            scenes, workers, publish=_publish, initializer=_init,
+            timeout=timeout)
+
+    def test_reports_in_input_order(self):
+        scenes = ["a.ma", "fail.ma", "b.ma", "c.ma"]
+
+        report = self.run_batch(scenes)
+
+        self.assertEqual([r["scene"] for r in report["scenes"]], scenes)
+        self.assertEqual(report["published"], 3)
+        self.assertEqual(report["failed"], 1)
+
+    def test_spreads_scenes_across_workers(self):
+        report = self.run_batch(["a.ma", "b.ma", "c.ma", "d.ma"], workers=2)
+
+        self.assertEqual(report["workers"], 2)
+        self.assertNotIn(os.getpid(),
+                         set(r["pid"] for r in report["scenes"]))
+
+    def test_crashed_worker_fails_its_scene_only(self):
+        scenes = ["a.ma", "crash.ma", "b.ma", "c.ma"]
+
+        report = self.run_batch(scenes)
+
+        self.assertEqual([r["ok"] for r in report["scenes"]],
+                         [True, False, True, True])
+        self.assertIn("crashed", report["scenes"][1]["error"])
+
+    def test_every_worker_crashing(self):
+        report = self.run_batch(["crash1.ma", "crash2.ma", "crash3.ma"])
+
+        self.assertEqual(report["failed"], 3)
+
+    def test_timeout(self):
+        report = self.run_batch(["hang.ma", "a.ma"], timeout=1)
+
+        self.assertEqual([r["ok"] for r in report["scenes"]], [False, True])
+        self.assertIn("Timed out", report["scenes"][0]["error"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,249 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+'''
+@ author：huangsheng
+@ date: 2026/10/29 10:00
+@ description:
+    The export queue run by the stand-in executor, without maya:
+
+        python -m pytest tests
+
+'''
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+# make the cfa_pipeline package importable
+_hooks = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "hooks")
+if _hooks not in sys.path:
+    sys.path.insert(0, _hooks)
+
+from cfa_pipeline import export_queue, export_service
+
+
+def _write(data):
+    with open(data["path"], "w") as f:
+        f.write(data.get("content", ""))
+    return data["path"]
+
+
+def _fail(data):
+    raise RuntimeError("export failed")
+
+
+class LocalExecutorTest(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp(prefix="cfa_export_test.")
+        self.queue = export_queue.JobQueue(
+            os.path.join(self.folder, "queue.db"))
+        self._handoff_dir = export_service.HANDOFF_DIR
+        export_service.HANDOFF_DIR = os.path.join(self.folder, "handoff")
+        export_service.EXPORTERS["write"] = _write
+        export_service.EXPORTERS["fail"] = _fail
+        self.opened = []
+
+    def tearDown(self):
+        del export_service.EXPORTERS["write"]
+        del export_service.EXPORTERS["fail"]
+        export_service.HANDOFF_DIR = self._handoff_dir
+        self.queue.close()
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+    def handoff(self, name="shot.mb"):
+        folder = os.path.join(export_service.HANDOFF_DIR, name + ".x")
+        os.makedirs(folder)
+        path = os.path.join(folder, name)
+        open(path, "w").close()
+        return path
+
+    def executor(self):
+        return export_service.LocalExecutor(self.queue, self.opened.append)
+
+    def test_runs_jobs_in_order(self):
+        paths = [os.path.join(self.folder, "out%d.fbx" % i) for i in range(3)]
+        ids = [self.queue.put("write", None, {"export": {"path": path}})
+               for path in paths]
+
+        jobs = self.executor().run()
+
+        self.assertEqual([job.id for job in jobs], ids)
+        self.assertEqual([job.status for job in jobs],
+                         [export_queue.DONE] * 3)
+        self.assertEqual([job.result["path"] for job in jobs], paths)
+        self.assertTrue(all(os.path.isfile(path) for path in paths))
+        self.assertEqual(self.queue.count(), 0)
+
+    def test_failed_job_does_not_stop_the_queue(self):
+        path = os.path.join(self.folder, "out.fbx")
+        failed = self.queue.put("fail", None, {"export": {}})
+        done = self.queue.put("write", None, {"export": {"path": path}})
+
+        jobs = self.executor().run()
+
+        self.assertEqual([job.status for job in jobs],
+                         [export_queue.FAILED, export_queue.DONE])
+        self.assertIn("export failed", self.queue.get(failed).error)
+        self.assertEqual(self.queue.get(done).result["path"], path)
+
+    def test_max_jobs(self):
+        for i in range(3):
+            self.queue.put("write", None, {"export": {
+                "path": os.path.join(self.folder, "out%d.fbx" % i)}})
+
+        self.assertEqual(len(self.executor().run(max_jobs=2)), 2)
+        self.assertEqual(self.queue.count(), 1)
+
+    def test_opens_the_job_scene(self):
+        scene = self.handoff()
+        self.queue.put("write", scene, {"export": {
+            "path": os.path.join(self.folder, "out.fbx")}})
+
+        self.executor().run()
+
+        self.assertEqual(self.opened, [scene])
+
+    def test_handoff_deleted_after_its_last_job(self):
+        scene = self.handoff()
+        for i in range(2):
+            self.queue.put("write", scene, {"export": {
+                "path": os.path.join(self.folder, "out%d.fbx" % i)}})
+
+        self.executor().run(max_jobs=1)
+        self.assertTrue(os.path.isfile(scene))
+        self.executor().run()
+        self.assertFalse(os.path.exists(os.path.dirname(scene)))
+
+    def test_handoff_deleted_after_failed_job(self):
+        scene = self.handoff()
+        self.queue.put("fail", scene, {"export": {}})
+
+        self.executor().run()
+
+        self.assertFalse(os.path.exists(os.path.dirname(scene)))
+
+    def test_chained_job_waits_for_its_job(self):
+        first = self.queue.put("write", None, {"export": {
+            "path": os.path.join(self.folder, "out.fbx")}})
+        second = self.queue.put("write", None, {"export": {
+            "path": os.path.join(self.folder, "proxy.abc")}}, after=first)
+
+        self.assertEqual(self.queue.claim("worker").id, first)
+        self.assertIsNone(self.queue.claim("worker"))
+        self.queue.complete(first, {"publish_ids": [12]})
+        self.assertEqual(self.queue.claim("worker").id, second)
+
+    def test_chained_job_depends_on_the_publishes_of_its_job(self):
+        first = self.queue.put("write", None, {"export": {
+            "path": os.path.join(self.folder, "out.fbx")}})
+        second = self.queue.put("write", None, {
+            "export": {"path": os.path.join(self.folder, "proxy.abc")},
+            "publish": {"dependency_ids": [3]}}, after=first)
+        self.queue.complete(self.queue.claim("worker").id,
+                            {"publish_ids": [12]})
+        job = self.queue.claim("worker")
+        registered = []
+        register_publish = export_service.register_publish
+        export_service.register_publish = \
+            lambda data: registered.append(data) or 20
+        try:
+            export_service.run_job(job, queue=self.queue)
+        finally:
+            export_service.register_publish = register_publish
+
+        self.assertEqual(job.id, second)
+        self.assertEqual(registered[0]["dependency_ids"], [3, 12])
+
+    def test_chained_job_fails_without_the_publish_of_its_job(self):
+        first = self.queue.put("write", None, {"export": {
+            "path": os.path.join(self.folder, "out.fbx")}})
+        second = self.queue.put("write", None, {"export": {
+            "path": os.path.join(self.folder, "proxy.abc")}}, after=first)
+
+        self.executor().run()
+
+        self.assertEqual(self.queue.get(second).status, export_queue.FAILED)
+        self.assertIn("registered no publish", self.queue.get(second).error)
+
+    def test_chained_job_fails_with_its_job(self):
+        first = self.queue.put("fail", None, {"export": {}})
+        second = self.queue.put("write", None, {"export": {
+            "path": os.path.join(self.folder, "proxy.abc")}}, after=first)
+
+        jobs = self.executor().run()
+
+        self.assertEqual([job.id for job in jobs], [first])
+        self.assertEqual(self.queue.get(second).status, export_queue.FAILED)
+        self.assertIn("job %d" % first, self.queue.get(second).error)
+
+    def test_release_keeps_scenes_outside_the_handoff_folder(self):
+        scene = os.path.join(self.folder, "work.mb")
+        open(scene, "w").close()
+
+        self.assertFalse(export_service.release_handoff(self.queue, scene))
+        self.assertTrue(os.path.isfile(scene))
+
+
+
+class _Popen(object):
+    # a started worker process that never gets to heartbeat
+
+    started = []
+
+    def __init__(self, args, **kwargs):
+        self.pid = 1000 + len(self.started)
+        self.started.append(args)
+
+
+class EnsureWorkersTest(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp(prefix="cfa_export_test.")
+        self.queue = export_queue.JobQueue(
+            os.path.join(self.folder, "queue.db"))
+        self.scene = os.path.join(self.folder, "shot.mb")
+        open(self.scene, "w").close()
+        self._handoff_scene = export_service.handoff_scene
+        self._popen = export_service.subprocess.Popen
+        export_service.handoff_scene = lambda item: self.scene
+        export_service.subprocess.Popen = _Popen
+        _Popen.started = []
+
+    def tearDown(self):
+        export_service.handoff_scene = self._handoff_scene
+        export_service.subprocess.Popen = self._popen
+        self.queue.close()
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+    def submit(self, count):
+        for i in range(count):
+            export_service.submit(
+                None, "write", {"path": "out%d.fbx" % i}, queue=self.queue,
+                workers=3)
+
+    def test_starting_workers_are_counted(self):
+        self.submit(10)
+
+        self.assertEqual(len(_Popen.started), 3)
+        self.assertEqual(len(self.queue.alive_workers()), 3)
+
+    def test_no_more_workers_than_jobs(self):
+        self.submit(2)
+
+        self.assertEqual(len(_Popen.started), 2)
+
+    def test_worker_that_did_not_start_is_replaced(self):
+        self.submit(3)
+        self.queue.requeue_stale(startup_timeout=-1)
+
+        self.submit(1)
+
+        self.assertEqual(len(_Popen.started), 6)
+
+
+if __name__ == "__main__":
+    unittest.main()
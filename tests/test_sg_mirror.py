@@ -0,0 +1,155 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+'''
+@ author：huangsheng
+@ date: 2026/10/30 11:00
+@ description:
+    The shotgun mirror synced from a stand-in shotgun connection:
+
+        python -m pytest tests
+
+'''
+
+import datetime
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+# make the cfa_pipeline package importable
+_hooks = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "hooks")
+if _hooks not in sys.path:
+    sys.path.insert(0, _hooks)
+
+from cfa_pipeline import sg_mirror
+
+
+class _Shotgun(object):
+    # the find of the shotgun api on a list of records, project and
+    # updated_at filters only
+
+    def __init__(self):
+        self.records = []
+
+    def publish(self, publish_id, retired=False):
+        self.records.append({
+            "type": "PublishedFile",
+            "id": publish_id,
+            "project": {"type": "Project", "id": 1},
+            "name": "pub%d" % publish_id,
+            "version_number": 1,
+            "published_file_type": {"type": "PublishedFileType",
+                                    "name": "Alembic Cache"},
+            "entity": {"type": "Shot", "id": 5},
+            "task": None,
+            "path": {"local_path": "/pub%d.abc" % publish_id},
+            "updated_at": datetime.datetime(2026, 10, 1, 12, publish_id),
+            "retired": retired,
+        })
+
+    def retire(self, publish_id):
+        # retiring updates the record
+        for record in self.records:
+            if record["id"] == publish_id:
+                record["retired"] = True
+                record["updated_at"] = datetime.datetime(2026, 10, 2, 12)
+
+    def find(self, entity_type, filters, fields, order=None,
+             retired_only=False):
+        records = []
+        for record in self.records:
+            if record["retired"] != retired_only:
+                continue
+            if any(f[0] == "updated_at" and
+                   sg_mirror._timestamp(record["updated_at"]) <=
+                   sg_mirror._timestamp(f[2]) for f in filters):
+                continue
+            records.append(dict(record))
+        return records
+
+
+class MirrorTest(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp(prefix="cfa_mirror_test.")
+        self.sg = _Shotgun()
+        self.mirror = sg_mirror.Mirror(
+            lambda: self.sg, os.path.join(self.folder, "mirror.db"))
+
+    def tearDown(self):
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+    def ids(self):
+        return [pf["id"] for pf in self.mirror.published_files("Shot", 5)]
+
+    def test_sync_stores_publishes(self):
+        self.sg.publish(1)
+        self.sg.publish(2, retired=True)
+
+        self.mirror.sync(1, ["PublishedFile"], 0)
+
+        self.assertEqual(self.ids(), [1])
+
+    def test_sync_removes_retired_publishes(self):
+        self.sg.publish(1)
+        self.sg.publish(2)
+        self.mirror.sync(1, ["PublishedFile"], 0)
+
+        self.sg.retire(1)
+        self.mirror.sync(1, ["PublishedFile"], 0)
+
+        self.assertEqual(self.ids(), [2])
+
+    def test_first_sync_skips_retired_lookup(self):
+        self.sg.publish(1)
+        finds = []
+        find = self.sg.find
+        self.sg.find = lambda *args, **kwargs: finds.append(kwargs) or \
+            find(*args, **kwargs)
+
+        self.mirror.sync(1, ["PublishedFile"], 0)
+        self.mirror.sync(1, ["PublishedFile"], 0)
+
+        self.assertEqual(
+            [kwargs.get("retired_only", False) for kwargs in finds],
+            [False, False, True])
+
+
+class PublishedFilesTest(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp(prefix="cfa_mirror_test.")
+        self.sg = _Shotgun()
+        self.sg.publish(1)
+        self._path = os.environ.get("CFA_SG_MIRROR")
+        os.environ["CFA_SG_MIRROR"] = os.path.join(self.folder, "mirror.db")
+
+    def tearDown(self):
+        if self._path is None:
+            del os.environ["CFA_SG_MIRROR"]
+        else:
+            os.environ["CFA_SG_MIRROR"] = self._path
+        sg_mirror._mirror = None
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+    def ids(self):
+        return [pf["id"] for pf in sg_mirror.published_files(
+            lambda: self.sg, 1, "Shot", 5)]
+
+    def test_live_until_synced_in_background(self):
+        self.assertEqual(self.ids(), [1])
+        for thread in list(sg_mirror._background_syncs.values()):
+            thread.join()
+        mirror = sg_mirror.get_mirror(lambda: self.sg)
+
+        self.assertTrue(mirror.synced("PublishedFile", 1))
+
+        self.sg.publish(2)
+        # read from the mirror, synced less than PUBLISH_SYNC_INTERVAL ago
+        self.assertEqual(self.ids(), [1])
+
+
+if __name__ == "__main__":
+    unittest.main()